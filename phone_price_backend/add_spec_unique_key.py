@@ -0,0 +1,37 @@
+"""
+Run this script once to add the (phone_id, key_name) unique key that the
+bulk spec upsert relies on. Duplicate keys left behind by the old
+delete-then-insert code are collapsed first, keeping the newest row.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+from app.database import engine
+
+def add_spec_unique_key():
+    existing = {uc["name"] for uc in inspect(engine).get_unique_constraints("specs")}
+    if "uq_specs_phone_key" in existing:
+        print("ℹ️  specs already has uq_specs_phone_key, nothing to do")
+        return
+    
+    with engine.begin() as connection:
+        print("🧹 Removing duplicate spec keys...")
+        result = connection.execute(text("""
+            DELETE s1 FROM specs s1
+            JOIN specs s2
+              ON s1.phone_id = s2.phone_id
+             AND s1.key_name = s2.key_name
+             AND s1.id < s2.id
+        """))
+        print(f"✅ Removed {result.rowcount} duplicate specs")
+        
+        print("🔑 Adding unique key on (phone_id, key_name)...")
+        connection.execute(text(
+            "ALTER TABLE specs ADD UNIQUE KEY uq_specs_phone_key (phone_id, key_name)"
+        ))
+        print("✅ Unique key added successfully!")
+
+if __name__ == "__main__":
+    add_spec_unique_key()
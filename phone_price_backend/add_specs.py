@@ -101,13 +101,16 @@ def get_all_phones():
         return response.json()
     return []
 
-def add_specs_to_phone(phone_id, specs):
-    """Add specifications to a phone"""
+def add_specs_to_phones(updates):
+    """Upsert specifications for many phones in a single request"""
     response = requests.put(
-        f"{BASE_URL}/phones/{phone_id}/specs/bulk",
-        json=specs
+        f"{BASE_URL}/phones/specs/bulk",
+        json=updates
     )
-    return response.status_code == 200
+    if response.status_code == 200:
+        return response.json()
+    print(f"❌ Bulk update failed: {response.status_code} {response.text}")
+    return None
 
 def main():
     print("🔧 Adding sample specifications to phones...")
@@ -118,22 +121,20 @@ def main():
         print("❌ No phones found in database. Please add phones first.")
         return
     
+    updates = []
     for phone in phones:
         category = phone.get('category', 'midrange')
         specs = SAMPLE_SPECS.get(category, SAMPLE_SPECS['midrange'])
         
-        # Add some phone-specific specs
-        custom_specs = specs.copy()
-        
-        print(f"\n📱 Adding specs to: {phone['brand']} {phone['model']}")
-        
-        if add_specs_to_phone(phone['id'], custom_specs):
-            print(f"   ✅ Added {len(custom_specs)} specifications")
-        else:
-            print(f"   ❌ Failed to add specifications")
+        print(f"📱 Preparing {len(specs)} specs for: {phone['brand']} {phone['model']}")
+        updates.append({"phone_id": phone['id'], "specs": specs})
     
-    print("\n✨ Done! Specifications have been added to all phones.")
-    print("🌐 You can now view detailed specs on the phone details page!")
+    result = add_specs_to_phones(updates)
+    if result:
+        print(f"\n   ✅ Inserted {result['inserted']}, updated {result['updated']}, "
+              f"deleted {result['deleted']}, unchanged {result['unchanged']}")
+        print("\n✨ Done! Specifications have been added to all phones.")
+        print("🌐 You can now view detailed specs on the phone details page!")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,12 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.sql.dml import UpdateBase
+import itertools
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -34,29 +39,192 @@ def get_database_url():
 
 DATABASE_URL = get_database_url()
 
+def is_memory_sqlite(database_url: str) -> bool:
+    return database_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_url
+
+# Connection budget per database host, shared by all worker processes
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "60"))
+
+def pool_sizing() -> dict:
+    """Pool size/overflow for one worker: DB_POOL_SIZE/DB_MAX_OVERFLOW, or an even share of DB_MAX_CONNECTIONS"""
+    per_worker = max(2, DB_MAX_CONNECTIONS // WEB_CONCURRENCY)
+    pool_size = int(os.getenv("DB_POOL_SIZE", max(1, min(per_worker // 2, 20))))
+    max_overflow = int(os.getenv("DB_MAX_OVERFLOW", max(0, per_worker - pool_size)))
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    }
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection (including opening one)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds += waited
+            if waited > self.max_wait_seconds:
+                self.max_wait_seconds = waited
+
+def engine_options(database_url: str) -> dict:
+    """create_engine() arguments for the database's dialect"""
+    if database_url.startswith("sqlite"):
+        # Test/benchmark profile, e.g. DATABASE_URL=sqlite:// or sqlite:///test.db
+        options = {"connect_args": {"check_same_thread": False}}
+        if is_memory_sqlite(database_url):
+            # Every pooled connection would otherwise get its own empty database
+            options["poolclass"] = StaticPool
+        else:
+            options.update(poolclass=TimedQueuePool, **pool_sizing())
+        return options
+    return {
+        "poolclass": TimedQueuePool,
+        **pool_sizing(),
+        "pool_pre_ping": True,
+        "pool_recycle": 3600,
+        "connect_args": {"connect_timeout": 10},
+    }
+
+def _configure_sqlite(engine):
+    """Bring SQLite closer to MySQL: enforced foreign keys and working SAVEPOINTs"""
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself; pysqlite's implicit transactions break savepoints
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+def create_database_engine(database_url: str, **overrides):
+    """Engine for database_url with this app's settings for its dialect"""
+    options = {**engine_options(database_url), **overrides}
+    engine = create_engine(database_url, echo=os.getenv("DEBUG", "False") == "True", **options)
+    if engine.dialect.name == "sqlite":
+        _configure_sqlite(engine)
+    return engine
+
 # Create engine with lazy initialization
 try:
-    engine = create_engine(
-        DATABASE_URL,
-        echo=os.getenv("DEBUG", "False") == "True",
-        pool_pre_ping=True,
-        pool_recycle=3600,
-        connect_args={"connect_timeout": 10}
-    )
+    engine = create_database_engine(DATABASE_URL)
 except Exception as e:
     print(f"Warning: Database connection failed - {e}")
     engine = None
 
+# Read replicas for GET requests, e.g. DATABASE_REPLICA_URLS=mysql+pymysql://u:p@replica1/db,mysql+pymysql://u:p@replica2/db
+REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# After a client writes, its reads stay on the primary this long so it never sees replica lag
+READ_AFTER_WRITE_SECONDS = float(os.getenv("DB_READ_AFTER_WRITE_SECONDS", "5"))
+
+replica_engines = []
+for replica_url in REPLICA_URLS:
+    try:
+        replica_engines.append(create_database_engine(replica_url))
+    except Exception as e:
+        print(f"Warning: Replica connection failed - {e}")
+
+_replica_counter = itertools.count()
+
+class RoutingSession(Session):
+    """Session that reads from a replica when get_db() allows it.
+
+    Flushes, INSERT/UPDATE/DELETE statements and everything after the
+    session's first write go to the primary, so a session always reads
+    its own writes. One replica is pinned per session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        if (self.info.get("use_replica") and replica_engines
+                and not self._flushing and not self.info.get("wrote")):
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = replica_engines[next(_replica_counter) % len(replica_engines)]
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_written(session, flush_context):
+    session.info["wrote"] = True
+
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
-# Dependency to get DB session
-def get_db():
+_recent_writers = {}  # client -> monotonic time until which its reads use the primary
+
+def _client_key(request: Request):
+    # Same client address as rate limiting: X-Forwarded-For only counts from TRUSTED_PROXIES
+    from app.services import rate_limit
+    return rate_limit.client_key(request.scope)
+
+def _remember_writer(client):
+    now = time.monotonic()
+    if len(_recent_writers) > 10000:
+        for key, until in list(_recent_writers.items()):
+            if until < now:
+                _recent_writers.pop(key, None)
+    _recent_writers[client] = now + READ_AFTER_WRITE_SECONDS
+
+def pool_status():
+    """Pool occupancy and checkout wait metrics for the primary and each replica (public: no hosts or URLs)"""
+    named = [("primary", engine)] + [(f"replica{i}", e) for i, e in enumerate(replica_engines, 1)]
+    status = []
+    for name, pool_engine in named:
+        if pool_engine is None:
+            continue
+        pool = pool_engine.pool
+        stats = {"name": name}
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        if isinstance(pool, TimedQueuePool):
+            stats.update(
+                checkouts=pool.checkouts,
+                avg_wait_ms=round(pool.wait_seconds / pool.checkouts * 1000, 3) if pool.checkouts else 0,
+                max_wait_ms=round(pool.max_wait_seconds * 1000, 3),
+                timeouts=pool.timeouts,
+            )
+        status.append(stats)
+    return status
+
+def reads_from_replica(request: Request) -> bool:
+    """Whether a request may read from a replica: a GET/HEAD from a client that has not just written"""
+    if not replica_engines or request.method not in ("GET", "HEAD"):
+        return False
+    until = _recent_writers.get(_client_key(request))
+    return until is None or until < time.monotonic()
+
+# Dependency to get DB session; GET requests read from a replica when any are configured
+def get_db(request: Request = None):
     db = SessionLocal()
+    client = None
+    if request is not None and replica_engines:
+        client = _client_key(request)
+        db.info["use_replica"] = reads_from_replica(request)
     try:
         yield db
     finally:
+        if client is not None and (request.method not in ("GET", "HEAD") or db.info.get("wrote")):
+            _remember_writer(client)
         db.close()
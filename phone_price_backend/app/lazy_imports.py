@@ -0,0 +1,41 @@
+"""
+Deferred imports for heavy modules.
+
+lazy_import("numpy") returns a stand-in module that imports numpy the
+first time one of its attributes is used and then takes over numpy's
+namespace, so later lookups cost the same as on the real module.
+Services that only need NumPy inside their functions can keep a
+module-level `np` while a cold start (and every request that never
+touches them) skips the import.
+"""
+import importlib
+import threading
+import types
+
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        if self._module is None:
+            with _lock:
+                if self._module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__.update(module.__dict__)
+                    self.__dict__["_module"] = module
+        return self._module
+
+    def __getattr__(self, attr):
+        # Only reached for names not copied yet (before loading, or submodules imported later)
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name: str):
+    """Module `name`, imported on first use"""
+    return LazyModule(name)
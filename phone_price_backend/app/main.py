@@ -1,14 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
-from app.routes import phones, shops, prices, search, ai_predict, subscribers, reviews
+from app.routes import phones, shops, prices, search, ai_predict, subscribers, reviews, export, home, deals, go
+from app import database
+from app.services import jobs, warmup
+from app.services.rate_limit import RateLimitMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Periodic jobs (home feed, ...) run for the lifetime of the server
+    jobs.start()
+    # Warm connections and caches in the background; /ready reports when done
+    warmup.start()
+    yield
+    await warmup.stop()
+    await jobs.stop()
 
 app = FastAPI(
     title="Phone Price Backend API",
     description="API for tracking and predicting phone prices across different shops",
     version="1.0.0",
-    root_path=""
+    root_path="",
+    lifespan=lifespan
 )
 
 # Middleware to handle Railway proxy headers and enforce HTTPS
@@ -31,6 +47,9 @@ class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
         
         return response
 
+# Rate limiting innermost, so 429 responses still get the security and CORS headers
+app.add_middleware(RateLimitMiddleware)
+
 # Add HTTPS redirect middleware FIRST
 app.add_middleware(HTTPSRedirectMiddleware)
 
@@ -49,6 +68,10 @@ app.include_router(shops.router, prefix="/api/shops", tags=["Shops"])
 app.include_router(prices.router, prefix="/api/prices", tags=["Prices"])
 app.include_router(search.router, prefix="/api/search", tags=["Search"])
 app.include_router(ai_predict.router, prefix="/api/ai", tags=["AI Predictions"])
+app.include_router(export.router, prefix="/api/export", tags=["Export"])
+app.include_router(home.router, prefix="/api/home", tags=["Home"])
+app.include_router(deals.router, prefix="/api/deals", tags=["Deals"])
+app.include_router(go.router, prefix="/api/go", tags=["Redirects"])
 app.include_router(subscribers.router)
 app.include_router(reviews.router)
 
@@ -60,6 +83,17 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """503 until startup warm-up has finished, so the load balancer only routes to warm instances"""
+    status = warmup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+@app.get("/health/db")
+async def database_health():
+    """Connection pool occupancy and checkout wait times for the primary and replicas"""
+    return {"pools": database.pool_status()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
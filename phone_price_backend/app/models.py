@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, BigInteger, Enum, DECIMAL, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, BigInteger, Double, Enum, DECIMAL, TIMESTAMP, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -9,7 +9,7 @@ class Phone(Base):
     id = Column(Integer, primary_key=True, index=True)
     brand = Column(String(100), index=True, nullable=False)
     model = Column(String(255), nullable=False)
-    category = Column(Enum('budget', 'midrange', 'flagship', 'gaming', 'foldable'), nullable=False)
+    category = Column(Enum('budget', 'midrange', 'flagship', 'gaming', 'foldable', create_constraint=True), nullable=False)
     image_url = Column(String(500), nullable=True)
     release_year = Column(Integer, nullable=True)
     created_at = Column(TIMESTAMP, nullable=True)
@@ -52,6 +52,42 @@ class ShopPrice(Base):
     phone = relationship("Phone", back_populates="shop_prices")
     shop = relationship("Shop", back_populates="shop_prices")
 
+class PriceHistory(Base):
+    __tablename__ = "price_history"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    phone_id = Column(Integer, ForeignKey("phones.id"), nullable=False)
+    shop_id = Column(Integer, ForeignKey("shops.id"), index=True, nullable=False)
+    price = Column(BigInteger, nullable=False)
+    recorded_at = Column(TIMESTAMP, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_price_history_phone_recorded", "phone_id", "recorded_at"),
+    )
+
+class Deal(Base):
+    """Ranked (phone, shop) deal, recomputed by the deals job (see app/services/deals.py)"""
+    __tablename__ = "deals"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    phone_id = Column(Integer, ForeignKey("phones.id"), index=True, nullable=False)
+    shop_id = Column(Integer, ForeignKey("shops.id"), nullable=False)
+    category = Column(Enum('budget', 'midrange', 'flagship', 'gaming', 'foldable', create_constraint=True), nullable=False)
+    price = Column(BigInteger, nullable=False)
+    trailing_median = Column(BigInteger, nullable=True)
+    cross_shop_avg = Column(BigInteger, nullable=False)
+    below_median_pct = Column(Float, nullable=False)
+    below_avg_pct = Column(Float, nullable=False)
+    score = Column(Float, nullable=False, index=True)
+    computed_at = Column(TIMESTAMP, nullable=False)
+    
+    phone = relationship("Phone")
+    shop = relationship("Shop")
+    
+    __table_args__ = (
+        Index("ix_deals_category_score", "category", "score"),
+    )
+
 class Spec(Base):
     __tablename__ = "specs"
     
@@ -61,6 +97,25 @@ class Spec(Base):
     value = Column(Text, nullable=False)
     
     phone = relationship("Phone", back_populates="specs")
+    
+    __table_args__ = (
+        UniqueConstraint("phone_id", "key_name", name="uq_specs_phone_key"),
+    )
+
+class SpecAttribute(Base):
+    """Numeric value parsed from a free-text spec (see app/services/spec_parser.py)"""
+    __tablename__ = "spec_attributes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    phone_id = Column(Integer, ForeignKey("phones.id"), nullable=False)
+    attribute = Column(String(50), nullable=False)
+    num_value = Column(Float, nullable=False)
+    unit = Column(String(10), nullable=True)
+    
+    __table_args__ = (
+        UniqueConstraint("phone_id", "attribute", name="uq_spec_attributes_phone_attribute"),
+        Index("ix_spec_attributes_attribute_value", "attribute", "num_value"),
+    )
 
 class PhoneFeature(Base):
     __tablename__ = "phone_features"
@@ -98,6 +153,19 @@ class AffiliateLink(Base):
     phone = relationship("Phone", back_populates="affiliate_links")
     shop = relationship("Shop", back_populates="affiliate_links")
 
+class AffiliateClick(Base):
+    """Clicks per affiliate link per time bucket (see app/services/affiliate.py)"""
+    __tablename__ = "affiliate_clicks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    link_id = Column(Integer, ForeignKey("affiliate_links.id"), nullable=False)
+    bucket_start = Column(TIMESTAMP, nullable=False)
+    clicks = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint("link_id", "bucket_start", name="uq_affiliate_clicks_link_bucket"),
+    )
+
 class PriceAlert(Base):
     __tablename__ = "price_alerts"
     
@@ -118,7 +186,7 @@ class User(Base):
     name = Column(String(255), nullable=False)
     email = Column(String(255), nullable=False, unique=True)
     password_hash = Column(String(255), nullable=False)
-    role = Column(Enum('user', 'admin', 'shop_owner'), nullable=True)
+    role = Column(Enum('user', 'admin', 'shop_owner', create_constraint=True), nullable=True)
     shop_id = Column(Integer, ForeignKey("shops.id"), index=True, nullable=True)
     created_at = Column(TIMESTAMP, nullable=True)
     
@@ -147,3 +215,24 @@ class Review(Base):
     created_at = Column(TIMESTAMP, nullable=True)
     
     phone = relationship("Phone", backref="reviews")
+
+class ReviewStats(Base):
+    """Running review counters per phone; phone_id 0 holds the totals over all reviews"""
+    __tablename__ = "review_stats"
+    
+    phone_id = Column(Integer, primary_key=True, autoincrement=False)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+
+class RateLimitBucket(Base):
+    """Token bucket of one client on one rate-limited route, shared by every API worker"""
+    __tablename__ = "rate_limit_buckets"
+    
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Double, nullable=False)
+    updated_at = Column(Double, nullable=False, index=True)  # Unix time of the last refill
@@ -1,33 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from sqlalchemy import func, and_
+from app.database import get_db, reads_from_replica
 from app import models, schemas
+from app.services import forecast, recommender
+from app.services.single_flight import SingleFlight, own_session
 from typing import Optional
 
 router = APIRouter()
 
+comparison_flights = SingleFlight("ai price comparison")
+
 @router.get("/predict/{phone_id}")
 async def get_price_prediction(
     phone_id: int,
+    horizon_days: int = Query(forecast.DEFAULT_HORIZON_DAYS, ge=0, le=365, description="Days ahead to forecast"),
     db: Session = Depends(get_db)
 ):
-    """Get average price for a phone (simple prediction)"""
-    # Check if phone exists
-    phone = db.query(models.Phone).filter(models.Phone.id == phone_id).first()
-    if not phone:
-        raise HTTPException(status_code=404, detail="Phone not found")
+    """Forecast a phone's price with a 95% confidence interval"""
+    model = forecast.get_model(db)
     
-    # Get average price from shop_prices
-    avg_price = db.query(func.avg(models.ShopPrice.price)).filter(
-        models.ShopPrice.phone_id == phone_id,
-        models.ShopPrice.is_active == True
-    ).scalar()
+    # Phones created after the last fit are not in the model yet
+    if phone_id not in model.index:
+        phone = db.query(models.Phone.id).filter(models.Phone.id == phone_id).first()
+        if not phone:
+            raise HTTPException(status_code=404, detail="Phone not found")
     
-    if avg_price is None:
+    prediction = model.predict(phone_id, horizon_days)
+    if prediction is None:
         return {"phone_id": phone_id, "predicted_price": None, "message": "No active prices found"}
     
-    return {"phone_id": phone_id, "predicted_price": int(avg_price), "confidence": 0.85}
+    return {"phone_id": phone_id, **prediction}
 
 @router.get("/price-range/{phone_id}")
 async def get_price_range(
@@ -57,20 +60,116 @@ async def get_price_range(
         "shop_count": prices.shop_count
     }
 
+def _price_comparison_json(phone_id: int, use_replica: bool) -> bytes:
+    db = own_session(use_replica)
+    try:
+        phone = db.query(models.Phone).filter(models.Phone.id == phone_id).first()
+        if not phone:
+            raise HTTPException(status_code=404, detail="Phone not found")
+        
+        # Each price's phone is the one already loaded above; only shops need loading
+        prices = db.query(models.ShopPrice).options(joinedload(models.ShopPrice.shop)).filter(
+            models.ShopPrice.phone_id == phone_id,
+            models.ShopPrice.is_active == True
+        ).all()
+        
+        return schemas.PriceComparison(phone=phone, prices=prices).model_dump_json().encode("utf-8")
+    finally:
+        db.close()
+
 @router.get("/comparison/{phone_id}", response_model=schemas.PriceComparison)
 async def get_price_comparison(
     phone_id: int,
+    request: Request
+):
+    """Get price comparison across all shops for a phone (concurrent identical requests share one query)"""
+    # No get_db session here: the shared computation opens its own, so waiters never touch the pool
+    use_replica = reads_from_replica(request)
+    body = await comparison_flights.run(("comparison", phone_id, use_replica), _price_comparison_json, phone_id, use_replica)
+    return Response(content=body, media_type="application/json")
+
+
+@router.post("/batch", response_model=schemas.BatchAIResponse)
+async def get_batch_predictions(
+    request: schemas.BatchAIRequest,
     db: Session = Depends(get_db)
 ):
-    """Get price comparison across all shops for a phone"""
-    phone = db.query(models.Phone).filter(models.Phone.id == phone_id).first()
-    if not phone:
-        raise HTTPException(status_code=404, detail="Phone not found")
+    """Predictions, price ranges and comparisons for many phones in two queries"""
+    phone_ids = list(dict.fromkeys(request.phone_ids))
     
-    prices = db.query(models.ShopPrice).filter(
-        models.ShopPrice.phone_id == phone_id,
-        models.ShopPrice.is_active == True
-    ).all()
+    # Query 1: per-phone aggregates for all requested phones at once
+    ranges = {
+        row.phone_id: row for row in db.query(
+            models.ShopPrice.phone_id,
+            func.min(models.ShopPrice.price).label('min_price'),
+            func.max(models.ShopPrice.price).label('max_price'),
+            func.avg(models.ShopPrice.price).label('avg_price'),
+            func.count(models.ShopPrice.id).label('shop_count')
+        ).filter(
+            models.ShopPrice.phone_id.in_(phone_ids),
+            models.ShopPrice.is_active == True
+        ).group_by(models.ShopPrice.phone_id)
+    }
+    
+    # Query 2: phones with their active prices and shops, loaded in one join
+    phones = db.query(models.Phone).outerjoin(
+        models.ShopPrice,
+        and_(models.ShopPrice.phone_id == models.Phone.id, models.ShopPrice.is_active == True)
+    ).outerjoin(
+        models.Shop, models.ShopPrice.shop_id == models.Shop.id
+    ).options(
+        contains_eager(models.Phone.shop_prices).contains_eager(models.ShopPrice.shop)
+    ).filter(
+        models.Phone.id.in_(phone_ids)
+    ).populate_existing().all()
+    phones_by_id = {phone.id: phone for phone in phones}
     
-    return schemas.PriceComparison(phone=phone, prices=prices)
+    model = forecast.get_model(db)
+    results = []
+    
+    for phone_id in phone_ids:
+        phone = phones_by_id.get(phone_id)
+        if phone is None:
+            continue
+        
+        price_range = ranges.get(phone_id)
+        results.append(schemas.PhoneAIResult(
+            phone_id=phone_id,
+            prediction=model.predict(phone_id, request.horizon_days),
+            price_range=schemas.PriceRange(
+                phone_id=phone_id,
+                min_price=int(price_range.min_price) if price_range else None,
+                max_price=int(price_range.max_price) if price_range else None,
+                avg_price=int(price_range.avg_price) if price_range else None,
+                shop_count=price_range.shop_count if price_range else 0
+            ),
+            comparison=schemas.PriceComparison(phone=phone, prices=phone.shop_prices)
+        ))
+    
+    return schemas.BatchAIResponse(
+        results=results,
+        not_found=[phone_id for phone_id in phone_ids if phone_id not in phones_by_id]
+    )
 
+@router.get("/similar/{phone_id}", response_model=list[schemas.Recommendation])
+async def get_similar_phones(
+    phone_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    category: Optional[str] = Query(None, description="Only recommend phones in this category"),
+    db: Session = Depends(get_db)
+):
+    """Phones with the most similar specs and price"""
+    similar = recommender.get_recommender(db).similar(phone_id, limit, category)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Phone not found")
+    return similar
+
+@router.get("/best-value", response_model=list[schemas.Recommendation])
+async def get_best_value_phones(
+    budget: Optional[int] = Query(None, ge=0, description="Maximum price"),
+    category: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Phones offering the strongest specs for their lowest active price"""
+    return recommender.get_recommender(db).best_value(budget, category, limit)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session, joinedload
+from app.database import get_db
+from app import models, schemas
+from app.services import deals
+from typing import List, Literal, Optional
+
+router = APIRouter()
+
+@router.get("", response_model=List[schemas.Deal])
+async def get_deals(
+    category: Optional[Literal['budget', 'midrange', 'flagship', 'gaming', 'foldable']] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Best deals right now, ranked by discount against trailing median and cross-shop average"""
+    query = db.query(models.Deal).options(
+        joinedload(models.Deal.phone), joinedload(models.Deal.shop)
+    )
+    if category:
+        query = query.filter(models.Deal.category == category)
+    
+    return query.order_by(models.Deal.score.desc(), models.Deal.id).limit(limit).all()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from app.services import export, snapshot
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def export_response(stmt, dataset: str, fmt: str, gzip: bool):
+    """Build a StreamingResponse that encodes rows as they come off the cursor"""
+    partitions = export.stream_partitions(stmt)
+    chunks = export.ndjson_chunks(partitions) if fmt == "ndjson" else export.csv_chunks(partitions)
+    headers = {"Content-Disposition": f'attachment; filename="{dataset}.{fmt}"'}
+    
+    if gzip:
+        chunks = export.gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+@router.get("/prices.{fmt}")
+def export_prices(
+    fmt: Literal["ndjson", "csv"],
+    phone_id: int = Query(None),
+    shop_id: int = Query(None),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+):
+    """Stream every price row with phone and shop names"""
+    return export_response(export.prices_query(phone_id, shop_id), "prices", fmt, gzip)
+
+@router.get("/phones.{fmt}")
+def export_phones(
+    fmt: Literal["ndjson", "csv"],
+    brand: str = Query(None),
+    category: str = Query(None),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+):
+    """Stream the full phone catalog"""
+    return export_response(export.phones_query(brand, category), "phones", fmt, gzip)
+
+@router.get("/shops.{fmt}")
+def export_shops(
+    fmt: Literal["ndjson", "csv"],
+    city: str = Query(None),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+):
+    """Stream all shops"""
+    return export_response(export.shops_query(city), "shops", fmt, gzip)
+
+@router.get("/specs.{fmt}")
+def export_specs(
+    fmt: Literal["ndjson", "csv"],
+    phone_id: int = Query(None),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+):
+    """Stream all phone specifications"""
+    return export_response(export.specs_query(phone_id), "specs", fmt, gzip)
+
+@router.get("/snapshot.parquet")
+def export_snapshot(
+    phone_id: int = Query(None),
+    shop_id: int = Query(None),
+    compression: Literal["zstd", "snappy", "gzip"] = Query("zstd"),
+):
+    """Download a compressed Parquet snapshot of prices joined with phones and shops"""
+    fd, path = tempfile.mkstemp(suffix=".parquet")
+    os.close(fd)
+    
+    try:
+        snapshot.write_snapshot(path, compression=compression, phone_id=phone_id, shop_id=shop_id)
+    except RuntimeError as e:
+        os.remove(path)
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    # Temp file is removed once the response has been sent
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet",
+        filename="prices_snapshot.parquet",
+        background=BackgroundTask(os.remove, path)
+    )
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import RedirectResponse
+from starlette.concurrency import run_in_threadpool
+from app.services import affiliate
+
+router = APIRouter()
+
+@router.get("/{phone_id}/{shop_id}")
+async def go_to_shop(phone_id: int, shop_id: int):
+    """Redirect to a shop's affiliate link for a phone and count the click"""
+    if not affiliate.links_loaded():
+        await run_in_threadpool(affiliate.ensure_loaded)
+    
+    link = affiliate.lookup(phone_id, shop_id)
+    if link is None:
+        raise HTTPException(status_code=404, detail="Link not found")
+    
+    link_id, url = link
+    affiliate.record_click(link_id)
+    return RedirectResponse(url, status_code=302)
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app import schemas
+from app.services import home_feed
+
+router = APIRouter()
+
+@router.get("", response_model=schemas.HomeFeed)
+async def get_home_feed(db: Session = Depends(get_db)):
+    """Price drops, cheapest per category, newest and top-rated phones from the precomputed snapshot"""
+    return Response(content=home_feed.get_feed(db), media_type="application/json")
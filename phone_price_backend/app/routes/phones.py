@@ -1,19 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from sqlalchemy import select, func
 from app.database import get_db
 from app import models, schemas
+from app.projections import PHONE_COLUMNS, as_dicts
+from app.services import events, facets, phone_detail, review_stats
+from app.services.specs import upsert_specs
+from app.services.spec_parser import SPEC_ATTRIBUTES
 
 router = APIRouter()
 
-@router.get("/", response_model=list[schemas.Phone])
+@router.get("/", response_model=list[schemas.PhoneWithRating])
 async def get_phones(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
-    """Get all phones with pagination"""
-    phones = db.query(models.Phone).offset(skip).limit(limit).all()
-    return phones
+    """Get all phones with pagination, including their review count and average rating"""
+    phones = db.query(
+        *PHONE_COLUMNS, review_stats.REVIEW_COUNT, review_stats.AVERAGE_RATING
+    ).outerjoin(
+        models.ReviewStats, models.ReviewStats.phone_id == models.Phone.id
+    ).order_by(models.Phone.id).offset(skip).limit(limit).all()
+    return as_dicts(phones)
+
+@router.get("/filter", response_model=schemas.SearchResponse)
+async def filter_phones(
+    filters: schemas.PhoneFilter = Depends(),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Filter phones by typed spec attributes and price using indexed SQL"""
+    conditions = []
+    
+    if filters.brand:
+        conditions.append(models.Phone.brand == filters.brand)
+    if filters.category:
+        conditions.append(models.Phone.category == filters.category)
+    
+    # One indexed (attribute, num_value) range lookup per bounded attribute
+    for attribute in SPEC_ATTRIBUTES:
+        low = getattr(filters, f"min_{attribute}")
+        high = getattr(filters, f"max_{attribute}")
+        if low is None and high is None:
+            continue
+        matching = select(models.SpecAttribute.phone_id).where(models.SpecAttribute.attribute == attribute)
+        if low is not None:
+            matching = matching.where(models.SpecAttribute.num_value >= low)
+        if high is not None:
+            matching = matching.where(models.SpecAttribute.num_value <= high)
+        conditions.append(models.Phone.id.in_(matching))
+    
+    if filters.min_price is not None or filters.max_price is not None:
+        lowest = select(models.ShopPrice.phone_id).where(
+            models.ShopPrice.is_active == True
+        ).group_by(models.ShopPrice.phone_id)
+        if filters.min_price is not None:
+            lowest = lowest.having(func.min(models.ShopPrice.price) >= filters.min_price)
+        if filters.max_price is not None:
+            lowest = lowest.having(func.min(models.ShopPrice.price) <= filters.max_price)
+        conditions.append(models.Phone.id.in_(lowest))
+    
+    phones = db.query(*PHONE_COLUMNS).filter(*conditions).order_by(models.Phone.id).offset(skip).limit(limit).all()
+    total_count = db.query(func.count(models.Phone.id)).filter(*conditions).scalar()
+    
+    return schemas.SearchResponse(phones=as_dicts(phones), total_count=total_count)
+
+@router.get("/browse", response_model=schemas.BrowseResponse)
+async def browse_phones(
+    brand: list[str] = Query(None),
+    category: list[str] = Query(None),
+    release_year: list[str] = Query(None),
+    price_bucket: list[str] = Query(None, description="e.g. 100000-150000 or 400000+"),
+    ram_gb: list[str] = Query(None),
+    storage_gb: list[str] = Query(None),
+    refresh_rate_hz: list[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Browse phones with counts for every facet value, answered from in-memory bitsets"""
+    filters = {
+        "brand": brand,
+        "category": category,
+        "release_year": release_year,
+        "price_bucket": price_bucket,
+        "ram_gb": ram_gb,
+        "storage_gb": storage_gb,
+        "refresh_rate_hz": refresh_rate_hz,
+    }
+    page_ids, total_count, facet_counts = facets.get_index(db).browse(filters, skip, limit)
+    
+    phones = []
+    if page_ids:
+        rows = {row["id"]: row for row in as_dicts(db.query(*PHONE_COLUMNS).filter(models.Phone.id.in_(page_ids)))}
+        phones = [rows[phone_id] for phone_id in page_ids if phone_id in rows]
+    
+    return schemas.BrowseResponse(phones=phones, total_count=total_count, facets=facet_counts)
 
 @router.get("/{phone_id}", response_model=schemas.Phone)
 async def get_phone(phone_id: int, db: Session = Depends(get_db)):
@@ -23,6 +107,14 @@ async def get_phone(phone_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Phone not found")
     return phone
 
+@router.get("/{phone_id}/full", response_model=schemas.PhoneDetail)
+async def get_phone_full(phone_id: int, db: Session = Depends(get_db)):
+    """Phone, specs, active prices with shops, price summary and review stats in one document"""
+    document = phone_detail.get_phone_detail(db, phone_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Phone not found")
+    return Response(content=document, media_type="application/json")
+
 @router.post("/", response_model=schemas.Phone)
 async def create_phone(phone: schemas.PhoneCreate, db: Session = Depends(get_db)):
     """Create a new phone"""
@@ -30,6 +122,7 @@ async def create_phone(phone: schemas.PhoneCreate, db: Session = Depends(get_db)
     db.add(db_phone)
     db.commit()
     db.refresh(db_phone)
+    events.publish("phone", db_phone.id)
     return db_phone
 
 @router.put("/{phone_id}", response_model=schemas.Phone)
@@ -44,6 +137,7 @@ async def update_phone(phone_id: int, phone: schemas.PhoneCreate, db: Session =
     
     db.commit()
     db.refresh(db_phone)
+    events.publish("phone", phone_id)
     return db_phone
 
 @router.delete("/{phone_id}")
@@ -55,6 +149,7 @@ async def delete_phone(phone_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_phone)
     db.commit()
+    events.publish("phone", phone_id)
     return {"message": "Phone deleted successfully"}
 
 @router.get("/{phone_id}/specs")
@@ -69,53 +164,57 @@ async def get_phone_specs(phone_id: int, db: Session = Depends(get_db)):
 
 @router.post("/{phone_id}/specs")
 async def add_phone_spec(phone_id: int, spec_data: dict, db: Session = Depends(get_db)):
-    """Add a specification to a phone"""
-    phone = db.query(models.Phone).filter(models.Phone.id == phone_id).first()
+    """Add a specification to a phone (updates the value if the key exists)"""
+    phone = db.query(models.Phone.id).filter(models.Phone.id == phone_id).first()
     if not phone:
         raise HTTPException(status_code=404, detail="Phone not found")
     
-    # Check if spec already exists
-    existing = db.query(models.Spec).filter(
-        models.Spec.phone_id == phone_id,
-        models.Spec.key_name == spec_data.get('key')
-    ).first()
-    
-    if existing:
-        # Update existing spec
-        existing.value = spec_data.get('value')
-        db.commit()
-        db.refresh(existing)
-        return {"key": existing.key_name, "value": existing.value}
-    else:
-        # Create new spec
-        new_spec = models.Spec(
-            phone_id=phone_id,
-            key_name=spec_data.get('key'),
-            value=spec_data.get('value')
-        )
-        db.add(new_spec)
-        db.commit()
-        db.refresh(new_spec)
-        return {"key": new_spec.key_name, "value": new_spec.value}
+    key, value = spec_data.get('key'), spec_data.get('value')
+    result = upsert_specs(db, {phone_id: [(key, value)]}, prune=False)
+    db.commit()
+    
+    if result["changed_phone_ids"]:
+        events.publish("spec", phone_id)
+    return {"key": key, "value": value}
 
 @router.put("/{phone_id}/specs/bulk")
 async def update_phone_specs_bulk(phone_id: int, specs_data: list[dict], db: Session = Depends(get_db)):
-    """Update multiple specifications for a phone at once"""
-    phone = db.query(models.Phone).filter(models.Phone.id == phone_id).first()
+    """Replace a phone's specifications, writing only the keys that changed"""
+    phone = db.query(models.Phone.id).filter(models.Phone.id == phone_id).first()
     if not phone:
         raise HTTPException(status_code=404, detail="Phone not found")
     
-    # Delete all existing specs for this phone
-    db.query(models.Spec).filter(models.Spec.phone_id == phone_id).delete()
+    pairs = [(spec_data.get('key'), spec_data.get('value')) for spec_data in specs_data]
+    result = upsert_specs(db, {phone_id: pairs})
+    db.commit()
     
-    # Add new specs
-    for spec_data in specs_data:
-        new_spec = models.Spec(
-            phone_id=phone_id,
-            key_name=spec_data.get('key'),
-            value=spec_data.get('value')
+    if result["changed_phone_ids"]:
+        events.publish("spec", phone_id)
+    return {"message": "Specifications updated successfully", **result}
+
+@router.put("/specs/bulk", response_model=schemas.SpecsBulkResult)
+async def upsert_specs_bulk(
+    updates: list[schemas.PhoneSpecsUpdate],
+    prune: bool = Query(True, description="Delete keys missing from each phone's list"),
+    db: Session = Depends(get_db)
+):
+    """Upsert specifications for many phones in one request"""
+    specs_by_phone = {}
+    for update in updates:
+        specs_by_phone.setdefault(update.phone_id, []).extend(
+            (spec.key, spec.value) for spec in update.specs
         )
-        db.add(new_spec)
     
+    found = {
+        row.id for row in db.query(models.Phone.id).filter(models.Phone.id.in_(list(specs_by_phone)))
+    }
+    missing = sorted(set(specs_by_phone) - found)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Phones not found: {missing}")
+    
+    result = upsert_specs(db, specs_by_phone, prune=prune)
     db.commit()
-    return {"message": "Specifications updated successfully"}
+    
+    for phone_id in result["changed_phone_ids"]:
+        events.publish("spec", phone_id)
+    return result
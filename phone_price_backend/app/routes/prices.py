@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc
-from app.database import get_db
+from app.database import get_db, reads_from_replica
 from app import models, schemas
 from app.services.email_service import notify_all_subscribers
+from app.services import events, price_validation
+from app.services.single_flight import SingleFlight, own_session
+from datetime import datetime
 
 router = APIRouter()
 
+compare_flights = SingleFlight("price comparison")
+shop_price_list = TypeAdapter(list[schemas.ShopPrice])
+
 def send_notifications_background(db: Session, phone_name: str, old_price: int, new_price: int, shop_name: str):
     """Background task to send email notifications without blocking the API response"""
     try:
@@ -18,6 +25,26 @@ def send_notifications_background(db: Session, phone_name: str, old_price: int,
     except Exception as e:
         print(f"❌ Failed to send notifications in background: {e}")
 
+def record_price_history(db: Session, price: models.ShopPrice):
+    """Append the listing's current price to price_history (committed with the caller's transaction)"""
+    db.add(models.PriceHistory(
+        phone_id=price.phone_id,
+        shop_id=price.shop_id,
+        price=price.price,
+        recorded_at=datetime.now()
+    ))
+
+def hold_outlier(db: Session, phone_id: int, price: int, confirm: bool):
+    """Reject a suspicious price with 409 unless the caller confirmed it"""
+    if confirm:
+        return
+    outlier = price_validation.check_price(db, phone_id, price)
+    if outlier:
+        raise HTTPException(status_code=409, detail={
+            "message": "Price looks like an outlier for this phone; resend with confirm=true to save it",
+            **outlier
+        })
+
 
 @router.get("/", response_model=list[schemas.ShopPrice])
 async def get_prices(
@@ -58,8 +85,17 @@ async def get_phones_by_price_range(
     
     return prices
 
+@router.get("/outliers", response_model=list[schemas.PriceOutlier])
+async def get_price_outliers(db: Session = Depends(get_db)):
+    """Scan every active price against its phone's median/MAD and list the outliers"""
+    return price_validation.scan_outliers(db)
+
 @router.post("/", response_model=schemas.ShopPrice)
-async def create_price(price: schemas.ShopPriceCreate, db: Session = Depends(get_db)):
+async def create_price(
+    price: schemas.ShopPriceCreate,
+    confirm: bool = Query(False, description="Save even if the price looks like an outlier"),
+    db: Session = Depends(get_db)
+):
     """Create a new price entry"""
     # Verify phone and shop exist
     phone = db.query(models.Phone).filter(models.Phone.id == price.phone_id).first()
@@ -70,10 +106,14 @@ async def create_price(price: schemas.ShopPriceCreate, db: Session = Depends(get
     if not shop:
         raise HTTPException(status_code=404, detail="Shop not found")
     
+    hold_outlier(db, price.phone_id, price.price, confirm)
+    
     db_price = models.ShopPrice(**price.model_dump())
     db.add(db_price)
+    record_price_history(db, db_price)
     db.commit()
     db.refresh(db_price)
+    events.publish("price", db_price.phone_id)
     return db_price
 
 @router.put("/{price_id}", response_model=schemas.ShopPrice)
@@ -81,6 +121,7 @@ async def update_price(
     price_id: int, 
     price: schemas.ShopPriceCreate, 
     background_tasks: BackgroundTasks,
+    confirm: bool = Query(False, description="Save even if the price looks like an outlier"),
     db: Session = Depends(get_db)
 ):
     """Update a price entry"""
@@ -88,6 +129,10 @@ async def update_price(
     if not db_price:
         raise HTTPException(status_code=404, detail="Price not found")
     
+    # Hold suspicious prices before anything is committed or emailed
+    if price.price != db_price.price or price.phone_id != db_price.phone_id:
+        hold_outlier(db, price.phone_id, price.price, confirm)
+    
     # Store old price for comparison
     old_price = db_price.price
     new_price = price.price
@@ -100,11 +145,18 @@ async def update_price(
     shop = db.query(models.Shop).filter(models.Shop.id == db_price.shop_id).first()
     
     # Update the price
+    old_phone_id = db_price.phone_id
     for key, value in price.model_dump().items():
         setattr(db_price, key, value)
     
+    if old_price != new_price:
+        record_price_history(db, db_price)
+    
     db.commit()
     db.refresh(db_price)
+    events.publish("price", db_price.phone_id)
+    if old_phone_id != db_price.phone_id:
+        events.publish("price", old_phone_id)
     
     # Send notifications in the BACKGROUND (non-blocking)
     if price_changed and phone and shop:
@@ -127,19 +179,33 @@ async def delete_price(price_id: int, db: Session = Depends(get_db)):
     if not db_price:
         raise HTTPException(status_code=404, detail="Price not found")
     
+    phone_id = db_price.phone_id
     db.delete(db_price)
     db.commit()
+    events.publish("price", phone_id)
     return {"message": "Price deleted successfully"}
 
+def _compare_prices_json(phone_id: int, use_replica: bool) -> bytes:
+    db = own_session(use_replica)
+    try:
+        prices = db.query(models.ShopPrice).options(
+            joinedload(models.ShopPrice.phone), joinedload(models.ShopPrice.shop)
+        ).filter(
+            models.ShopPrice.phone_id == phone_id
+        ).order_by(models.ShopPrice.price).all()
+        
+        if not prices:
+            raise HTTPException(status_code=404, detail="No prices found for this phone")
+        
+        return shop_price_list.dump_json(shop_price_list.validate_python(prices, from_attributes=True))
+    finally:
+        db.close()
+
 @router.get("/phone/{phone_id}/compare", response_model=list[schemas.ShopPrice])
-async def compare_prices(phone_id: int, db: Session = Depends(get_db)):
-    """Get all prices for a phone across all shops (for price comparison)"""
-    prices = db.query(models.ShopPrice).filter(
-        models.ShopPrice.phone_id == phone_id
-    ).order_by(models.ShopPrice.price).all()
-    
-    if not prices:
-        raise HTTPException(status_code=404, detail="No prices found for this phone")
-    
-    return prices
+async def compare_prices(phone_id: int, request: Request):
+    """Get all prices for a phone across all shops (concurrent identical requests share one query)"""
+    # No get_db session here: the shared computation opens its own, so waiters never touch the pool
+    use_replica = reads_from_replica(request)
+    body = await compare_flights.run(("compare", phone_id, use_replica), _compare_prices_json, phone_id, use_replica)
+    return Response(content=body, media_type="application/json")
 
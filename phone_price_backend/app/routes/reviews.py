@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
 from app.models import Review as ReviewModel, Phone
-from app.schemas import Review, ReviewCreate, ReviewUpdate, ReviewWithPhone
+from app.schemas import Review, ReviewCreate, ReviewWithPhone
+from app.projections import REVIEW_COLUMNS, PHONE_NAME, as_dicts
+from app.services import events, helpful_votes, review_stats
 from datetime import datetime
 
 router = APIRouter(
@@ -30,8 +32,10 @@ def create_review(review: ReviewCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_review)
+    review_stats.apply_review_change(db, review.phone_id, added_rating=review.rating)
     db.commit()
     db.refresh(db_review)
+    events.publish("review", db_review.phone_id)
     
     return db_review
 
@@ -44,7 +48,7 @@ def get_reviews(
     db: Session = Depends(get_db)
 ):
     """Get all reviews with optional filters"""
-    query = db.query(ReviewModel, Phone).join(Phone, ReviewModel.phone_id == Phone.id)
+    query = db.query(*REVIEW_COLUMNS, PHONE_NAME).join(Phone, ReviewModel.phone_id == Phone.id)
     
     if phone_id:
         query = query.filter(ReviewModel.phone_id == phone_id)
@@ -56,22 +60,15 @@ def get_reviews(
     query = query.order_by(ReviewModel.created_at.desc())
     
     reviews = query.offset(skip).limit(limit).all()
-    
-    # Format response with phone name
-    result = []
-    for review, phone in reviews:
-        result.append({
-            "id": review.id,
-            "phone_id": review.phone_id,
-            "user_name": review.user_name,
-            "rating": review.rating,
-            "comment": review.comment,
-            "helpful": review.helpful,
-            "created_at": review.created_at,
-            "phone_name": f"{phone.brand} {phone.model}"
-        })
-    
-    return result
+    return format_review_rows(reviews)
+
+def format_review_rows(rows):
+    """Review rows as served, with helpful votes that are still waiting to be flushed"""
+    reviews = as_dicts(rows)
+    if helpful_votes.buffer.has_pending():
+        for review in reviews:
+            review["helpful"] = helpful_votes.current(review["id"], review["helpful"])
+    return reviews
 
 @router.get("/{review_id}", response_model=Review)
 def get_review(review_id: int, db: Session = Depends(get_db)):
@@ -79,7 +76,9 @@ def get_review(review_id: int, db: Session = Depends(get_db)):
     review = db.query(ReviewModel).filter(ReviewModel.id == review_id).first()
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
-    return review
+    return Review.model_validate(review).model_copy(
+        update={"helpful": helpful_votes.current(review.id, review.helpful)}
+    )
 
 @router.put("/{review_id}", response_model=Review)
 def update_review(
@@ -102,28 +101,28 @@ def update_review(
         )
     
     # Update fields if provided
-    if rating is not None:
+    if rating is not None and rating != review.rating:
+        review_stats.apply_review_change(db, review.phone_id, added_rating=rating, removed_rating=review.rating)
         review.rating = rating
     if comment is not None:
         review.comment = comment
     
     db.commit()
     db.refresh(review)
+    events.publish("review", review.phone_id)
     
     return review
 
 @router.put("/{review_id}/helpful", response_model=Review)
 def increment_helpful(review_id: int, db: Session = Depends(get_db)):
-    """Increment the helpful count for a review"""
-    review = db.query(ReviewModel).filter(ReviewModel.id == review_id).first()
+    """Increment the helpful count for a review (buffered and flushed in batches)"""
+    review = db.query(*REVIEW_COLUMNS).filter(ReviewModel.id == review_id).first()
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    review.helpful += 1
-    db.commit()
-    db.refresh(review)
-    
-    return review
+    # Read before voting: the stored value plus pending votes always includes this vote
+    pending = helpful_votes.vote(review_id)
+    return {**review._asdict(), "helpful": (review.helpful or 0) + pending}
 
 @router.delete("/{review_id}")
 def delete_review(review_id: int, db: Session = Depends(get_db)):
@@ -132,31 +131,15 @@ def delete_review(review_id: int, db: Session = Depends(get_db)):
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
+    phone_id = review.phone_id
     db.delete(review)
+    review_stats.apply_review_change(db, phone_id, removed_rating=review.rating)
     db.commit()
+    events.publish("review", phone_id)
     
     return {"message": "Review deleted successfully"}
 
 @router.get("/stats/summary")
 def get_review_stats(db: Session = Depends(get_db)):
-    """Get review statistics"""
-    from sqlalchemy import func
-    
-    total_reviews = db.query(func.count(ReviewModel.id)).scalar()
-    avg_rating = db.query(func.avg(ReviewModel.rating)).scalar() or 0
-    
-    # Rating distribution
-    rating_dist = db.query(
-        ReviewModel.rating,
-        func.count(ReviewModel.id).label('count')
-    ).group_by(ReviewModel.rating).all()
-    
-    distribution = {i: 0 for i in range(1, 6)}
-    for rating, count in rating_dist:
-        distribution[rating] = count
-    
-    return {
-        "total_reviews": total_reviews,
-        "average_rating": round(avg_rating, 2),
-        "rating_distribution": distribution
-    }
+    """Get review statistics from the maintained counters"""
+    return review_stats.get_summary(db)
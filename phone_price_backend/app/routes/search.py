@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, func
 from app.database import get_db
 from app import models, schemas
+from app.projections import PHONE_COLUMNS, SHOP_COLUMNS, as_dicts
 
 router = APIRouter()
 
@@ -15,22 +16,16 @@ async def search_phones(
 ):
     """Search phones by brand or model"""
     search_term = f"%{q}%"
+    matches = or_(
+        models.Phone.brand.ilike(search_term),
+        models.Phone.model.ilike(search_term)
+    )
     
-    phones = db.query(models.Phone).filter(
-        or_(
-            models.Phone.brand.ilike(search_term),
-            models.Phone.model.ilike(search_term)
-        )
-    ).offset(skip).limit(limit).all()
+    phones = db.query(*PHONE_COLUMNS).filter(matches).order_by(models.Phone.id).offset(skip).limit(limit).all()
     
-    total_count = db.query(models.Phone).filter(
-        or_(
-            models.Phone.brand.ilike(search_term),
-            models.Phone.model.ilike(search_term)
-        )
-    ).count()
+    total_count = db.query(func.count(models.Phone.id)).filter(matches).scalar()
     
-    return schemas.SearchResponse(phones=phones, total_count=total_count)
+    return schemas.SearchResponse(phones=as_dicts(phones), total_count=total_count)
 
 @router.get("/shops", response_model=list[schemas.Shop])
 async def search_shops(
@@ -42,14 +37,14 @@ async def search_shops(
     """Search shops by name or city"""
     search_term = f"%{q}%"
     
-    shops = db.query(models.Shop).filter(
+    shops = db.query(*SHOP_COLUMNS).filter(
         or_(
             models.Shop.name.ilike(search_term),
             models.Shop.city.ilike(search_term)
         )
-    ).offset(skip).limit(limit).all()
+    ).order_by(models.Shop.id).offset(skip).limit(limit).all()
     
-    return shops
+    return as_dicts(shops)
 
 @router.get("/prices/range", response_model=list[schemas.ShopPrice])
 async def search_price_range(
@@ -77,8 +72,8 @@ async def search_by_brand(
     db: Session = Depends(get_db)
 ):
     """Get all phones by a specific brand"""
-    phones = db.query(models.Phone).filter(
+    phones = db.query(*PHONE_COLUMNS).filter(
         models.Phone.brand.ilike(f"%{brand}%")
-    ).offset(skip).limit(limit).all()
+    ).order_by(models.Phone.id).offset(skip).limit(limit).all()
     
-    return phones
+    return as_dicts(phones)
@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app import models, schemas
+from app.projections import SHOP_COLUMNS, as_dicts
+from app.services import events
 
 router = APIRouter()
 
@@ -12,8 +14,8 @@ async def get_shops(
     db: Session = Depends(get_db)
 ):
     """Get all shops with pagination"""
-    shops = db.query(models.Shop).offset(skip).limit(limit).all()
-    return shops
+    shops = db.query(*SHOP_COLUMNS).order_by(models.Shop.id).offset(skip).limit(limit).all()
+    return as_dicts(shops)
 
 @router.get("/{shop_id}", response_model=schemas.Shop)
 async def get_shop(shop_id: int, db: Session = Depends(get_db)):
@@ -44,6 +46,7 @@ async def update_shop(shop_id: int, shop: schemas.ShopCreate, db: Session = Depe
     
     db.commit()
     db.refresh(db_shop)
+    events.publish("shop")
     return db_shop
 
 @router.delete("/{shop_id}")
@@ -55,4 +58,5 @@ async def delete_shop(shop_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_shop)
     db.commit()
+    events.publish("shop")
     return {"message": "Shop deleted successfully"}
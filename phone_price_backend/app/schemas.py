@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Dict
 from datetime import datetime
 
 # Phone Schemas
@@ -23,6 +23,33 @@ class Phone(PhoneBase):
     class Config:
         from_attributes = True
 
+class PhoneWithRating(Phone):
+    review_count: int = 0
+    average_rating: Optional[float] = None
+
+class PhoneFilter(BaseModel):
+    """Structured phone filters; spec bounds use the spec_attributes names"""
+    brand: Optional[str] = None
+    category: Optional[Literal['budget', 'midrange', 'flagship', 'gaming', 'foldable']] = None
+    min_price: Optional[int] = Field(None, ge=0, description="Lowest active price at least this")
+    max_price: Optional[int] = Field(None, ge=0, description="Lowest active price at most this")
+    min_ram_gb: Optional[float] = None
+    max_ram_gb: Optional[float] = None
+    min_storage_gb: Optional[float] = None
+    max_storage_gb: Optional[float] = None
+    min_battery_mah: Optional[float] = None
+    max_battery_mah: Optional[float] = None
+    min_display_inches: Optional[float] = None
+    max_display_inches: Optional[float] = None
+    min_refresh_rate_hz: Optional[float] = None
+    max_refresh_rate_hz: Optional[float] = None
+    min_camera_mp: Optional[float] = None
+    max_camera_mp: Optional[float] = None
+    min_charging_w: Optional[float] = None
+    max_charging_w: Optional[float] = None
+    min_weight_g: Optional[float] = None
+    max_weight_g: Optional[float] = None
+
 # Shop Schemas
 class ShopBase(BaseModel):
     name: str
@@ -79,6 +106,21 @@ class Spec(SpecBase):
     class Config:
         from_attributes = True
 
+class SpecEntry(BaseModel):
+    key: str = Field(..., min_length=1)
+    value: str
+
+class PhoneSpecsUpdate(BaseModel):
+    phone_id: int
+    specs: List[SpecEntry]
+
+class SpecsBulkResult(BaseModel):
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+    changed_phone_ids: List[int]
+
 # PhoneFeature Schemas
 class PhoneFeatureBase(BaseModel):
     phone_id: int
@@ -170,11 +212,136 @@ class SearchResponse(BaseModel):
     phones: List[Phone]
     total_count: int
 
+# Faceted Browse Schema
+class BrowseResponse(BaseModel):
+    phones: List[Phone]
+    total_count: int
+    facets: Dict[str, Dict[str, int]]
+
 # Price Comparison Schema
 class PriceComparison(BaseModel):
     phone: Phone
     prices: List[ShopPrice]
 
+# Batch AI Schemas
+class BatchAIRequest(BaseModel):
+    phone_ids: List[int] = Field(..., min_length=1, max_length=100)
+    horizon_days: int = Field(30, ge=0, le=365, description="Days ahead to forecast")
+
+class PriceRange(BaseModel):
+    phone_id: int
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    avg_price: Optional[int] = None
+    shop_count: int = 0
+
+class PhoneAIResult(BaseModel):
+    phone_id: int
+    prediction: Optional[dict] = None
+    price_range: PriceRange
+    comparison: PriceComparison
+
+class BatchAIResponse(BaseModel):
+    results: List[PhoneAIResult]
+    not_found: List[int] = []
+
+# Recommendation Schemas
+class Recommendation(BaseModel):
+    id: int
+    brand: str
+    model: str
+    category: str
+    image_url: Optional[str] = None
+    release_year: Optional[int] = None
+    price: Optional[int] = None
+    score: float
+
+# Phone Detail Schemas
+class ShopPriceDetail(ShopPriceBase):
+    id: int
+    updated_at: Optional[datetime] = None
+    shop: Optional[Shop] = None
+    
+    class Config:
+        from_attributes = True
+
+class PriceSummary(BaseModel):
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    avg_price: Optional[int] = None
+    shop_count: int = 0
+    prediction: Optional[dict] = None
+
+class ReviewSummary(BaseModel):
+    total_reviews: int = 0
+    average_rating: float = 0
+    rating_distribution: Dict[int, int]
+
+class PhoneDetail(BaseModel):
+    phone: Phone
+    specs: List[SpecEntry]
+    prices: List[ShopPriceDetail]
+    price_summary: PriceSummary
+    reviews: ReviewSummary
+
+# Home Feed Schemas
+class HomePhone(BaseModel):
+    id: int
+    brand: str
+    model: str
+    category: str
+    image_url: Optional[str] = None
+    release_year: Optional[int] = None
+    price: Optional[int] = None
+    shop_count: int = 0
+
+class PriceDrop(HomePhone):
+    shop_id: int
+    shop_name: str
+    current_price: int
+    previous_price: int
+    drop_amount: int
+    drop_percent: float
+
+class TopRatedPhone(HomePhone):
+    average_rating: float
+    review_count: int
+
+class HomeFeed(BaseModel):
+    generated_at: datetime
+    price_drops: List[PriceDrop]
+    cheapest_by_category: Dict[str, List[HomePhone]]
+    newest: List[HomePhone]
+    top_rated: List[TopRatedPhone]
+
+# Price Validation Schemas
+class PriceOutlier(BaseModel):
+    price_id: int
+    phone_id: int
+    shop_id: int
+    price: int
+    median: int
+    mad: int
+    samples: int
+    robust_z: float
+    ratio: float
+
+# Deal Schemas
+class Deal(BaseModel):
+    id: int
+    phone: Phone
+    shop: Shop
+    price: int
+    trailing_median: Optional[int] = None
+    cross_shop_avg: int
+    below_median_pct: float
+    below_avg_pct: float
+    score: float
+    computed_at: datetime
+    
+    class Config:
+        from_attributes = True
+
 # Review Schemas
 class ReviewBase(BaseModel):
     phone_id: int
@@ -0,0 +1,125 @@
+"""
+Affiliate redirects and click tracking behind /api/go.
+
+The (phone_id, shop_id) -> link map is held in memory and reloaded by a
+background job, so a redirect is a dict lookup. Clicks are counted in a
+CounterBuffer keyed by (link_id, time bucket) and flushed in batches: one
+upsert into affiliate_clicks (clicks = clicks + n per bucket) and one
+CASE-based UPDATE of affiliate_links.clicks. The redirect path never
+waits on the database; an overdue flush runs on a background thread.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import case, func, select, update
+
+from app import models
+from app.database import SessionLocal
+from app.services import jobs
+from app.services.counters import CounterBuffer
+
+CLICK_FLUSH_SECONDS = float(os.getenv("CLICK_FLUSH_SECONDS", "5"))
+LINK_MAP_REFRESH_SECONDS = int(os.getenv("LINK_MAP_REFRESH_SECONDS", "60"))
+CLICK_BUCKET_SECONDS = 3600
+
+
+_links = None  # (phone_id, shop_id) -> (link_id, url)
+_load_lock = threading.Lock()
+
+
+def load_links(db=None):
+    """Reload the link map and swap it in; the lowest link id wins for duplicate pairs"""
+    global _links
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(models.AffiliateLink.id, models.AffiliateLink.phone_id,
+                   models.AffiliateLink.shop_id, models.AffiliateLink.link)
+            .order_by(models.AffiliateLink.id.desc())
+        ).all()
+    finally:
+        if own_session:
+            db.close()
+    _links = {(phone_id, shop_id): (link_id, url) for link_id, phone_id, shop_id, url in rows}
+    return _links
+
+
+def links_loaded() -> bool:
+    return _links is not None
+
+
+def ensure_loaded():
+    """Load the link map once if no request or job has loaded it yet"""
+    with _load_lock:
+        if _links is None:
+            load_links()
+
+
+def lookup(phone_id: int, shop_id: int):
+    """(link_id, url) for a phone at a shop, or None"""
+    return _links.get((phone_id, shop_id)) if _links is not None else None
+
+
+def _bucket(timestamp: float) -> int:
+    return int(timestamp) - int(timestamp) % CLICK_BUCKET_SECONDS
+
+
+def _write_clicks(db, batch: dict):
+    """Persist {(link_id, bucket): n} to affiliate_clicks and affiliate_links"""
+    rows = [
+        {"link_id": link_id, "bucket_start": datetime.fromtimestamp(bucket), "clicks": n}
+        for (link_id, bucket), n in batch.items()
+    ]
+    table = models.AffiliateClick.__table__
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table)
+        db.execute(stmt.on_duplicate_key_update(clicks=table.c.clicks + stmt.inserted.clicks), rows)
+    elif dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["link_id", "bucket_start"],
+            set_={"clicks": table.c.clicks + stmt.excluded.clicks},
+        ), rows)
+    else:
+        for row in rows:
+            updated = db.execute(
+                update(table)
+                .where(table.c.link_id == row["link_id"], table.c.bucket_start == row["bucket_start"])
+                .values(clicks=table.c.clicks + row["clicks"])
+            )
+            if not updated.rowcount:
+                db.execute(table.insert(), row)
+
+    totals = {}
+    for (link_id, _), n in batch.items():
+        totals[link_id] = totals.get(link_id, 0) + n
+    db.execute(
+        update(models.AffiliateLink)
+        .where(models.AffiliateLink.id.in_(list(totals)))
+        .values(clicks=func.coalesce(models.AffiliateLink.clicks, 0) + case(
+            totals, value=models.AffiliateLink.id, else_=0
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+
+buffer = CounterBuffer("affiliate clicks", _write_clicks, flush_interval=CLICK_FLUSH_SECONDS, inline_flush=False)
+
+
+def record_click(link_id: int):
+    """Count a click in the current time bucket (buffered)"""
+    buffer.add((link_id, _bucket(time.time())))
+
+
+jobs.register("affiliate_links", LINK_MAP_REFRESH_SECONDS, load_links)
+jobs.register("affiliate_clicks", CLICK_FLUSH_SECONDS, lambda db: buffer.flush(db), run_on_shutdown=True)
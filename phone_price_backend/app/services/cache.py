@@ -0,0 +1,64 @@
+"""
+Small in-process cache for composed API documents.
+
+Entries are invalidated explicitly when one of their inputs changes
+(usually from an events subscription), with a TTL as a safety net. Each
+key carries a generation counter so a value computed while a write was
+invalidating it is never stored.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class DocumentCache:
+    """Bounded LRU cache with per-key invalidation"""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _generation(self, key):
+        return (self._epoch, self._generations.get(key, 0))
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation(key)
+
+        value = compute()
+
+        with self._lock:
+            # Skip the store if the key was invalidated while computing
+            if self._generation(key) == generation:
+                self._entries[key] = (time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._generations.clear()
+                self._epoch += 1
+            else:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,113 @@
+"""
+Write-behind buffering for hot counters.
+
+Increments are accumulated in memory per key and flushed as one batched
+statement, turning many tiny read-modify-write transactions into a single
+relative UPDATE. Durability is bounded: a periodic job flushes every
+flush_interval seconds, a request flushes inline once the oldest pending
+increment is older than that or too many keys are pending (or hands the
+flush to a background thread when inline_flush is off, for latency-critical
+paths), and the app flushes on shutdown. At most one interval of increments can be lost if the
+process dies abruptly.
+"""
+import threading
+import time
+from collections import defaultdict
+
+from app.database import SessionLocal
+
+
+class CounterBuffer:
+    """Pending increments per key plus the function that persists them"""
+
+    def __init__(self, name: str, flush_func, flush_interval: float = 5, max_pending_keys: int = 1000,
+                 inline_flush: bool = True):
+        self.name = name
+        self.flush_func = flush_func  # flush_func(db, {key: n}) writes without committing
+        self.flush_interval = flush_interval
+        self.max_pending_keys = max_pending_keys
+        self.inline_flush = inline_flush
+        self._pending = defaultdict(int)
+        self._inflight = {}  # drained batch until its commit completes
+        self._oldest = None
+        self._flush_scheduled = False  # a background flush thread has been started and not drained yet
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def add(self, key, n: int = 1) -> int:
+        """Buffer an increment; returns the key's pending total including this one"""
+        with self._lock:
+            self._pending[key] += n
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            pending = self._pending[key] + self._inflight.get(key, 0)
+            overdue = (
+                time.monotonic() - self._oldest >= self.flush_interval
+                or len(self._pending) >= self.max_pending_keys
+            )
+            # Decided under the lock, so a burst of overdue requests starts a single thread
+            spawn = overdue and not self.inline_flush and not self._flush_scheduled
+            if spawn:
+                self._flush_scheduled = True
+        if overdue and self.inline_flush:
+            self.flush()
+        elif spawn:
+            threading.Thread(target=self.flush, name=f"flush:{self.name}", daemon=True).start()
+        return pending
+
+    def pending(self, key) -> int:
+        """Increments not yet committed to the database for a key"""
+        with self._lock:
+            return self._pending.get(key, 0) + self._inflight.get(key, 0)
+
+    def has_pending(self) -> bool:
+        return bool(self._pending or self._inflight)
+
+    def discard(self):
+        """Drop every pending increment without writing it (tests and benchmarks)"""
+        with self._lock:
+            self._pending.clear()
+            self._inflight = {}
+            self._oldest = None
+
+    def _drain(self):
+        with self._lock:
+            batch = dict(self._pending)
+            self._pending.clear()
+            self._inflight = batch
+            self._oldest = None
+            self._flush_scheduled = False
+        return batch
+
+    def _restore(self, batch):
+        with self._lock:
+            self._inflight = {}
+            for key, n in batch.items():
+                self._pending[key] += n
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def flush(self, db=None) -> int:
+        """Persist and commit every pending increment; returns the number of keys written"""
+        with self._flush_lock:
+            batch = self._drain()
+            if not batch:
+                return 0
+            own_session = db is None
+            if own_session:
+                db = SessionLocal()
+            try:
+                self.flush_func(db, batch)
+                db.commit()
+                with self._lock:
+                    self._inflight = {}
+            except Exception as e:
+                db.rollback()
+                # Keep the increments for the next attempt rather than dropping them
+                self._restore(batch)
+                print(f"❌ Failed to flush {self.name} counters: {e}")
+                return 0
+            finally:
+                if own_session:
+                    db.close()
+            return len(batch)
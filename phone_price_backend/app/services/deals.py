@@ -0,0 +1,123 @@
+"""
+Deals ranking engine behind /api/deals.
+
+Every active (phone, shop) listing is scored by how far its price sits
+below two references:
+
+    below_median_pct  - the listing's own trailing median over the last
+                        TRAILING_WINDOW_DAYS of price_history
+    below_avg_pct     - the average active price of the phone across shops
+
+The whole catalog is scored at once with grouped NumPy operations (one
+sort for every trailing median, np.bincount for the cross-shop averages)
+and the positive-scoring listings replace the deals table in a single
+transaction, so the endpoint is a plain indexed ORDER BY score read.
+"""
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+
+from app import models
+from app.lazy_imports import lazy_import
+from app.services import jobs
+
+np = lazy_import("numpy")
+
+DEALS_REFRESH_SECONDS = int(os.getenv("DEALS_REFRESH_SECONDS", "900"))
+TRAILING_WINDOW_DAYS = 90
+# Weight of the trailing-median discount; the cross-shop discount gets the rest
+MEDIAN_WEIGHT = 0.6
+INSERT_CHUNK_SIZE = 1000
+
+
+def _group_medians(keys, prices):
+    """Median price per distinct key, returned as (sorted unique keys, medians)"""
+    order = np.lexsort((prices, keys))
+    keys, prices = keys[order], prices[order]
+    unique_keys, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    lower = prices[starts + (counts - 1) // 2]
+    upper = prices[starts + counts // 2]
+    return unique_keys, (lower + upper) / 2.0
+
+
+def compute_deals(db, now: datetime = None):
+    """Score every active listing; returns deal rows sorted by score, best first"""
+    now = now or datetime.now()
+    listings = db.execute(
+        select(models.ShopPrice.phone_id, models.ShopPrice.shop_id, models.ShopPrice.price, models.Phone.category)
+        .join(models.Phone, models.Phone.id == models.ShopPrice.phone_id)
+        .where(models.ShopPrice.is_active == True)
+    ).all()
+    if not listings:
+        return []
+
+    phone_ids = np.array([row[0] for row in listings], dtype=np.int64)
+    shop_ids = np.array([row[1] for row in listings], dtype=np.int64)
+    prices = np.array([row[2] for row in listings], dtype=np.float64)
+    categories = [row[3] for row in listings]
+
+    # Cross-shop average; a phone sold by a single shop has no comparison
+    _, phone_group = np.unique(phone_ids, return_inverse=True)
+    shop_counts = np.bincount(phone_group)
+    averages = (np.bincount(phone_group, weights=prices) / shop_counts)[phone_group]
+    below_avg = np.where(shop_counts[phone_group] > 1, (averages - prices) / averages * 100, 0.0)
+
+    # Trailing median per (phone, shop) from the history window
+    history = db.execute(
+        select(models.PriceHistory.phone_id, models.PriceHistory.shop_id, models.PriceHistory.price)
+        .where(models.PriceHistory.recorded_at >= now - timedelta(days=TRAILING_WINDOW_DAYS))
+    ).all()
+    medians = np.full(len(listings), np.nan)
+    if history:
+        history_phones = np.array([row[0] for row in history], dtype=np.int64)
+        history_shops = np.array([row[1] for row in history], dtype=np.int64)
+        history_prices = np.array([row[2] for row in history], dtype=np.float64)
+
+        stride = int(max(history_shops.max(), shop_ids.max())) + 1
+        median_keys, median_values = _group_medians(history_phones * stride + history_shops, history_prices)
+        listing_keys = phone_ids * stride + shop_ids
+        position = np.minimum(np.searchsorted(median_keys, listing_keys), len(median_keys) - 1)
+        found = median_keys[position] == listing_keys
+        medians[found] = median_values[position[found]]
+
+    has_median = ~np.isnan(medians)
+    below_median = np.where(has_median, (medians - prices) / np.where(has_median, medians, 1.0) * 100, 0.0)
+    scores = np.where(
+        has_median,
+        MEDIAN_WEIGHT * below_median + (1 - MEDIAN_WEIGHT) * below_avg,
+        below_avg,
+    )
+
+    deals = []
+    for i in np.flatnonzero(scores > 0)[np.argsort(-scores[scores > 0], kind="stable")]:
+        deals.append({
+            "phone_id": int(phone_ids[i]),
+            "shop_id": int(shop_ids[i]),
+            "category": categories[i],
+            "price": int(prices[i]),
+            "trailing_median": int(round(medians[i])) if has_median[i] else None,
+            "cross_shop_avg": int(round(averages[i])),
+            "below_median_pct": round(float(below_median[i]), 2),
+            "below_avg_pct": round(float(below_avg[i]), 2),
+            "score": round(float(scores[i]), 4),
+            "computed_at": now,
+        })
+    return deals
+
+
+def refresh(db):
+    """Recompute the ranking and replace the deals table in one transaction"""
+    deals = compute_deals(db)
+    try:
+        db.execute(delete(models.Deal))
+        for start in range(0, len(deals), INSERT_CHUNK_SIZE):
+            db.execute(insert(models.Deal), deals[start:start + INSERT_CHUNK_SIZE])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(deals)
+
+
+jobs.register("deals", DEALS_REFRESH_SECONDS, refresh)
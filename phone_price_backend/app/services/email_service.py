@@ -1,6 +1,3 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import List
 import os
 from dotenv import load_dotenv
@@ -21,6 +18,11 @@ def send_email(to_email: str, subject: str, html_content: str):
         print("⚠️ Email credentials not configured. Skipping email send.")
         return False
     
+    # Imported on first send so app startup doesn't pay for the email/SMTP modules
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    
     try:
         msg = MIMEMultipart('alternative')
         # Set sender name as "Pricera" with the email address
@@ -62,8 +64,8 @@ def send_email(to_email: str, subject: str, html_content: str):
         print(f"❌ Failed to send email to {to_email}: {str(e)}")
         return False
 
-def send_welcome_email(email: str, name: str = None):
-    """Send welcome email to new subscriber"""
+def render_welcome_email(name: str = None):
+    """Subject and HTML body of the welcome email"""
     display_name = name if name else "there"
     
     html_content = f"""
@@ -105,10 +107,15 @@ def send_welcome_email(email: str, name: str = None):
     </html>
     """
     
-    return send_email(email, "Welcome to Pricera - Price Alerts Activated! 🎉", html_content)
+    return "Welcome to Pricera - Price Alerts Activated! 🎉", html_content
 
-def send_price_drop_notification(email: str, phone_name: str, old_price: float, new_price: float, shop_name: str):
-    """Send price drop notification"""
+def send_welcome_email(email: str, name: str = None):
+    """Send welcome email to new subscriber"""
+    subject, html_content = render_welcome_email(name)
+    return send_email(email, subject, html_content)
+
+def render_price_drop_email(phone_name: str, old_price: float, new_price: float, shop_name: str):
+    """Subject and HTML body of a price drop notification"""
     price_drop = old_price - new_price
     percentage = (price_drop / old_price) * 100
     
@@ -154,10 +161,15 @@ def send_price_drop_notification(email: str, phone_name: str, old_price: float,
     </html>
     """
     
-    return send_email(email, f"🔥 Price Drop: {phone_name} - Save {percentage:.1f}%!", html_content)
+    return f"🔥 Price Drop: {phone_name} - Save {percentage:.1f}%!", html_content
 
-def send_price_increase_notification(email: str, phone_name: str, old_price: float, new_price: float, shop_name: str):
-    """Send price increase notification"""
+def send_price_drop_notification(email: str, phone_name: str, old_price: float, new_price: float, shop_name: str):
+    """Send price drop notification"""
+    subject, html_content = render_price_drop_email(phone_name, old_price, new_price, shop_name)
+    return send_email(email, subject, html_content)
+
+def render_price_increase_email(phone_name: str, old_price: float, new_price: float, shop_name: str):
+    """Subject and HTML body of a price increase notification"""
     price_increase = new_price - old_price
     percentage = (price_increase / old_price) * 100
     
@@ -203,7 +215,12 @@ def send_price_increase_notification(email: str, phone_name: str, old_price: flo
     </html>
     """
     
-    return send_email(email, f"📈 Price Increase: {phone_name} - Up {percentage:.1f}%", html_content)
+    return f"📈 Price Increase: {phone_name} - Up {percentage:.1f}%", html_content
+
+def send_price_increase_notification(email: str, phone_name: str, old_price: float, new_price: float, shop_name: str):
+    """Send price increase notification"""
+    subject, html_content = render_price_increase_email(phone_name, old_price, new_price, shop_name)
+    return send_email(email, subject, html_content)
 
 def notify_all_subscribers(db, phone_name: str, old_price: float, new_price: float, shop_name: str):
     """Notify all active subscribers about price changes (both increases and decreases)"""
@@ -213,15 +230,14 @@ def notify_all_subscribers(db, phone_name: str, old_price: float, new_price: flo
     
     success_count = 0
     
-    # Determine if it's a price drop or increase
-    is_price_drop = new_price < old_price
+    # Determine if it's a price drop or increase; every subscriber gets the same message
+    if new_price < old_price:
+        subject, html_content = render_price_drop_email(phone_name, old_price, new_price, shop_name)
+    else:
+        subject, html_content = render_price_increase_email(phone_name, old_price, new_price, shop_name)
     
     for subscriber in subscribers:
-        if is_price_drop:
-            if send_price_drop_notification(subscriber.email, phone_name, old_price, new_price, shop_name):
-                success_count += 1
-        else:
-            if send_price_increase_notification(subscriber.email, phone_name, old_price, new_price, shop_name):
-                success_count += 1
+        if send_email(subscriber.email, subject, html_content):
+            success_count += 1
     
     return success_count, len(subscribers)
@@ -0,0 +1,25 @@
+"""
+In-process change notifications.
+
+Routes publish a topic ("phone", "spec", "price", "review") after committing
+a write, and in-memory models/caches subscribe so they can refresh only
+what changed instead of polling the database. The forecast engine
+publishes "forecast" when it swaps in a refitted model.
+"""
+from collections import defaultdict
+
+_subscribers = defaultdict(list)
+
+
+def subscribe(topic: str, callback):
+    """Register callback(phone_id) for a topic"""
+    _subscribers[topic].append(callback)
+
+
+def publish(topic: str, phone_id: int = None):
+    """Notify every subscriber of a topic; a failing subscriber never breaks the write"""
+    for callback in list(_subscribers[topic]):
+        try:
+            callback(phone_id)
+        except Exception as e:
+            print(f"⚠️ {topic} subscriber {getattr(callback, '__name__', callback)} failed: {e}")
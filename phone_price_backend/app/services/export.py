@@ -0,0 +1,136 @@
+"""
+Streaming exports of the catalog and price tables.
+
+Rows are read from a server-side cursor in fixed-size partitions and
+encoded chunk by chunk, so memory stays constant no matter how large the
+table is.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app import models
+from app.database import SessionLocal
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def prices_query(phone_id: int = None, shop_id: int = None):
+    """Flat price rows joined with phone and shop names (filters mirror GET /api/prices)"""
+    stmt = select(
+        models.ShopPrice.id,
+        models.ShopPrice.phone_id,
+        models.Phone.brand,
+        models.Phone.model,
+        models.Phone.category,
+        models.ShopPrice.shop_id,
+        models.Shop.name.label("shop_name"),
+        models.Shop.city.label("shop_city"),
+        models.ShopPrice.price,
+        models.ShopPrice.currency,
+        models.ShopPrice.is_active,
+        models.ShopPrice.updated_at,
+    ).join(
+        models.Phone, models.ShopPrice.phone_id == models.Phone.id
+    ).join(
+        models.Shop, models.ShopPrice.shop_id == models.Shop.id
+    )
+
+    if phone_id:
+        stmt = stmt.where(models.ShopPrice.phone_id == phone_id)
+    if shop_id:
+        stmt = stmt.where(models.ShopPrice.shop_id == shop_id)
+
+    return stmt.order_by(models.ShopPrice.id)
+
+
+def phones_query(brand: str = None, category: str = None):
+    """All phone columns"""
+    stmt = select(*models.Phone.__table__.columns)
+    if brand:
+        stmt = stmt.where(models.Phone.brand == brand)
+    if category:
+        stmt = stmt.where(models.Phone.category == category)
+    return stmt.order_by(models.Phone.id)
+
+
+def shops_query(city: str = None):
+    """All shop columns"""
+    stmt = select(*models.Shop.__table__.columns)
+    if city:
+        stmt = stmt.where(models.Shop.city == city)
+    return stmt.order_by(models.Shop.id)
+
+
+def specs_query(phone_id: int = None):
+    """All spec rows"""
+    stmt = select(*models.Spec.__table__.columns)
+    if phone_id:
+        stmt = stmt.where(models.Spec.phone_id == phone_id)
+    return stmt.order_by(models.Spec.phone_id, models.Spec.id)
+
+
+def stream_partitions(stmt, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield (columns, rows) partitions from a server-side cursor.
+
+    The generator owns its session because a StreamingResponse is consumed
+    after the request's get_db dependency has already closed.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+        columns = list(result.keys())
+        empty = True
+        for rows in result.partitions(batch_size):
+            empty = False
+            yield columns, rows
+        if empty:
+            # Still emit the column names so CSV exports get a header
+            yield columns, []
+    finally:
+        db.close()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def ndjson_chunks(partitions):
+    """Encode partitions as newline-delimited JSON, one chunk per partition"""
+    for columns, rows in partitions:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+def csv_chunks(partitions):
+    """Encode partitions as CSV with a single header row"""
+    header_written = False
+    for columns, rows in partitions:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks, level: int = 6):
+    """Incrementally gzip a stream of byte chunks"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
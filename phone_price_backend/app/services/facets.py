@@ -0,0 +1,222 @@
+"""
+Faceted phone browsing backed by in-memory bitsets.
+
+Every phone owns a slot, and each facet value (brand=Apple, ram_gb=8,
+price_bucket=100000-150000, ...) keeps a Python int whose set bits are the
+slots of matching phones. A browse request ORs the selected values within
+a facet, ANDs across facets, and gets every facet count by popcounting the
+value bitsets against the other active filters - no COUNT queries at all.
+
+Phone, spec and price writes mark phones dirty; the next request reloads
+just those phones' facet values and flips their bits in a copied index.
+"""
+import threading
+
+from sqlalchemy import func, select
+
+from app import models
+from app.lazy_imports import lazy_import
+from app.services import events
+
+np = lazy_import("numpy")
+
+# Lowest active price buckets (LKR); the last bucket is open-ended
+PRICE_BUCKET_EDGES = (0, 25000, 50000, 100000, 150000, 250000, 400000)
+SPEC_FACETS = ("ram_gb", "storage_gb", "refresh_rate_hz")
+FACETS = ("brand", "category", "release_year", "price_bucket") + SPEC_FACETS
+
+
+def price_bucket(price):
+    """Label of the bucket a price falls into, e.g. "100000-150000" or "400000+\""""
+    if price is None:
+        return None
+    for low, high in zip(PRICE_BUCKET_EDGES, PRICE_BUCKET_EDGES[1:]):
+        if price < high:
+            return f"{low}-{high}"
+    return f"{PRICE_BUCKET_EDGES[-1]}+"
+
+
+def _label(value):
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def _sort_key(label):
+    # Numeric labels (and price buckets by their lower bound) sort by value
+    head = label.split("-")[0].rstrip("+")
+    try:
+        return (0, float(head), label)
+    except ValueError:
+        return (1, 0.0, label)
+
+
+class FacetIndex:
+    """Slot assignments plus one bitset per (facet, value)"""
+
+    def __init__(self):
+        self.slot_of = {}        # phone_id -> slot
+        self.phone_at = []       # slot -> phone_id (slots are never reused)
+        self.values_of = {}      # slot -> {facet: value} currently set
+        self.bitsets = {facet: {} for facet in FACETS}
+        self.all_bits = 0
+
+    def copy(self):
+        clone = FacetIndex()
+        clone.slot_of = dict(self.slot_of)
+        clone.phone_at = list(self.phone_at)
+        clone.values_of = dict(self.values_of)
+        clone.bitsets = {facet: dict(values) for facet, values in self.bitsets.items()}
+        clone.all_bits = self.all_bits
+        return clone
+
+    def load(self, db, phone_ids=None):
+        """Index the given phones (all phones when None) from three queries"""
+        phone_query = select(
+            models.Phone.id, models.Phone.brand, models.Phone.category, models.Phone.release_year
+        ).order_by(models.Phone.id)
+        price_query = select(
+            models.ShopPrice.phone_id, func.min(models.ShopPrice.price)
+        ).where(models.ShopPrice.is_active == True).group_by(models.ShopPrice.phone_id)
+        spec_query = select(
+            models.SpecAttribute.phone_id, models.SpecAttribute.attribute, models.SpecAttribute.num_value
+        ).where(models.SpecAttribute.attribute.in_(SPEC_FACETS))
+
+        if phone_ids is not None:
+            ids = list(phone_ids)
+            phone_query = phone_query.where(models.Phone.id.in_(ids))
+            price_query = price_query.where(models.ShopPrice.phone_id.in_(ids))
+            spec_query = spec_query.where(models.SpecAttribute.phone_id.in_(ids))
+            for phone_id in ids:
+                self._remove(phone_id)
+
+        prices = dict(db.execute(price_query).all())
+        specs = {}
+        for phone_id, attribute, value in db.execute(spec_query):
+            specs.setdefault(phone_id, {})[attribute] = value
+
+        for phone in db.execute(phone_query):
+            values = {
+                "brand": phone.brand,
+                "category": phone.category,
+                "release_year": phone.release_year,
+                "price_bucket": price_bucket(prices.get(phone.id)),
+            }
+            for attribute in SPEC_FACETS:
+                values[attribute] = specs.get(phone.id, {}).get(attribute)
+            self._add(phone.id, {facet: _label(value) for facet, value in values.items()})
+
+    def _add(self, phone_id, values):
+        slot = self.slot_of.get(phone_id)
+        if slot is None:
+            slot = len(self.phone_at)
+            self.slot_of[phone_id] = slot
+            self.phone_at.append(phone_id)
+        bit = 1 << slot
+
+        values = {facet: value for facet, value in values.items() if value is not None}
+        for facet, value in values.items():
+            self.bitsets[facet][value] = self.bitsets[facet].get(value, 0) | bit
+        self.values_of[slot] = values
+        self.all_bits |= bit
+
+    def _remove(self, phone_id):
+        slot = self.slot_of.get(phone_id)
+        if slot is None:
+            return
+        bit = 1 << slot
+        for facet, value in self.values_of.pop(slot, {}).items():
+            remaining = self.bitsets[facet].get(value, 0) & ~bit
+            if remaining:
+                self.bitsets[facet][value] = remaining
+            else:
+                self.bitsets[facet].pop(value, None)
+        self.all_bits &= ~bit
+
+    def _match(self, facet, selected):
+        bits = 0
+        for value in selected:
+            bits |= self.bitsets[facet].get(value, 0)
+        return bits
+
+    def browse(self, filters: dict, skip: int = 0, limit: int = 10):
+        """Phone ids for one page, the total match count and counts for every facet value.
+
+        filters maps facet -> list of selected values (OR within a facet,
+        AND across facets). Each facet's counts ignore that facet's own
+        selection so the UI can offer multi-select.
+        """
+        matches = {facet: self._match(facet, selected) for facet, selected in filters.items() if selected}
+
+        result = self.all_bits
+        for bits in matches.values():
+            result &= bits
+
+        facet_counts = {}
+        for facet in FACETS:
+            others = self.all_bits
+            for other, bits in matches.items():
+                if other != facet:
+                    others &= bits
+            counts = {
+                value: (bits & others).bit_count()
+                for value, bits in self.bitsets[facet].items()
+            }
+            facet_counts[facet] = {
+                value: counts[value] for value in sorted(counts, key=_sort_key) if counts[value]
+            }
+
+        slots = _set_bits(result, len(self.phone_at))
+        page = [self.phone_at[slot] for slot in slots[skip:skip + limit]]
+        return page, len(slots), facet_counts
+
+
+def _set_bits(bits: int, size: int):
+    """Positions of the set bits of a Python int, in ascending order"""
+    if not bits:
+        return np.empty(0, dtype=np.int64)
+    raw = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+
+_index = None
+_dirty_ids = set()
+_lock = threading.Lock()
+
+
+def get_index(db) -> FacetIndex:
+    """Return the shared facet index, building it or refreshing dirty phones first"""
+    global _index
+
+    if _index is not None and not _dirty_ids:
+        return _index
+
+    with _lock:
+        if _index is None:
+            index = FacetIndex()
+            _dirty_ids.clear()
+            index.load(db)
+            _index = index
+        elif _dirty_ids:
+            dirty = set(_dirty_ids)
+            _dirty_ids.difference_update(dirty)
+            index = _index.copy()
+            index.load(db, dirty)
+            _index = index
+        return _index
+
+
+def mark_dirty(phone_id: int = None):
+    """Queue a phone for re-indexing; None forces a full rebuild"""
+    global _index
+    if phone_id is None:
+        _index = None
+    else:
+        _dirty_ids.add(phone_id)
+
+
+events.subscribe("phone", mark_dirty)
+events.subscribe("spec", mark_dirty)
+events.subscribe("price", mark_dirty)
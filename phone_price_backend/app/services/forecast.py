@@ -0,0 +1,312 @@
+"""
+Price forecasting engine behind /api/ai/predict.
+
+Each phone gets a log-linear trend + decay model
+
+    log(price) = intercept + slope * age_years
+
+where age is measured from the phone's release year (or its first observed
+price when the release year is unknown). Observations are the phone's
+price_history rows, plus the active shop prices whose current value is not
+already their latest history row (listings priced before history was
+recorded), weighted towards recent data. Per-phone slopes are shrunk towards a pooled per-category
+slope, so phones with one or two data points still inherit a sensible
+depreciation curve from their category.
+
+All phones are fitted at once with grouped NumPy sums (np.bincount), the
+fitted parameters are cached in memory with a version number, and serving
+a prediction is a dict lookup plus a handful of scalar operations. Warm-up
+fits the first model; after that a stale model keeps being served while a
+background thread fits its replacement and swaps it in. Each swap
+publishes a "forecast" event so caches holding predictions drop them.
+"""
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import or_, select
+
+from app import models
+from app.database import SessionLocal
+from app.lazy_imports import lazy_import
+from app.services import events
+
+np = lazy_import("numpy")
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+DEFAULT_HORIZON_DAYS = 30
+
+# Observations lose half their weight every RECENCY_HALF_LIFE_DAYS
+RECENCY_HALF_LIFE_DAYS = float(os.getenv("FORECAST_HALF_LIFE_DAYS", "180"))
+# Pseudo-observations pulling a phone's slope/variance towards its category
+SLOPE_PRIOR_STRENGTH = 0.25
+VARIANCE_PRIOR_STRENGTH = 3.0
+# Fallback log-price residual std when a category has no spread to learn from (~8%)
+DEFAULT_SIGMA = 0.08
+# Refit at least this often, and never more than once per MIN_REFIT_SECONDS on writes
+MODEL_TTL_SECONDS = int(os.getenv("FORECAST_TTL_SECONDS", "3600"))
+MIN_REFIT_SECONDS = int(os.getenv("FORECAST_MIN_REFIT_SECONDS", "60"))
+Z_95 = 1.96
+
+
+class ForecastModel:
+    """Fitted per-phone parameters, stored column-wise and indexed by phone id"""
+
+    __slots__ = (
+        "version", "fitted_at", "reference_time", "index", "intercept", "slope",
+        "age_offset", "x_mean", "sxx", "weight_sum", "sigma2", "observations",
+        "latest_price",
+    )
+
+    def __init__(self, version, fitted_at, reference_time, phone_ids, **arrays):
+        self.version = version
+        self.fitted_at = fitted_at
+        self.reference_time = reference_time
+        self.index = {int(phone_id): i for i, phone_id in enumerate(phone_ids)}
+        for name, values in arrays.items():
+            setattr(self, name, values)
+
+    def predict(self, phone_id: int, horizon_days: int = DEFAULT_HORIZON_DAYS):
+        """Point forecast and 95% interval for a phone, or None if it has no prices"""
+        i = self.index.get(phone_id)
+        if i is None or self.observations[i] == 0:
+            return None
+
+        now_age = (time.time() - self.reference_time) / SECONDS_PER_YEAR + self.age_offset[i]
+        x = now_age + horizon_days / 365.25
+        log_price = self.intercept[i] + self.slope[i] * x
+
+        # Prediction variance: residual noise of the mean plus slope uncertainty at x
+        variance = self.sigma2[i] * (
+            1.0 / self.weight_sum[i] + (x - self.x_mean[i]) ** 2 / self.sxx[i]
+        )
+        half_width = Z_95 * math.sqrt(variance)
+
+        predicted = math.exp(log_price)
+        lower = math.exp(log_price - half_width)
+        upper = math.exp(log_price + half_width)
+
+        return {
+            "predicted_price": int(round(predicted)),
+            "lower_bound": int(round(lower)),
+            "upper_bound": int(round(upper)),
+            # 1.0 means a zero-width interval; wide intervals approach 0
+            "confidence": round(max(0.0, 1.0 - (upper - lower) / (2 * predicted)), 3),
+            "annual_trend": round(math.expm1(self.slope[i]), 4),
+            "current_price": int(self.latest_price[i]),
+            "horizon_days": horizon_days,
+            "observations": int(self.observations[i]),
+            "model_version": self.version,
+        }
+
+
+def _load_observations(db):
+    """All phones plus every (phone_id, price, timestamp) observation in two queries"""
+    phones = db.execute(
+        select(models.Phone.id, models.Phone.category, models.Phone.release_year)
+        .order_by(models.Phone.id)
+    ).all()
+
+    history = select(
+        models.PriceHistory.phone_id,
+        models.PriceHistory.price,
+        models.PriceHistory.recorded_at,
+    )
+    # Price writes also append a history row; only count listings whose current price isn't one
+    latest_recorded = (
+        select(models.PriceHistory.price)
+        .where(
+            models.PriceHistory.phone_id == models.ShopPrice.phone_id,
+            models.PriceHistory.shop_id == models.ShopPrice.shop_id,
+        )
+        .order_by(models.PriceHistory.recorded_at.desc(), models.PriceHistory.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    current = select(
+        models.ShopPrice.phone_id,
+        models.ShopPrice.price,
+        models.ShopPrice.updated_at,
+    ).where(
+        models.ShopPrice.is_active == True,
+        or_(latest_recorded.is_(None), latest_recorded != models.ShopPrice.price),
+    )
+    observations = db.execute(history.union_all(current)).all()
+
+    return phones, observations
+
+
+def fit(db, version: int = 1) -> ForecastModel:
+    """Fit every phone's trend + decay model in one vectorized pass"""
+    now = time.time()
+    phones, observations = _load_observations(db)
+
+    phone_ids = np.array([p.id for p in phones], dtype=np.int64)
+    n_phones = len(phone_ids)
+    categories = sorted({p.category for p in phones if p.category})
+    category_of = np.array(
+        [categories.index(p.category) if p.category else -1 for p in phones], dtype=np.int64
+    )
+
+    if observations:
+        obs_phone = np.array([o[0] for o in observations], dtype=np.int64)
+        obs_price = np.array([o[1] for o in observations], dtype=np.float64)
+        obs_time = np.array(
+            [o[2].timestamp() if o[2] else np.nan for o in observations], dtype=np.float64
+        )
+    else:
+        obs_phone = np.empty(0, dtype=np.int64)
+        obs_price = np.empty(0)
+        obs_time = np.empty(0)
+
+    # Drop non-positive or undated prices and observations for phones deleted since
+    valid = (obs_price > 0) & ~np.isnan(obs_time) & np.isin(obs_phone, phone_ids)
+    obs_phone, obs_price, obs_time = obs_phone[valid], obs_price[valid], obs_time[valid]
+    group = np.searchsorted(phone_ids, obs_phone)
+
+    # Age in years since release (Jan 1st of release_year); fall back to first sighting
+    first_seen = np.full(n_phones, now)
+    np.minimum.at(first_seen, group, obs_time)
+    release_ts = np.array(
+        [datetime(p.release_year, 1, 1).timestamp() if p.release_year else np.nan for p in phones]
+    )
+    origin = np.where(np.isnan(release_ts), first_seen, release_ts)
+    x = (obs_time - origin[group]) / SECONDS_PER_YEAR
+    y = np.log(obs_price)
+    w = np.exp2(-(now - obs_time) / (RECENCY_HALF_LIFE_DAYS * 86400))
+
+    # Grouped weighted moments
+    counts = np.bincount(group, minlength=n_phones)
+    sw = np.bincount(group, w, n_phones)
+    safe_sw = np.where(sw > 0, sw, 1.0)
+    x_mean = np.bincount(group, w * x, n_phones) / safe_sw
+    y_mean = np.bincount(group, w * y, n_phones) / safe_sw
+    dx = x - x_mean[group]
+    dy = y - y_mean[group]
+    sxx = np.bincount(group, w * dx * dx, n_phones)
+    sxy = np.bincount(group, w * dx * dy, n_phones)
+
+    # Pooled within-phone slope per category (fixed-effects estimator)
+    n_categories = len(categories)
+    has_category = category_of >= 0
+    cat_sxx = np.bincount(category_of[has_category], sxx[has_category], n_categories)
+    cat_sxy = np.bincount(category_of[has_category], sxy[has_category], n_categories)
+    cat_slope = np.divide(cat_sxy, cat_sxx, out=np.zeros(n_categories), where=cat_sxx > 1e-9)
+    prior_slope = np.where(has_category, cat_slope[np.clip(category_of, 0, None)], 0.0)
+
+    # Ridge-shrink each phone's slope towards its category slope
+    slope = (sxy + SLOPE_PRIOR_STRENGTH * prior_slope) / (sxx + SLOPE_PRIOR_STRENGTH)
+    intercept = y_mean - slope * x_mean
+
+    # Residual variance, shrunk towards the category's pooled variance
+    residual = y - intercept[group] - slope[group] * x
+    sse = np.bincount(group, w * residual * residual, n_phones)
+    cat_sse = np.bincount(category_of[has_category], sse[has_category], n_categories)
+    cat_sw = np.bincount(category_of[has_category], sw[has_category], n_categories)
+    cat_sigma2 = np.divide(
+        cat_sse, cat_sw, out=np.full(n_categories, DEFAULT_SIGMA ** 2), where=cat_sse > 1e-12
+    )
+    prior_sigma2 = np.where(has_category, cat_sigma2[np.clip(category_of, 0, None)], DEFAULT_SIGMA ** 2)
+    sigma2 = (sse + VARIANCE_PRIOR_STRENGTH * prior_sigma2) / (sw + VARIANCE_PRIOR_STRENGTH)
+
+    # Most recent observed price per phone
+    latest_price = np.zeros(n_phones)
+    if len(group):
+        order = np.lexsort((obs_time, group))
+        last_of_group = np.r_[group[order][1:] != group[order][:-1], True]
+        latest_price[group[order][last_of_group]] = obs_price[order][last_of_group]
+
+    return ForecastModel(
+        version=version,
+        fitted_at=datetime.now(),
+        reference_time=now,
+        phone_ids=phone_ids,
+        intercept=intercept,
+        slope=slope,
+        age_offset=(now - origin) / SECONDS_PER_YEAR,
+        x_mean=x_mean,
+        sxx=sxx + SLOPE_PRIOR_STRENGTH,
+        weight_sum=safe_sw,
+        sigma2=sigma2,
+        observations=counts,
+        latest_price=latest_price,
+    )
+
+
+_model = None
+_dirty = False
+_refitting = False
+_last_refit = 0.0  # time.monotonic() of the last fit started
+_lock = threading.Lock()
+_fit_lock = threading.Lock()
+
+
+def _refit(db) -> ForecastModel:
+    """Fit a new model and swap it in (caller holds _fit_lock)"""
+    global _model, _dirty, _last_refit
+    _last_refit = time.monotonic()
+    # Writes committed from here on make the new model stale again
+    _dirty = False
+    previous = _model
+    _model = fit(db, version=(previous.version + 1) if previous else 1)
+    if previous is not None:
+        # Documents embedding the old model's predictions (phone detail) must be rebuilt
+        events.publish("forecast")
+    return _model
+
+
+def refit(db) -> ForecastModel:
+    """Fit and publish a new model now (warm-up, scripts)"""
+    with _fit_lock:
+        return _refit(db)
+
+
+def _refit_in_background():
+    global _refitting
+    db = SessionLocal()
+    try:
+        refit(db)
+    except Exception as e:
+        print(f"❌ Forecast refit failed: {e}")
+    finally:
+        db.close()
+        with _lock:
+            _refitting = False
+
+
+def _is_stale(model) -> bool:
+    age = (datetime.now() - model.fitted_at).total_seconds()
+    due = age >= MODEL_TTL_SECONDS or (_dirty and age >= MIN_REFIT_SECONDS)
+    # Also spaces out retries after a failed refit
+    return due and time.monotonic() - _last_refit >= MIN_REFIT_SECONDS
+
+
+def get_model(db) -> ForecastModel:
+    """Return the current model; a stale one is still returned while it is refitted in the background"""
+    global _refitting
+
+    model = _model
+    if model is None:
+        # Only before warm-up has fitted the first model (or with WARMUP=false)
+        with _fit_lock:
+            return _model if _model is not None else _refit(db)
+
+    if _is_stale(model):
+        with _lock:
+            start = not _refitting
+            _refitting = True
+        if start:
+            threading.Thread(target=_refit_in_background, name="forecast-refit", daemon=True).start()
+    return model
+
+
+def invalidate(phone_id: int = None):
+    """Mark the model stale so the next request starts a refit"""
+    global _dirty
+    _dirty = True
+
+
+events.subscribe("price", invalidate)
+events.subscribe("phone", invalidate)
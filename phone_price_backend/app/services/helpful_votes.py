@@ -0,0 +1,51 @@
+"""
+Buffered "helpful" votes for reviews.
+
+Votes are counted in a CounterBuffer and written as one
+UPDATE reviews SET helpful = helpful + CASE id ... END per flush, so a
+burst of clicks costs a single statement and no vote is lost to a
+read-modify-write race. Readers add the pending count to the stored
+value, so a voter always sees their own vote.
+"""
+import os
+
+from sqlalchemy import case, func, update
+
+from app import models
+from app.services import jobs
+from app.services.counters import CounterBuffer
+
+HELPFUL_FLUSH_SECONDS = float(os.getenv("HELPFUL_FLUSH_SECONDS", "5"))
+FLUSH_CHUNK_SIZE = 500
+
+
+def _write_votes(db, votes: dict):
+    review_ids = sorted(votes)
+    for start in range(0, len(review_ids), FLUSH_CHUNK_SIZE):
+        chunk = review_ids[start:start + FLUSH_CHUNK_SIZE]
+        db.execute(
+            update(models.Review)
+            .where(models.Review.id.in_(chunk))
+            .values(helpful=func.coalesce(models.Review.helpful, 0) + case(
+                {review_id: votes[review_id] for review_id in chunk},
+                value=models.Review.id,
+                else_=0,
+            ))
+            .execution_options(synchronize_session=False)
+        )
+
+
+buffer = CounterBuffer("helpful votes", _write_votes, flush_interval=HELPFUL_FLUSH_SECONDS)
+
+
+def vote(review_id: int) -> int:
+    """Buffer one vote; returns the review's pending (unflushed) votes including it"""
+    return buffer.add(review_id)
+
+
+def current(review_id: int, stored) -> int:
+    """Helpful count as the caller should see it: stored value plus pending votes"""
+    return (stored or 0) + buffer.pending(review_id)
+
+
+jobs.register("helpful_votes", HELPFUL_FLUSH_SECONDS, lambda db: buffer.flush(db), run_on_shutdown=True)
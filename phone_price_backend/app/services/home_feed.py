@@ -0,0 +1,142 @@
+"""
+Precomputed home page feed.
+
+A background job rebuilds the feed (biggest recent price drops, cheapest
+phones per category, newest releases and top-rated phones) every
+HOME_FEED_REFRESH_SECONDS and swaps the encoded JSON in with a single
+assignment, so GET /api/home never touches the database once the first
+snapshot exists.
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, select
+
+from app import models, schemas
+from app.services import jobs, review_stats
+
+HOME_FEED_REFRESH_SECONDS = int(os.getenv("HOME_FEED_REFRESH_SECONDS", "300"))
+PRICE_DROP_WINDOW_DAYS = 30
+SECTION_SIZE = 10
+CHEAPEST_PER_CATEGORY = 6
+# Phones need a few reviews before they can rank as top-rated
+MIN_REVIEWS = 3
+
+
+def build_feed(db) -> schemas.HomeFeed:
+    """Compute every home page section from four queries"""
+    # Catalog with each phone's lowest active price and number of shops
+    catalog = db.execute(
+        select(
+            models.Phone.id, models.Phone.brand, models.Phone.model, models.Phone.category,
+            models.Phone.image_url, models.Phone.release_year, models.Phone.created_at,
+            func.min(models.ShopPrice.price).label("price"),
+            func.count(models.ShopPrice.id).label("shop_count"),
+        )
+        .outerjoin(
+            models.ShopPrice,
+            and_(models.ShopPrice.phone_id == models.Phone.id, models.ShopPrice.is_active == True)
+        )
+        .group_by(models.Phone.id)
+    ).all()
+    phones = {row.id: row for row in catalog}
+
+    def card(row, **extra):
+        return {
+            "id": row.id, "brand": row.brand, "model": row.model, "category": row.category,
+            "image_url": row.image_url, "release_year": row.release_year,
+            "price": row.price, "shop_count": row.shop_count, **extra,
+        }
+
+    # Biggest drops: current active price against the highest recorded
+    # price for the same phone and shop within the window
+    since = datetime.now() - timedelta(days=PRICE_DROP_WINDOW_DAYS)
+    peaks = (
+        select(
+            models.PriceHistory.phone_id, models.PriceHistory.shop_id,
+            func.max(models.PriceHistory.price).label("peak"),
+        )
+        .where(models.PriceHistory.recorded_at >= since)
+        .group_by(models.PriceHistory.phone_id, models.PriceHistory.shop_id)
+        .subquery()
+    )
+    drops = db.execute(
+        select(models.ShopPrice.phone_id, models.ShopPrice.shop_id, models.ShopPrice.price, peaks.c.peak, models.Shop.name)
+        .join(peaks, and_(peaks.c.phone_id == models.ShopPrice.phone_id, peaks.c.shop_id == models.ShopPrice.shop_id))
+        .join(models.Shop, models.Shop.id == models.ShopPrice.shop_id)
+        .where(models.ShopPrice.is_active == True, models.ShopPrice.price < peaks.c.peak)
+    ).all()
+    best_drop = {}
+    for phone_id, shop_id, price, peak, shop_name in drops:
+        percent = (peak - price) / peak * 100
+        if phone_id in phones and percent > best_drop.get(phone_id, (0,))[0]:
+            best_drop[phone_id] = (percent, shop_id, shop_name, price, peak)
+    price_drops = [
+        card(
+            phones[phone_id], shop_id=shop_id, shop_name=shop_name, current_price=price,
+            previous_price=peak, drop_amount=peak - price, drop_percent=round(percent, 2),
+        )
+        for phone_id, (percent, shop_id, shop_name, price, peak) in sorted(
+            best_drop.items(), key=lambda item: -item[1][0]
+        )[:SECTION_SIZE]
+    ]
+
+    cheapest_by_category = {}
+    for row in sorted((row for row in catalog if row.price is not None), key=lambda row: (row.price, row.id)):
+        section = cheapest_by_category.setdefault(row.category, [])
+        if len(section) < CHEAPEST_PER_CATEGORY:
+            section.append(card(row))
+
+    newest = [
+        card(row) for row in sorted(
+            catalog,
+            key=lambda row: (row.release_year or 0, row.created_at or datetime.min, row.id),
+            reverse=True,
+        )[:SECTION_SIZE]
+    ]
+
+    ratings = db.execute(
+        select(models.ReviewStats.phone_id, models.ReviewStats.rating_sum, models.ReviewStats.review_count)
+        .where(
+            models.ReviewStats.phone_id != review_stats.GLOBAL_ID,
+            models.ReviewStats.review_count >= MIN_REVIEWS,
+        )
+    ).all()
+    top_rated = [
+        card(phones[phone_id], average_rating=round(rating_sum / count, 2), review_count=count)
+        for phone_id, rating_sum, count in sorted(ratings, key=lambda row: (-row[1] / row[2], -row[2], row[0]))
+        if phone_id in phones
+    ][:SECTION_SIZE]
+
+    return schemas.HomeFeed(
+        generated_at=datetime.now(),
+        price_drops=price_drops,
+        cheapest_by_category=cheapest_by_category,
+        newest=newest,
+        top_rated=top_rated,
+    )
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def refresh(db):
+    """Rebuild the feed and atomically swap in the new encoded snapshot"""
+    global _snapshot
+    _snapshot = build_feed(db).model_dump_json().encode("utf-8")
+    return _snapshot
+
+
+def get_feed(db):
+    """Encoded JSON feed; built inline only if the job has not produced one yet"""
+    if _snapshot is not None:
+        return _snapshot
+    with _lock:
+        if _snapshot is None:
+            refresh(db)
+        return _snapshot
+
+
+jobs.register("home_feed", HOME_FEED_REFRESH_SECONDS, refresh)
@@ -0,0 +1,93 @@
+"""
+Periodic background jobs run inside the API process.
+
+Services register a job with a function taking a database session; the
+app lifespan starts one asyncio task per job that runs the function in
+the threadpool (so blocking DB work never stalls the event loop) and then
+sleeps for the job's interval. Set BACKGROUND_JOBS=false to disable them,
+e.g. for one-off scripts or when a separate worker runs the jobs. Jobs
+registered with run_on_shutdown (buffer flushes) also run once when the
+app stops, even if periodic runs are disabled.
+"""
+import asyncio
+import os
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+
+ENABLED = os.getenv("BACKGROUND_JOBS", "True").lower() == "true"
+
+
+class PeriodicJob:
+    def __init__(self, name: str, interval_seconds: float, func, run_on_shutdown: bool = False):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.run_on_shutdown = run_on_shutdown
+        self.last_run = None
+        self.last_duration = None
+        self.last_error = None
+
+    def run_once(self):
+        """Run the job synchronously with its own session"""
+        db = SessionLocal()
+        start = time.perf_counter()
+        try:
+            self.func(db)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ Background job {self.name} failed: {e}")
+        finally:
+            db.close()
+            self.last_run = time.time()
+            self.last_duration = time.perf_counter() - start
+
+    async def run_forever(self):
+        while True:
+            await run_in_threadpool(self.run_once)
+            await asyncio.sleep(self.interval_seconds)
+
+
+_jobs = {}
+_tasks = []
+
+
+def register(name: str, interval_seconds: float, func, run_on_shutdown: bool = False):
+    """Register (or replace) a periodic job; func receives a Session"""
+    _jobs[name] = PeriodicJob(name, interval_seconds, func, run_on_shutdown)
+    return _jobs[name]
+
+
+def start():
+    """Start every registered job on the running event loop"""
+    if not ENABLED:
+        print("ℹ️  Background jobs disabled (BACKGROUND_JOBS=false)")
+        return
+    for job in _jobs.values():
+        _tasks.append(asyncio.create_task(job.run_forever(), name=f"job:{job.name}"))
+
+
+async def stop():
+    """Cancel running jobs, wait for them to finish, then run the shutdown jobs"""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    for job in _jobs.values():
+        if job.run_on_shutdown:
+            await run_in_threadpool(job.run_once)
+
+
+def status():
+    return {
+        name: {
+            "interval_seconds": job.interval_seconds,
+            "last_run": job.last_run,
+            "last_duration": job.last_duration,
+            "last_error": job.last_error,
+        }
+        for name, job in _jobs.items()
+    }
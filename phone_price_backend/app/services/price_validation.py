@@ -0,0 +1,181 @@
+"""
+Outlier checks for incoming shop prices.
+
+Each phone's reference distribution is its active shop prices plus its
+price_history over the last HISTORY_WINDOW_DAYS. The robust statistics of
+that sample (median and MAD) are computed for every phone at once with
+grouped NumPy sorts and cached in memory; price writes mark the phone
+dirty so only its statistics are recomputed on the next check.
+
+A price is an outlier when its robust z-score
+
+    0.6745 * |price - median| / MAD
+
+exceeds Z_THRESHOLD, or - for phones with too few samples for a
+meaningful MAD - when it is more than MAX_RATIO times off the median
+(the "extra zero" typo).
+"""
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app import models
+from app.lazy_imports import lazy_import
+from app.services import events
+
+np = lazy_import("numpy")
+
+HISTORY_WINDOW_DAYS = 180
+MIN_SAMPLES = 3
+Z_THRESHOLD = 3.5
+MAX_RATIO = 3.0
+# MAD floor as a fraction of the median, so identical prices don't make every change an outlier
+MIN_MAD_FRACTION = 0.05
+
+
+def _grouped_median(groups, values):
+    """Median of values per group id (groups are 0..n-1, every group non-empty)"""
+    order = np.lexsort((values, groups))
+    values = values[order]
+    counts = np.bincount(groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2.0
+
+
+def compute_stats(db, phone_ids=None):
+    """{phone_id: (median, mad, samples)} for the given phones, or all when None"""
+    price_query = select(models.ShopPrice.phone_id, models.ShopPrice.price).where(
+        models.ShopPrice.is_active == True
+    )
+    history_query = select(models.PriceHistory.phone_id, models.PriceHistory.price).where(
+        models.PriceHistory.recorded_at >= datetime.now() - timedelta(days=HISTORY_WINDOW_DAYS)
+    )
+    if phone_ids is not None:
+        ids = list(phone_ids)
+        price_query = price_query.where(models.ShopPrice.phone_id.in_(ids))
+        history_query = history_query.where(models.PriceHistory.phone_id.in_(ids))
+
+    samples = db.execute(price_query).all() + db.execute(history_query).all()
+    if not samples:
+        return {}
+
+    phones = np.array([row[0] for row in samples], dtype=np.int64)
+    prices = np.array([row[1] for row in samples], dtype=np.float64)
+    unique_phones, groups = np.unique(phones, return_inverse=True)
+
+    medians = _grouped_median(groups, prices)
+    mads = _grouped_median(groups, np.abs(prices - medians[groups]))
+    counts = np.bincount(groups)
+    return {
+        int(phone_id): (float(median), float(mad), int(count))
+        for phone_id, median, mad, count in zip(unique_phones, medians, mads, counts)
+    }
+
+
+def assess(stats, price):
+    """Outlier details for a price against (median, mad, samples), or None if it looks fine"""
+    if stats is None or price is None:
+        return None
+    median, mad, samples = stats
+    if median <= 0:
+        return None
+
+    mad = max(mad, MIN_MAD_FRACTION * median)
+    robust_z = 0.6745 * (price - median) / mad
+    ratio = price / median
+    too_far = samples >= MIN_SAMPLES and abs(robust_z) > Z_THRESHOLD
+    way_off = ratio > MAX_RATIO or ratio < 1 / MAX_RATIO
+    if not (too_far or way_off):
+        return None
+    return {
+        "median": int(round(median)),
+        "mad": int(round(mad)),
+        "samples": samples,
+        "robust_z": round(float(robust_z), 2),
+        "ratio": round(float(ratio), 3),
+    }
+
+
+_stats = None
+_dirty_ids = set()
+_lock = threading.Lock()
+
+
+def get_stats(db):
+    """Cached per-phone statistics, refreshing dirty phones first"""
+    global _stats
+
+    if _stats is not None and not _dirty_ids:
+        return _stats
+
+    with _lock:
+        if _stats is None:
+            _dirty_ids.clear()
+            _stats = compute_stats(db)
+        elif _dirty_ids:
+            dirty = set(_dirty_ids)
+            _dirty_ids.difference_update(dirty)
+            stats = dict(_stats)
+            for phone_id in dirty:
+                stats.pop(phone_id, None)
+            stats.update(compute_stats(db, dirty))
+            _stats = stats
+        return _stats
+
+
+def check_price(db, phone_id: int, price: int):
+    """Outlier details for an incoming price, or None if it is plausible"""
+    return assess(get_stats(db).get(phone_id), price)
+
+
+def scan_outliers(db):
+    """Every active listing that is an outlier against its phone's distribution, worst first"""
+    stats = get_stats(db)
+    listings = db.execute(
+        select(models.ShopPrice.id, models.ShopPrice.phone_id, models.ShopPrice.shop_id, models.ShopPrice.price)
+        .where(models.ShopPrice.is_active == True)
+    ).all()
+    if not listings:
+        return []
+
+    known = [row for row in listings if row[1] in stats]
+    if not known:
+        return []
+    table = np.array([[stats[row[1]][0], stats[row[1]][1], stats[row[1]][2]] for row in known])
+    prices = np.array([row[3] for row in known], dtype=np.float64)
+    median, mad, samples = table[:, 0], table[:, 1], table[:, 2]
+
+    valid = median > 0
+    safe_median = np.where(valid, median, 1.0)
+    mad = np.maximum(mad, MIN_MAD_FRACTION * safe_median)
+    robust_z = 0.6745 * (prices - median) / np.where(mad > 0, mad, 1.0)
+    ratio = prices / safe_median
+    flagged = valid & (
+        ((samples >= MIN_SAMPLES) & (np.abs(robust_z) > Z_THRESHOLD))
+        | (ratio > MAX_RATIO) | (ratio < 1 / MAX_RATIO)
+    )
+
+    outliers = []
+    for i in np.flatnonzero(flagged)[np.argsort(-np.abs(robust_z[flagged]), kind="stable")]:
+        price_id, phone_id, shop_id, price = known[i]
+        outliers.append({
+            "price_id": price_id,
+            "phone_id": phone_id,
+            "shop_id": shop_id,
+            "price": price,
+            **assess(stats[phone_id], price),
+        })
+    return outliers
+
+
+def mark_dirty(phone_id: int = None):
+    """Queue a phone's statistics for recomputation; None drops the whole cache"""
+    global _stats
+    if phone_id is None:
+        _stats = None
+    else:
+        _dirty_ids.add(phone_id)
+
+
+events.subscribe("price", mark_dirty)
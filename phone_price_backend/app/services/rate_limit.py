@@ -0,0 +1,255 @@
+"""
+Token-bucket rate limiting for the public endpoints scrapers and spammers hit.
+
+Each (rule, client) pair has a bucket holding up to `capacity` tokens that
+refills at `per_minute` tokens a minute; a request spends one token, and a
+request that finds the bucket empty gets 429 with Retry-After set to the
+seconds until the next token. A bucket is just (tokens, last refill), so
+memory is O(1) per active key, and buckets idle long enough to have
+refilled completely are swept away, since a missing bucket counts as full.
+
+Buckets live in this process by default. With WEB_CONCURRENCY > 1 or
+several instances, set RATE_LIMIT_STORE_URL to a database every worker can
+reach (a table updated with one atomic UPDATE per request); any SQLAlchemy
+URL works, so sqlite:///rate_limit_standin.db stands in locally. When the
+store is unreachable requests are let through rather than failed.
+
+Clients are keyed by the connection's address. X-Forwarded-For is only
+believed when the connection comes from one of TRUSTED_PROXIES (none by
+default), since anyone can send the header; alternatively run uvicorn with
+--proxy-headers --forwarded-allow-ips=<proxy> so it rewrites the address.
+
+Limits are configured per rule as RATE_LIMIT_<NAME>="capacity/per_minute",
+e.g. RATE_LIMIT_SEARCH=60/240. Set RATE_LIMIT=false to disable limiting.
+"""
+import ipaddress
+import math
+import os
+import time
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import case, select
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.database import create_database_engine
+
+ENABLED = os.getenv("RATE_LIMIT", "True").lower() == "true"
+RATE_LIMIT_STORE_URL = os.getenv("RATE_LIMIT_STORE_URL", "")
+SWEEP_SECONDS = 60
+# Proxies allowed to set X-Forwarded-For, e.g. TRUSTED_PROXIES=10.0.0.0/8,127.0.0.1
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(network.strip(), strict=False)
+    for network in os.getenv("TRUSTED_PROXIES", "").split(",") if network.strip()
+]
+
+
+class Rule:
+    """Requests with one of `methods` whose path starts with `prefix` (and ends with `suffix`) share a bucket per client"""
+
+    def __init__(self, name: str, methods, prefix: str, default: str, suffix: str = "", exact: bool = False):
+        self.name = name
+        self.methods = frozenset(methods)
+        self.prefix = prefix
+        self.suffix = suffix
+        self.exact = exact
+        capacity, per_minute = os.getenv(f"RATE_LIMIT_{name.upper()}", default).split("/")
+        self.capacity = max(1.0, float(capacity))
+        self.per_second = float(per_minute) / 60
+
+    @property
+    def idle_seconds(self):
+        """Time an empty bucket takes to refill completely"""
+        return self.capacity / self.per_second
+
+    def matches(self, method: str, path: str) -> bool:
+        if method not in self.methods:
+            return False
+        if self.exact:
+            return path == self.prefix
+        return path.startswith(self.prefix) and path.endswith(self.suffix)
+
+
+# First match wins
+RULES = [
+    Rule("search", ["GET"], "/api/search/", "30/120"),
+    Rule("reviews", ["POST"], "/api/reviews/", "10/2", exact=True),
+    Rule("helpful_votes", ["PUT"], "/api/reviews/", "30/10", suffix="/helpful"),
+    Rule("subscribers", ["POST"], "/api/subscribers", "3/0.2"),
+]
+
+
+class MemoryBucketStore:
+    """Buckets in this process: key -> [tokens, monotonic time of the last refill]"""
+
+    blocking = False
+
+    def __init__(self):
+        self._buckets = {}
+
+    def take(self, key: str, capacity: float, per_second: float) -> float:
+        """Spend a token; returns 0.0, or the seconds until one is available"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = [capacity - 1, now]
+            return 0.0
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * per_second)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / per_second
+
+    def sweep(self, idle_seconds: float):
+        """Drop buckets that have refilled completely"""
+        cutoff = time.monotonic() - idle_seconds
+        for key in [key for key, bucket in self._buckets.items() if bucket[1] < cutoff]:
+            del self._buckets[key]
+
+    def clear(self):
+        self._buckets.clear()
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class DatabaseBucketStore:
+    """Buckets in the rate_limit_buckets table, shared by every worker using the same database"""
+
+    blocking = True
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.table = models.RateLimitBucket.__table__
+        self.table.create(engine, checkfirst=True)
+
+    def take(self, key: str, capacity: float, per_second: float) -> float:
+        """Spend a token; returns 0.0, or the seconds until one is available"""
+        table = self.table
+        now = time.time()
+        refilled = table.c.tokens + (now - table.c.updated_at) * per_second
+        available = case((refilled > capacity, capacity), else_=refilled)
+        with self.engine.begin() as connection:
+            # Refill and spend in one statement, so concurrent workers never both take the last token
+            # (SET follows column order, tokens before updated_at, so MySQL computes it from the old refill time)
+            spent = connection.execute(
+                table.update()
+                .where(table.c.key == key, available >= 1)
+                .values(tokens=available - 1, updated_at=now)
+            ).rowcount
+            if spent:
+                return 0.0
+            tokens = connection.execute(select(available).where(table.c.key == key)).scalar()
+        if tokens is not None:
+            # Another worker may have refilled it meanwhile; retrying a second later is harmless
+            return max((1 - tokens) / per_second, 1.0)
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(table.insert().values(key=key, tokens=capacity - 1, updated_at=now))
+            return 0.0
+        except IntegrityError:
+            # Another worker created the bucket first
+            return self.take(key, capacity, per_second)
+
+    def sweep(self, idle_seconds: float):
+        """Drop buckets that have refilled completely"""
+        with self.engine.begin() as connection:
+            connection.execute(self.table.delete().where(self.table.c.updated_at < time.time() - idle_seconds))
+
+    def clear(self):
+        with self.engine.begin() as connection:
+            connection.execute(self.table.delete())
+
+
+class RateLimiter:
+    def __init__(self, store, rules):
+        self.store = store
+        self.rules = rules
+        self.idle_seconds = max((rule.idle_seconds for rule in rules), default=0)
+        self._next_sweep = 0.0
+        self.limited = 0
+
+    def match(self, method: str, path: str):
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    def take(self, rule: Rule, client: str) -> float:
+        """Spend one of the client's tokens for rule; returns 0.0, or the seconds to wait"""
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._next_sweep = now + SWEEP_SECONDS
+            self.store.sweep(self.idle_seconds)
+        wait = self.store.take(f"{rule.name}:{client}", rule.capacity, rule.per_second)
+        if wait:
+            self.limited += 1
+        return wait
+
+
+def create_store(store_url: str = RATE_LIMIT_STORE_URL):
+    if store_url:
+        try:
+            return DatabaseBucketStore(create_database_engine(store_url))
+        except Exception as e:
+            print(f"Warning: Rate limit store unavailable, limiting per process - {e}")
+    return MemoryBucketStore()
+
+
+limiter = RateLimiter(create_store(), RULES)
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def client_key(scope) -> str:
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if not _is_trusted_proxy(address):
+        return address
+    for name, value in scope["headers"]:
+        if name == b"x-forwarded-for":
+            # Each trusted proxy appends the address it saw; the last untrusted hop is the client
+            for hop in reversed(value.decode("latin-1").split(",")):
+                hop = hop.strip()
+                if not _is_trusted_proxy(hop):
+                    return hop
+            break
+    return address
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 with Retry-After once a client's bucket for a route is empty"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and ENABLED:
+            rule = limiter.match(scope["method"], scope["path"])
+            if rule is not None:
+                try:
+                    if limiter.store.blocking:
+                        wait = await run_in_threadpool(limiter.take, rule, client_key(scope))
+                    else:
+                        wait = limiter.take(rule, client_key(scope))
+                except Exception as e:
+                    print(f"⚠️ Rate limit check failed, allowing request: {e}")
+                    wait = 0.0
+                if wait:
+                    response = JSONResponse(
+                        {"detail": "Too many requests, please slow down"},
+                        status_code=429,
+                        headers={"Retry-After": str(math.ceil(wait))},
+                    )
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
@@ -0,0 +1,218 @@
+"""
+Spec-based similarity engine for "AI Picks" and similar-phone recommendations.
+
+Specs are parsed into a numeric feature matrix (one row per phone) that
+is held in memory as a NumPy array. Columns are log-scaled where values
+span orders of magnitude, standardized, and rows are L2-normalized so
+similarity is a single matrix-vector product (cosine).
+
+The raw rows are refreshed incrementally: spec, price and phone writes
+mark the affected phone ids dirty and only those rows are reloaded before
+the next query re-standardizes the (cheap) matrix.
+"""
+import threading
+
+from sqlalchemy import func, select
+
+from app import models
+from app.lazy_imports import lazy_import
+from app.services import events, spec_parser
+
+np = lazy_import("numpy")
+
+FEATURES = (
+    "ram_gb", "storage_gb", "battery_mah", "display_inches",
+    "refresh_rate_hz", "camera_mp", "price", "feature_score",
+)
+# Features compared on a log scale (1TB vs 512GB matters as much as 128GB vs 64GB)
+LOG_FEATURES = {"ram_gb", "storage_gb", "price"}
+# Features that make a phone "better" for the best-value ranking
+QUALITY_FEATURES = [f for f in FEATURES if f != "price"]
+# How strongly a higher price counts against a phone in best-value ranking
+PRICE_PENALTY = 0.5
+
+
+class Recommender:
+    """Feature rows keyed by phone id plus the normalized matrix built from them"""
+
+    def __init__(self):
+        self.rows = {}  # phone_id -> raw feature vector (NaN = unknown)
+        self.meta = {}  # phone_id -> phone fields for responses
+        self.phone_ids = np.empty(0, dtype=np.int64)
+        self.position = {}
+        self.categories = np.empty(0, dtype=object)
+        self.raw = np.empty((0, len(FEATURES)))
+        self.standardized = np.empty((0, len(FEATURES)))
+        self.unit = np.empty((0, len(FEATURES)))
+
+    def copy(self):
+        """Shallow copy of the raw rows, so a refresh never mutates a matrix being read"""
+        clone = Recommender()
+        clone.rows = dict(self.rows)
+        clone.meta = dict(self.meta)
+        return clone
+
+    def load(self, db, phone_ids=None):
+        """(Re)load raw rows for the given phones, or for every phone when None"""
+        phone_query = select(
+            models.Phone.id, models.Phone.brand, models.Phone.model, models.Phone.category,
+            models.Phone.image_url, models.Phone.release_year,
+        )
+        spec_query = select(models.Spec.phone_id, models.Spec.key_name, models.Spec.value).where(
+            func.lower(models.Spec.key_name).in_(spec_parser.SOURCE_KEYS)
+        )
+        price_query = select(
+            models.ShopPrice.phone_id, func.min(models.ShopPrice.price)
+        ).where(models.ShopPrice.is_active == True).group_by(models.ShopPrice.phone_id)
+        feature_query = select(
+            models.PhoneFeature.phone_id, func.avg(models.PhoneFeature.score)
+        ).group_by(models.PhoneFeature.phone_id)
+
+        if phone_ids is not None:
+            ids = list(phone_ids)
+            phone_query = phone_query.where(models.Phone.id.in_(ids))
+            spec_query = spec_query.where(models.Spec.phone_id.in_(ids))
+            price_query = price_query.where(models.ShopPrice.phone_id.in_(ids))
+            feature_query = feature_query.where(models.PhoneFeature.phone_id.in_(ids))
+            # Phones that no longer exist simply drop out
+            for phone_id in ids:
+                self.rows.pop(phone_id, None)
+                self.meta.pop(phone_id, None)
+        else:
+            self.rows.clear()
+            self.meta.clear()
+
+        specs = {}
+        for phone_id, key, value in db.execute(spec_query):
+            specs.setdefault(phone_id, []).append((key, value))
+        prices = dict(db.execute(price_query).all())
+        feature_scores = dict(db.execute(feature_query).all())
+
+        for phone in db.execute(phone_query):
+            attributes = spec_parser.parse_specs(specs.get(phone.id, ()))
+            attributes["price"] = prices.get(phone.id)
+            score = feature_scores.get(phone.id)
+            attributes["feature_score"] = float(score) if score is not None else None
+            self.rows[phone.id] = np.array(
+                [attributes.get(f) if attributes.get(f) is not None else np.nan for f in FEATURES],
+                dtype=np.float64,
+            )
+            self.meta[phone.id] = phone._asdict()
+
+        self._rebuild_matrix()
+
+    def _rebuild_matrix(self):
+        self.phone_ids = np.array(sorted(self.rows), dtype=np.int64)
+        self.position = {int(phone_id): i for i, phone_id in enumerate(self.phone_ids)}
+        self.categories = np.array([self.meta[int(p)]["category"] for p in self.phone_ids], dtype=object)
+        if not len(self.phone_ids):
+            self.raw = np.empty((0, len(FEATURES)))
+            self.standardized = self.unit = self.raw
+            return
+
+        self.raw = np.vstack([self.rows[int(phone_id)] for phone_id in self.phone_ids])
+        scaled = self.raw.copy()
+        for j, feature in enumerate(FEATURES):
+            if feature in LOG_FEATURES:
+                scaled[:, j] = np.log1p(scaled[:, j])
+
+        # Standardize columns; unknown values sit at the column mean (0)
+        with np.errstate(invalid="ignore"):
+            known = ~np.isnan(scaled)
+            counts = known.sum(axis=0)
+            mean = np.where(counts > 0, np.nansum(scaled, axis=0) / np.maximum(counts, 1), 0.0)
+            centered = np.where(known, scaled - mean, 0.0)
+            std = np.sqrt((centered ** 2).sum(axis=0) / np.maximum(counts, 1))
+        self.standardized = centered / np.where(std > 0, std, 1.0)
+
+        norms = np.linalg.norm(self.standardized, axis=1, keepdims=True)
+        self.unit = self.standardized / np.where(norms > 0, norms, 1.0)
+
+    def _result(self, i, score):
+        phone_id = int(self.phone_ids[i])
+        price = self.raw[i, FEATURES.index("price")]
+        return {
+            **self.meta[phone_id],
+            "price": None if np.isnan(price) else int(price),
+            "score": round(float(score), 4),
+        }
+
+    def similar(self, phone_id: int, limit: int = 10, category: str = None):
+        """k nearest phones by cosine similarity of their feature vectors"""
+        i = self.position.get(phone_id)
+        if i is None:
+            return None
+
+        scores = self.unit @ self.unit[i]
+        scores[i] = -np.inf
+        if category:
+            scores[self.categories != category] = -np.inf
+        return self._top(scores, limit)
+
+    def best_value(self, budget: int = None, category: str = None, limit: int = 10):
+        """Phones with the best specs for their price, optionally within a budget"""
+        if not len(self.phone_ids):
+            return []
+
+        quality_columns = [FEATURES.index(f) for f in QUALITY_FEATURES]
+        price_column = FEATURES.index("price")
+        quality = self.standardized[:, quality_columns].mean(axis=1)
+        scores = quality - PRICE_PENALTY * self.standardized[:, price_column]
+
+        # Only phones that can actually be bought are ranked
+        price = self.raw[:, price_column]
+        eligible = ~np.isnan(price)
+        if budget is not None:
+            eligible &= price <= budget
+        if category:
+            eligible &= self.categories == category
+        scores = np.where(eligible, scores, -np.inf)
+        return self._top(scores, limit)
+
+    def _top(self, scores, limit):
+        candidates = np.flatnonzero(np.isfinite(scores))
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [self._result(i, scores[i]) for i in candidates]
+
+
+_recommender = None
+_dirty_ids = set()
+_lock = threading.Lock()
+
+
+def get_recommender(db) -> Recommender:
+    """Return the shared recommender, building it or refreshing dirty phones first"""
+    global _recommender
+
+    if _recommender is not None and not _dirty_ids:
+        return _recommender
+
+    with _lock:
+        if _recommender is None:
+            recommender = Recommender()
+            _dirty_ids.clear()
+            recommender.load(db)
+            _recommender = recommender
+        elif _dirty_ids:
+            dirty = set(_dirty_ids)
+            _dirty_ids.difference_update(dirty)
+            recommender = _recommender.copy()
+            recommender.load(db, dirty)
+            _recommender = recommender
+        return _recommender
+
+
+def mark_dirty(phone_id: int = None):
+    """Queue a phone for reload; None forces a full rebuild"""
+    global _recommender
+    if phone_id is None:
+        _recommender = None
+    else:
+        _dirty_ids.add(phone_id)
+
+
+events.subscribe("spec", mark_dirty)
+events.subscribe("price", mark_dirty)
+events.subscribe("phone", mark_dirty)
@@ -0,0 +1,116 @@
+"""
+Incrementally maintained review aggregates.
+
+review_stats keeps one row of counters (count, rating sum and the 1-5
+histogram) per phone plus a GLOBAL_ID row for all reviews. Review writes
+adjust the affected rows with a relative UPDATE in the caller's
+transaction, so the counters commit or roll back together with the
+review itself and concurrent writers never overwrite each other.
+Reading an aggregate is then a primary-key lookup instead of a scan of
+the reviews table.
+"""
+from sqlalchemy import case, delete, func, insert, literal, select, update
+
+from app import models
+
+GLOBAL_ID = 0
+RATINGS = range(1, 6)
+COUNTER_COLUMNS = ("review_count", "rating_sum") + tuple(f"rating_{r}" for r in RATINGS)
+
+
+def _insert_missing(db, phone_ids):
+    """Create zeroed counter rows, ignoring rows another transaction already created"""
+    table = models.ReviewStats.__table__
+    rows = [{"phone_id": phone_id, **{column: 0 for column in COUNTER_COLUMNS}} for phone_id in phone_ids]
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "mysql":
+        stmt = insert(table).prefix_with("IGNORE")
+    elif dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).on_conflict_do_nothing(index_elements=["phone_id"])
+    else:
+        existing = set(db.execute(select(table.c.phone_id).where(table.c.phone_id.in_(phone_ids))).scalars())
+        rows = [row for row in rows if row["phone_id"] not in existing]
+        stmt = insert(table)
+    if rows:
+        db.execute(stmt, rows)
+
+
+def apply_review_change(db, phone_id: int, added_rating: int = None, removed_rating: int = None):
+    """Adjust the phone's and the global counters for one review write (no commit).
+
+    Pass added_rating for a new review, removed_rating for a deleted one
+    and both when a review's rating changes.
+    """
+    table = models.ReviewStats.__table__
+    deltas = {}
+    if added_rating is not None:
+        deltas["review_count"] = deltas.get("review_count", 0) + 1
+        deltas["rating_sum"] = deltas.get("rating_sum", 0) + added_rating
+        deltas[f"rating_{added_rating}"] = deltas.get(f"rating_{added_rating}", 0) + 1
+    if removed_rating is not None:
+        deltas["review_count"] = deltas.get("review_count", 0) - 1
+        deltas["rating_sum"] = deltas.get("rating_sum", 0) - removed_rating
+        deltas[f"rating_{removed_rating}"] = deltas.get(f"rating_{removed_rating}", 0) - 1
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    phone_ids = [phone_id, GLOBAL_ID]
+    _insert_missing(db, phone_ids)
+    db.execute(
+        update(table)
+        .where(table.c.phone_id.in_(phone_ids))
+        .values({column: table.c[column] + delta for column, delta in deltas.items()})
+    )
+
+
+def summarize(stats):
+    """total_reviews/average_rating/rating_distribution from a counters row (or None)"""
+    count = stats.review_count if stats else 0
+    return {
+        "total_reviews": count,
+        "average_rating": round(stats.rating_sum / count, 2) if count else 0,
+        "rating_distribution": {r: getattr(stats, f"rating_{r}") if stats else 0 for r in RATINGS},
+    }
+
+
+def get_summary(db, phone_id: int = GLOBAL_ID):
+    """Review summary for one phone, or for all reviews by default"""
+    stats = db.get(models.ReviewStats, phone_id)
+    return summarize(stats)
+
+
+def rebuild(connection):
+    """Recompute every counter row from the reviews table; returns the number of phones"""
+    counters = [
+        func.count(models.Review.id),
+        func.coalesce(func.sum(models.Review.rating), 0),
+    ] + [
+        func.coalesce(func.sum(case((models.Review.rating == rating, 1), else_=0)), 0)
+        for rating in RATINGS
+    ]
+    columns = ["phone_id", *COUNTER_COLUMNS]
+
+    connection.execute(delete(models.ReviewStats))
+    per_phone = connection.execute(
+        insert(models.ReviewStats).from_select(
+            columns, select(models.Review.phone_id, *counters).group_by(models.Review.phone_id)
+        )
+    )
+    connection.execute(
+        insert(models.ReviewStats).from_select(columns, select(literal(GLOBAL_ID), *counters))
+    )
+    return per_phone.rowcount
+
+
+# Columns for joining review_stats onto phone listings
+REVIEW_COUNT = func.coalesce(models.ReviewStats.review_count, 0).label("review_count")
+AVERAGE_RATING = case(
+    (models.ReviewStats.review_count > 0,
+     func.round(models.ReviewStats.rating_sum * 1.0 / models.ReviewStats.review_count, 2)),
+    else_=None,
+).label("average_rating")
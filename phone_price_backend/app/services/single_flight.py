@@ -0,0 +1,60 @@
+"""
+Request coalescing for identical concurrent reads.
+
+When many requests ask for the same thing at once (a viral deal's price
+comparison), only the first runs the work; the others await the same
+result. SingleFlight.run(key, func, *args) starts func in the threadpool
+as its own task and parks every concurrent caller with the same key on
+it, so N simultaneous misses cost one set of queries.
+
+The work runs detached from the caller that started it: a client
+disconnecting cancels only its own wait, never the shared computation.
+func therefore opens its own session (see own_session) rather than
+borrowing a request's, and should return an immutable result such as
+encoded JSON. Exceptions (including HTTPException) are shared as well.
+Nothing is cached once the flight lands; the next request starts a new one.
+"""
+import asyncio
+
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+
+
+class SingleFlight:
+    """In-flight computations by key; callers with the same key share one"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight = {}  # key -> asyncio.Task
+        self.started = 0
+        self.coalesced = 0
+
+    def _landed(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the error as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def run(self, key, func, *args):
+        """Result of func(*args), shared with concurrent calls for the same key"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(run_in_threadpool(func, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._landed(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {"in_flight": len(self._inflight), "started": self.started, "coalesced": self.coalesced}
+
+
+def own_session(use_replica: bool = False):
+    """Session for work that outlives the request that started it"""
+    db = SessionLocal()
+    db.info["use_replica"] = use_replica
+    return db
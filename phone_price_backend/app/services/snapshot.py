@@ -0,0 +1,103 @@
+"""
+Columnar (Parquet) snapshots of the shop_prices + phones + shops join.
+
+Rows come off the same server-side cursor used by the streaming exports
+and are converted to Arrow record batches one partition at a time, so a
+snapshot of millions of prices never has to fit in memory as Python objects.
+
+pyarrow is an optional dependency and is only imported when a snapshot is
+actually built.
+"""
+from app.services import export
+
+PARTITION_COLUMNS = ("brand", "date")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.dataset
+    except ImportError as e:
+        raise RuntimeError("Parquet snapshots require pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def snapshot_schema():
+    """Fixed Arrow schema so every batch (including all-null ones) lines up"""
+    pa = _require_pyarrow()
+    return pa.schema([
+        ("id", pa.int64()),
+        ("phone_id", pa.int64()),
+        ("brand", pa.string()),
+        ("model", pa.string()),
+        ("category", pa.string()),
+        ("shop_id", pa.int64()),
+        ("shop_name", pa.string()),
+        ("shop_city", pa.string()),
+        ("price", pa.int64()),
+        ("currency", pa.string()),
+        ("is_active", pa.bool_()),
+        ("updated_at", pa.timestamp("s")),
+        ("date", pa.string()),
+    ])
+
+
+def iter_record_batches(batch_size: int = export.EXPORT_BATCH_SIZE, phone_id: int = None, shop_id: int = None):
+    """Convert streamed row partitions into Arrow record batches"""
+    pa = _require_pyarrow()
+    schema = snapshot_schema()
+    stmt = export.prices_query(phone_id, shop_id)
+
+    for columns, rows in export.stream_partitions(stmt, batch_size):
+        if not rows:
+            continue
+        # Transpose the partition into per-column lists
+        data = dict(zip(columns, map(list, zip(*rows))))
+        data["date"] = [ts.strftime("%Y-%m-%d") if ts else None for ts in data["updated_at"]]
+        yield pa.record_batch([data[field.name] for field in schema], schema=schema)
+
+
+def write_snapshot(
+    output_path: str,
+    partition_by: str = None,
+    compression: str = "zstd",
+    batch_size: int = export.EXPORT_BATCH_SIZE,
+    phone_id: int = None,
+    shop_id: int = None,
+):
+    """Write the price snapshot to a Parquet file, or a hive-partitioned directory.
+
+    Returns the number of rows written.
+    """
+    pa = _require_pyarrow()
+    schema = snapshot_schema()
+    batches = iter_record_batches(batch_size, phone_id, shop_id)
+    row_count = 0
+
+    if partition_by is None:
+        with pa.parquet.ParquetWriter(output_path, schema, compression=compression) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                row_count += batch.num_rows
+        return row_count
+
+    if partition_by not in PARTITION_COLUMNS:
+        raise ValueError(f"partition_by must be one of: {', '.join(PARTITION_COLUMNS)}")
+
+    def counted(batches):
+        nonlocal row_count
+        for batch in batches:
+            row_count += batch.num_rows
+            yield batch
+
+    pa.dataset.write_dataset(
+        pa.RecordBatchReader.from_batches(schema, counted(batches)),
+        output_path,
+        format="parquet",
+        partitioning=[partition_by],
+        partitioning_flavor="hive",
+        file_options=pa.dataset.ParquetFileFormat().make_write_options(compression=compression),
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return row_count
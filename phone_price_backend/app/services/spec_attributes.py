@@ -0,0 +1,42 @@
+"""
+Keeps the typed spec_attributes table in sync with free-text specs.
+
+Call sync_spec_attributes() inside the same transaction that writes
+specs; it re-derives every canonical attribute for the touched phones.
+"""
+from sqlalchemy import delete, insert, select
+
+from app import models
+from app.services import spec_parser
+
+
+def sync_spec_attributes(db, phone_ids):
+    """Re-parse the specs of the given phones into spec_attributes (no commit)"""
+    phone_ids = list(phone_ids)
+    if not phone_ids:
+        return 0
+
+    # Pending spec inserts/updates must be visible to the query below
+    db.flush()
+
+    specs = {}
+    for phone_id, key, value in db.execute(
+        select(models.Spec.phone_id, models.Spec.key_name, models.Spec.value)
+        .where(models.Spec.phone_id.in_(phone_ids))
+    ):
+        specs.setdefault(phone_id, []).append((key, value))
+
+    rows = []
+    for phone_id in phone_ids:
+        for attribute, value in spec_parser.parse_specs(specs.get(phone_id, ())).items():
+            rows.append({
+                "phone_id": phone_id,
+                "attribute": attribute,
+                "num_value": value,
+                "unit": spec_parser.SPEC_ATTRIBUTES[attribute][1],
+            })
+
+    db.execute(delete(models.SpecAttribute).where(models.SpecAttribute.phone_id.in_(phone_ids)))
+    if rows:
+        db.execute(insert(models.SpecAttribute), rows)
+    return len(rows)
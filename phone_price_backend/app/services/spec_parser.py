@@ -0,0 +1,101 @@
+"""
+Parse free-text spec values ("5000 mAh", "4GB / 6GB", "AMOLED, 120Hz")
+into canonical numeric attributes.
+
+SPEC_ATTRIBUTES maps each canonical attribute to the spec keys it can be
+read from (in priority order), its unit and an extractor. Variant lists
+such as "128GB / 256GB" resolve to the largest option.
+"""
+import re
+
+_NUMBER = r"(\d+(?:[.,]\d+)?)"
+_CAPACITY = re.compile(_NUMBER + r"\s*(TB|GB|MB)\b", re.IGNORECASE)
+_CAPACITY_TO_GB = {"tb": 1024.0, "gb": 1.0, "mb": 1 / 1024.0}
+
+
+def _to_float(text: str) -> float:
+    # "5,000" is a thousands separator, "6,7" a decimal comma
+    if "," in text:
+        whole, _, fraction = text.partition(",")
+        text = whole + fraction if len(fraction) == 3 else whole + "." + fraction
+    return float(text)
+
+
+def _capacity_gb(value: str):
+    sizes = [_to_float(n) * _CAPACITY_TO_GB[unit.lower()] for n, unit in _CAPACITY.findall(value)]
+    return max(sizes) if sizes else None
+
+
+def _max_with_unit(unit_pattern: str):
+    pattern = re.compile(_NUMBER + r"\s*(?:" + unit_pattern + r")\b", re.IGNORECASE)
+
+    def extract(value: str):
+        numbers = [_to_float(n) for n in pattern.findall(value)]
+        return max(numbers) if numbers else None
+
+    return extract
+
+
+def _first_with_unit(unit_pattern: str, bare_max: float = None):
+    pattern = re.compile(_NUMBER + r"\s*(?:" + unit_pattern + r")", re.IGNORECASE)
+    bare = re.compile(r"^\s*" + _NUMBER + r"\s*$")
+
+    def extract(value: str):
+        match = pattern.search(value)
+        if match:
+            return _to_float(match.group(1))
+        # Accept a bare number ("6.7") when it is plausible for the unit
+        match = bare.match(value)
+        if match and bare_max is not None and _to_float(match.group(1)) <= bare_max:
+            return _to_float(match.group(1))
+        return None
+
+    return extract
+
+
+# attribute: (source spec keys in priority order, unit, extractor)
+SPEC_ATTRIBUTES = {
+    "ram_gb": (("ram", "memory"), "GB", _capacity_gb),
+    "storage_gb": (("storage", "internal_storage"), "GB", _capacity_gb),
+    "battery_mah": (("battery", "battery_capacity"), "mAh", _max_with_unit("mah")),
+    "display_inches": (("display_size", "screen_size"), "in", _first_with_unit(r"inches|inch|in\b|\"|”", bare_max=20)),
+    "refresh_rate_hz": (("refresh_rate", "display_type", "display"), "Hz", _max_with_unit("hz")),
+    "camera_mp": (("rear_camera", "main_camera", "camera"), "MP", _max_with_unit("mp")),
+    "charging_w": (("charging", "fast_charging"), "W", _max_with_unit("w")),
+    "weight_g": (("weight",), "g", _first_with_unit(r"g\b|grams")),
+}
+
+# Every spec key that feeds at least one attribute, for filtering spec queries
+SOURCE_KEYS = sorted({key for keys, _, _ in SPEC_ATTRIBUTES.values() for key in keys})
+
+
+def parse_value(attribute: str, value: str):
+    """Extract one attribute from a raw spec value, or None if it does not parse"""
+    if not value:
+        return None
+    _, _, extract = SPEC_ATTRIBUTES[attribute]
+    try:
+        return extract(str(value))
+    except ValueError:
+        return None
+
+
+def parse_specs(specs) -> dict:
+    """Canonical attributes from (key_name, value) pairs.
+
+    Keys are matched case-insensitively; when several source keys are
+    present, the first one in SPEC_ATTRIBUTES order that parses wins.
+    """
+    values = {}
+    for key, value in specs:
+        if key:
+            values.setdefault(key.strip().lower(), value)
+
+    attributes = {}
+    for attribute, (keys, _, _) in SPEC_ATTRIBUTES.items():
+        for key in keys:
+            parsed = parse_value(attribute, values.get(key))
+            if parsed is not None:
+                attributes[attribute] = parsed
+                break
+    return attributes
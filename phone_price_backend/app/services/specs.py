@@ -0,0 +1,108 @@
+"""
+Diff-based spec upserts for one or many phones.
+
+Existing specs for every phone in the request are read in one query, the
+changed keys are computed in Python, and the changes are written with one
+INSERT ... ON DUPLICATE KEY UPDATE (ON CONFLICT on SQLite/PostgreSQL) per
+chunk against the (phone_id, key_name) unique key. Unchanged specs are
+never touched.
+"""
+from sqlalchemy import bindparam, delete, insert, select, tuple_, update
+
+from app import models
+from app.services.spec_attributes import sync_spec_attributes
+
+UPSERT_CHUNK_SIZE = 500
+
+
+def _upsert_statement(dialect_name: str):
+    table = models.Spec.__table__
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update(value=stmt.inserted.value)
+    if dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=["phone_id", "key_name"], set_={"value": stmt.excluded.value}
+        )
+    return None
+
+
+def upsert_specs(db, specs_by_phone: dict, prune: bool = True) -> dict:
+    """Apply {phone_id: [(key, value), ...]} to the specs table (no commit).
+
+    With prune=True the given list is the phone's complete spec sheet and
+    keys missing from it are deleted. Returns inserted/updated/deleted/
+    unchanged counts and the ids of phones that actually changed.
+    """
+    desired = {}
+    for phone_id, pairs in specs_by_phone.items():
+        # Later duplicates of a key win, matching sequential writes
+        desired[phone_id] = {key: value for key, value in pairs if key}
+
+    existing = {phone_id: {} for phone_id in desired}
+    if desired:
+        for phone_id, key, value in db.execute(
+            select(models.Spec.phone_id, models.Spec.key_name, models.Spec.value)
+            .where(models.Spec.phone_id.in_(list(desired)))
+        ):
+            existing[phone_id][key] = value
+
+    inserts, updates, deletions = [], [], []
+    unchanged = 0
+    for phone_id, wanted in desired.items():
+        current = existing[phone_id]
+        for key, value in wanted.items():
+            if key not in current:
+                inserts.append({"phone_id": phone_id, "key_name": key, "value": value})
+            elif current[key] != value:
+                updates.append({"phone_id": phone_id, "key_name": key, "value": value})
+            else:
+                unchanged += 1
+        if prune:
+            deletions.extend((phone_id, key) for key in current if key not in wanted)
+
+    changes = inserts + updates
+    upsert = _upsert_statement(db.get_bind().dialect.name)
+    if upsert is not None:
+        for start in range(0, len(changes), UPSERT_CHUNK_SIZE):
+            db.execute(upsert, changes[start:start + UPSERT_CHUNK_SIZE])
+    else:
+        # Portable fallback: executemany inserts plus executemany updates
+        for start in range(0, len(inserts), UPSERT_CHUNK_SIZE):
+            db.execute(insert(models.Spec), inserts[start:start + UPSERT_CHUNK_SIZE])
+        if updates:
+            db.connection().execute(
+                update(models.Spec.__table__)
+                .where(
+                    models.Spec.phone_id == bindparam("b_phone_id"),
+                    models.Spec.key_name == bindparam("b_key_name"),
+                )
+                .values(value=bindparam("b_value")),
+                [{"b_phone_id": r["phone_id"], "b_key_name": r["key_name"], "b_value": r["value"]} for r in updates],
+            )
+
+    for start in range(0, len(deletions), UPSERT_CHUNK_SIZE):
+        db.execute(
+            delete(models.Spec).where(
+                tuple_(models.Spec.phone_id, models.Spec.key_name).in_(deletions[start:start + UPSERT_CHUNK_SIZE])
+            )
+        )
+
+    changed_phones = sorted(
+        {row["phone_id"] for row in changes} | {phone_id for phone_id, _ in deletions}
+    )
+    sync_spec_attributes(db, changed_phones)
+
+    return {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": len(deletions),
+        "unchanged": unchanged,
+        "changed_phone_ids": changed_phones,
+    }
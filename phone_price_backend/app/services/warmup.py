@@ -0,0 +1,141 @@
+"""
+Startup warm-up and readiness.
+
+A fresh instance has empty in-memory indexes and snapshots, no open
+database connections and (after a database restart) cold buffer pools, so
+the first requests after a deploy would pay for all of that. The app
+lifespan runs the warmers below in the background before the instance
+reports ready on /ready: open and ping the pool connections, scan the hot
+catalog tables, and build the price statistics, forecast model, facet
+index, recommender, home feed and affiliate link map. /health stays a
+plain liveness check.
+
+The connection warm-up is required: it is retried until the database
+answers. The cache warmers are best effort; one that fails is logged and
+its cache is simply built by the first request that needs it. Set
+WARMUP=false to skip warm-up and report ready immediately.
+"""
+import asyncio
+import os
+import time
+
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from app import database, models
+from app.database import SessionLocal
+from app.services import affiliate, facets, forecast, home_feed, price_validation, recommender
+
+ENABLED = os.getenv("WARMUP", "True").lower() == "true"
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", "0"))  # 0 = the whole pool_size
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+SCAN_BATCH_SIZE = 5000
+
+# Tables read on almost every page
+CATALOG_TABLES = (models.Phone, models.Shop, models.ShopPrice, models.Spec, models.ReviewStats)
+
+
+def warm_connections():
+    """Open (and ping) up to pool_size connections per engine so the pool starts full"""
+    engines = [database.engine] + list(database.replica_engines)
+    opened = 0
+    for engine in engines:
+        if engine is None:
+            raise RuntimeError("Database engine is not configured")
+        size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+        count = min(size, WARMUP_CONNECTIONS) if WARMUP_CONNECTIONS else size
+        connections = []
+        try:
+            # Hold them all at once, otherwise the pool hands back the same connection
+            for _ in range(count):
+                connection = engine.connect()
+                connection.exec_driver_sql("SELECT 1")
+                connections.append(connection)
+        finally:
+            for connection in connections:
+                connection.close()
+        opened += len(connections)
+    return opened
+
+
+def scan_catalog(db):
+    """Read the hot tables once so their pages are in the database's buffer pool"""
+    rows = 0
+    for model in CATALOG_TABLES:
+        result = db.execute(
+            select(model.__table__).execution_options(stream_results=True, yield_per=SCAN_BATCH_SIZE)
+        )
+        for partition in result.partitions():
+            rows += len(partition)
+    return rows
+
+
+# name -> func(db); run in this order after the connections are warm
+WARMERS = {
+    "catalog": scan_catalog,
+    "price_stats": price_validation.get_stats,
+    "forecast": forecast.refit,
+    "facets": facets.get_index,
+    "recommender": recommender.get_recommender,
+    "home_feed": home_feed.get_feed,
+    "affiliate_links": affiliate.load_links,
+}
+
+_ready = not ENABLED
+_task = None
+_status = {}
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def status():
+    return {"ready": _ready, "steps": dict(_status)}
+
+
+def _run_step(name, func, *args):
+    start = time.perf_counter()
+    try:
+        func(*args)
+        _status[name] = {"ok": True, "seconds": round(time.perf_counter() - start, 3)}
+        return True
+    except Exception as e:
+        _status[name] = {"ok": False, "seconds": round(time.perf_counter() - start, 3), "error": str(e)}
+        print(f"⚠️ Warm-up step {name} failed: {e}")
+        return False
+
+
+def _run_warmer(name, func):
+    db = SessionLocal()
+    try:
+        _run_step(name, func, db)
+    finally:
+        db.close()
+
+
+async def run():
+    """Warm connections (retrying until the database answers), then the caches, then flip ready"""
+    global _ready
+    start = time.perf_counter()
+    while not await run_in_threadpool(_run_step, "connections", warm_connections):
+        await asyncio.sleep(WARMUP_RETRY_SECONDS)
+    for name, func in WARMERS.items():
+        await run_in_threadpool(_run_warmer, name, func)
+    _ready = True
+    print(f"✅ Warm-up finished in {time.perf_counter() - start:.1f}s; instance is ready")
+
+
+def start():
+    """Start warm-up on the running event loop (no-op when WARMUP=false)"""
+    global _task
+    if ENABLED and _task is None:
+        _task = asyncio.create_task(run(), name="warmup")
+
+
+async def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
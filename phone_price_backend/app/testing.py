@@ -0,0 +1,112 @@
+"""
+Run the app against a throwaway SQLite database.
+
+create_test_engine() builds the full schema on an in-memory (default) or
+file-backed SQLite engine and points the app at it. session_scope() and
+client_scope() then run one test inside a single outer transaction on a
+shared connection: every session the app opens (request sessions as well
+as jobs and counter flushes) joins it through a SAVEPOINT, so route
+commits work normally and everything is rolled back at the end. The
+schema is created once and tests never see each other's writes.
+
+    engine = testing.create_test_engine()
+
+    with testing.client_scope(engine) as (client, db):
+        db.add(models.Phone(brand="Acme", model="One", category="budget"))
+        db.commit()
+        assert client.get("/api/phones/").status_code == 200
+
+As pytest fixtures:
+
+    @pytest.fixture(scope="session")
+    def engine():
+        return testing.create_test_engine()
+
+    @pytest.fixture
+    def db(engine):
+        with testing.session_scope(engine) as session:
+            yield session
+"""
+from contextlib import contextmanager
+
+from app import database, models
+from app.services import events
+
+TOPICS = ("phone", "spec", "price", "review", "shop")
+
+
+def create_test_engine(database_url: str = "sqlite://"):
+    """SQLite engine with every table created, bound as the app's engine"""
+    engine = database.create_database_engine(database_url)
+    database.Base.metadata.create_all(bind=engine)
+    use_engine(engine)
+    return engine
+
+
+def use_engine(engine, replicas=None):
+    """Point app.database's engine and session factory at engine (and, if given, its read replicas)"""
+    database.engine = engine
+    database.SessionLocal.configure(bind=engine)
+    if replicas is not None:
+        database.replica_engines = list(replicas)
+    return engine
+
+
+def copy_database(source, target, batch_size: int = 5000):
+    """Copy every table from one engine to another with the same schema, e.g. a replica stand-in"""
+    database.Base.metadata.create_all(bind=target)
+    copied = {}
+    with source.connect() as reader, target.begin() as writer:
+        for table in reversed(database.Base.metadata.sorted_tables):
+            writer.execute(table.delete())
+        for table in database.Base.metadata.sorted_tables:
+            result = reader.execute(table.select()).mappings()
+            copied[table.name] = 0
+            while rows := result.fetchmany(batch_size):
+                writer.execute(table.insert(), [dict(row) for row in rows])
+                copied[table.name] += len(rows)
+    return copied
+
+
+def reset_caches():
+    """Forget in-memory indexes, snapshots, buffered counters and rate limit buckets left over from earlier tests"""
+    from app.services import affiliate, forecast, helpful_votes, home_feed, rate_limit
+
+    for topic in TOPICS:
+        events.publish(topic, None)
+    home_feed._snapshot = None
+    forecast._model = None
+    affiliate._links = None
+    helpful_votes.buffer.discard()
+    affiliate.buffer.discard()
+    rate_limit.limiter.store.clear()
+
+
+@contextmanager
+def session_scope(engine):
+    """A session whose writes, and those of every app session opened meanwhile, are rolled back"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    previous_settings = dict(database.SessionLocal.kw)
+    database.SessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
+    session = database.SessionLocal()
+    reset_caches()
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        database.SessionLocal.kw = previous_settings
+        reset_caches()
+
+
+@contextmanager
+def client_scope(engine):
+    """(TestClient, session) inside session_scope; background jobs do not start"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with session_scope(engine) as session:
+        # Not entered as a context manager, so the lifespan (and its jobs) never runs
+        yield TestClient(app), session
@@ -0,0 +1,134 @@
+"""
+Shared setup for the benchmarks: a seeded SQLite dataset bound to the app.
+
+Datasets are generated once per (preset, seed, day) with generate_data.py
+and cached under benchmarks/data/, so repeated runs measure the same data
+while its timestamps stay recent enough for the time-windowed features.
+Importing this module points the app at the benchmark database before any
+route runs, turns off outgoing email and (unless overridden) background
+jobs, and installs a per-request query counter.
+"""
+import os
+import subprocess
+import sys
+from contextvars import ContextVar
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, "data")
+sys.path.insert(0, BACKEND_DIR)
+
+# Must be set before app.services.email_service runs load_dotenv()
+os.environ["SMTP_USERNAME"] = ""
+os.environ["SMTP_PASSWORD"] = ""
+os.environ.setdefault("BACKGROUND_JOBS", "false")
+
+from sqlalchemy import create_engine, event
+
+import generate_data
+
+_current_queries = ContextVar("bench_queries", default=None)
+
+
+def dataset_path(preset: str, seed: int, day=None) -> str:
+    day = day or generate_data.today().astype("datetime64[D]")
+    return os.path.join(DATA_DIR, f"{preset}-seed{seed}-{day}.db")
+
+
+def sqlite_engine(path: str):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=32,
+        max_overflow=32,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    return engine
+
+
+def prepare_dataset(preset: str = "small", seed: int = 42, rebuild: bool = False) -> str:
+    """Path to a cached SQLite dataset, generating it first if needed"""
+    path = dataset_path(preset, seed)
+    if os.path.exists(path) and not rebuild:
+        return path
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    # Datasets generated on earlier days are dated in the past; drop them
+    stale_prefix = f"{preset}-seed{seed}-"
+    for name in os.listdir(DATA_DIR):
+        if name.startswith(stale_prefix) and os.path.join(DATA_DIR, name) != path:
+            os.remove(os.path.join(DATA_DIR, name))
+    partial = path + ".partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    engine = sqlite_engine(partial)
+    generate_data.generate(engine, generate_data.PRESETS[preset], seed=seed, label=preset)
+    engine.dispose()
+    os.replace(partial, path)
+    return path
+
+
+def git_revision():
+    """Short commit hash of the working tree, with -dirty for uncommitted changes"""
+    try:
+        revision = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                           stderr=subprocess.DEVNULL, text=True).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD"], cwd=BACKEND_DIR,
+                                stderr=subprocess.DEVNULL) != 0
+        return revision + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def bind_app(engine):
+    """Point the app's engine and session factory at engine; returns the FastAPI app"""
+    from app import database
+    database.engine = engine
+    database.SessionLocal.configure(bind=engine)
+    event.listen(engine, "before_cursor_execute", _count_query)
+
+    # Every simulated user shares one client address; measure the API, not the limiter
+    from app.services import rate_limit
+    rate_limit.ENABLED = False
+
+    from app.main import app
+    return app
+
+
+class QueryCountMiddleware:
+    """Adds an X-Query-Count header with the number of SQL statements a request ran"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = [0]
+        token = _current_queries.set(counter)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", [])) + [(b"x-query-count", str(counter[0]).encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _current_queries.reset(token)
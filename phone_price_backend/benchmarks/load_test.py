@@ -0,0 +1,378 @@
+"""
+HTTP load test for the API against a seeded local database.
+
+Virtual users replay the frontend's real call sequences (home page,
+search, compare, phone details, reviews, admin price edits) picked from a
+weighted mix, at a fixed concurrency, for a fixed duration. Each request
+records its latency and the number of SQL statements it ran, and the run
+is written as a JSON report that can be compared with another run.
+
+Usage (from phone_price_backend/):
+    python benchmarks/load_test.py --preset small --concurrency 16 --duration 30
+    python benchmarks/load_test.py --mix read-only --output benchmarks/results/after.json \\
+        --compare benchmarks/results/before.json
+    python benchmarks/load_test.py --server            # real uvicorn server instead of in-process ASGI
+    python benchmarks/load_test.py --database-url mysql+pymysql://root:pw@127.0.0.1/phone_bench
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench_db
+
+import httpx
+import sqlalchemy
+from sqlalchemy import create_engine, select
+
+from app import models
+
+MIXES = {
+    "browse": {"home": 35, "search": 15, "compare": 10, "details": 30, "reviews": 7, "admin": 3},
+    "read-only": {"home": 40, "search": 15, "compare": 10, "details": 30, "reviews": 5},
+    "write-heavy": {"details": 40, "admin": 40, "reviews": 20},
+}
+
+
+class Catalog:
+    """Ids and values sampled from the database to parameterize requests"""
+
+    SAMPLE_SIZE = 5000
+
+    def __init__(self, engine, seed):
+        sample = random.Random(seed)
+        with engine.connect() as connection:
+            self.phone_ids = connection.execute(select(models.Phone.id)).scalars().all()
+            self.brands = sorted(set(connection.execute(select(models.Phone.brand).distinct()).scalars()))
+            self.prices = connection.execute(
+                select(models.ShopPrice.id, models.ShopPrice.phone_id, models.ShopPrice.shop_id,
+                       models.ShopPrice.price, models.ShopPrice.currency)
+                .where(models.ShopPrice.is_active == True)
+                .limit(self.SAMPLE_SIZE * 4)
+            ).all()
+            self.review_ids = connection.execute(
+                select(models.Review.id).limit(self.SAMPLE_SIZE * 4)
+            ).scalars().all()
+        if not self.phone_ids:
+            raise SystemExit("❌ The benchmark database has no phones; generate data first")
+        self.prices = sample.sample(self.prices, min(len(self.prices), self.SAMPLE_SIZE))
+        self.review_ids = sample.sample(self.review_ids, min(len(self.review_ids), self.SAMPLE_SIZE))
+
+    def phone(self, rng):
+        return rng.choice(self.phone_ids)
+
+
+# Each scenario returns the (label, method, url, json) calls one page view makes
+
+def home(rng, catalog):
+    calls = [
+        ("GET /api/phones", "GET", "/api/phones/?skip=0&limit=6", None),
+        ("GET /api/shops", "GET", "/api/shops/?skip=0&limit=100", None),
+        ("GET /api/home", "GET", "/api/home", None),
+    ]
+    # HomePage.jsx still loads prices per featured card
+    for _ in range(6):
+        calls.append(("GET /api/prices?phone_id", "GET", f"/api/prices/?skip=0&limit=100&phone_id={catalog.phone(rng)}", None))
+    return calls
+
+
+def search(rng, catalog):
+    brand = rng.choice(catalog.brands)
+    low = rng.choice([20000, 50000, 100000, 200000])
+    return [
+        ("GET /api/search/phones", "GET", f"/api/search/phones?q={brand[:3]}&skip=0&limit=50", None),
+        ("GET /api/search/by-brand", "GET", f"/api/search/by-brand?brand={brand}&skip=0&limit=50", None),
+        ("GET /api/prices/range", "GET", f"/api/prices/range?min_price={low}&max_price={low * 2}&skip=0&limit=100", None),
+        ("GET /api/phones/filter", "GET", f"/api/phones/filter?min_ram_gb=8&max_price={low * 2}&limit=20", None),
+    ]
+
+
+def compare(rng, catalog):
+    first, second = catalog.phone(rng), catalog.phone(rng)
+    return [
+        ("GET /api/phones", "GET", "/api/phones/?skip=0&limit=100", None),
+        ("GET /api/shops", "GET", "/api/shops/?skip=0&limit=100", None),
+        ("GET /api/prices?phone_id", "GET", f"/api/prices/?skip=0&limit=100&phone_id={first}", None),
+        ("GET /api/prices?phone_id", "GET", f"/api/prices/?skip=0&limit=100&phone_id={second}", None),
+        ("GET /api/prices/phone/{id}/compare", "GET", f"/api/prices/phone/{first}/compare", None),
+    ]
+
+
+def details(rng, catalog):
+    phone_id = catalog.phone(rng)
+    return [
+        ("GET /api/phones/{id}", "GET", f"/api/phones/{phone_id}", None),
+        ("GET /api/phones/{id}/specs", "GET", f"/api/phones/{phone_id}/specs", None),
+        ("GET /api/prices?phone_id", "GET", f"/api/prices/?skip=0&limit=100&phone_id={phone_id}", None),
+        ("GET /api/shops", "GET", "/api/shops/?skip=0&limit=100", None),
+        ("GET /api/phones/{id}/full", "GET", f"/api/phones/{phone_id}/full", None),
+        ("GET /api/ai/predict/{id}", "GET", f"/api/ai/predict/{phone_id}", None),
+        ("GET /api/reviews?phone_id", "GET", f"/api/reviews/?phone_id={phone_id}", None),
+    ]
+
+
+def reviews(rng, catalog):
+    calls = [
+        ("GET /api/reviews", "GET", "/api/reviews/", None),
+        ("GET /api/reviews/stats/summary", "GET", "/api/reviews/stats/summary", None),
+    ]
+    if catalog.review_ids:
+        calls.append(("PUT /api/reviews/{id}/helpful", "PUT", f"/api/reviews/{rng.choice(catalog.review_ids)}/helpful", None))
+    return calls
+
+
+def admin(rng, catalog):
+    calls = [("GET /api/prices", "GET", "/api/prices/?skip=0&limit=100", None)]
+    if catalog.prices:
+        price_id, phone_id, shop_id, price, currency = rng.choice(catalog.prices)
+        # Stay under the 1% change that triggers subscriber emails
+        new_price = price + rng.choice([-1, 1]) * max(1, price // 200)
+        calls.append(("PUT /api/prices/{id}", "PUT", f"/api/prices/{price_id}?confirm=true", {
+            "phone_id": phone_id, "shop_id": shop_id, "price": new_price,
+            "currency": currency or "LKR", "is_active": True,
+        }))
+    return calls
+
+
+SCENARIOS = {"home": home, "search": search, "compare": compare, "details": details, "reviews": reviews, "admin": admin}
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.scenarios = defaultdict(int)
+
+    def record(self, label, seconds, status, queries):
+        self.latencies[label].append(seconds * 1000)
+        self.statuses[label][status] += 1
+        if status >= 400:
+            self.errors[label] += 1
+        if queries >= 0:
+            self.queries[label].append(queries)
+
+
+async def virtual_user(client, rng, catalog, mix, warmup_end, deadline, recorder):
+    names, weights = zip(*mix.items())
+    while time.perf_counter() < deadline:
+        scenario = rng.choices(names, weights)[0]
+        measuring = time.perf_counter() >= warmup_end
+        for label, method, url, body in SCENARIOS[scenario](rng, catalog):
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                status = response.status_code
+                queries = int(response.headers.get("x-query-count", -1))
+            except httpx.HTTPError:
+                status, queries = 599, -1
+            if measuring:
+                recorder.record(label, time.perf_counter() - start, status, queries)
+        if measuring:
+            recorder.scenarios[scenario] += 1
+
+
+def summarize(recorder, elapsed):
+    endpoints = {}
+    for label in sorted(recorder.latencies):
+        values = np.array(recorder.latencies[label])
+        queries = recorder.queries.get(label) or [0]
+        endpoints[label] = {
+            "requests": len(values),
+            "errors": recorder.errors.get(label, 0),
+            "statuses": {str(code): count for code, count in sorted(recorder.statuses[label].items())},
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "latency_ms": {
+                "mean": round(float(values.mean()), 3),
+                "p50": round(float(np.percentile(values, 50)), 3),
+                "p90": round(float(np.percentile(values, 90)), 3),
+                "p95": round(float(np.percentile(values, 95)), 3),
+                "p99": round(float(np.percentile(values, 99)), 3),
+                "max": round(float(values.max()), 3),
+            },
+            "queries": {"mean": round(float(np.mean(queries)), 2), "max": int(np.max(queries))},
+        }
+
+    all_latencies = np.concatenate([np.array(v) for v in recorder.latencies.values()]) if recorder.latencies else np.zeros(1)
+    total = int(sum(len(v) for v in recorder.latencies.values()))
+    return {
+        "requests": total,
+        "errors": int(sum(recorder.errors.values())),
+        "throughput_rps": round(total / elapsed, 2),
+        "page_views": dict(recorder.scenarios),
+        "latency_ms": {
+            "p50": round(float(np.percentile(all_latencies, 50)), 3),
+            "p95": round(float(np.percentile(all_latencies, 95)), 3),
+            "p99": round(float(np.percentile(all_latencies, 99)), 3),
+        },
+        "queries_per_request": round(
+            float(np.mean([q for values in recorder.queries.values() for q in values] or [0])), 2
+        ),
+    }, endpoints
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, port):
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("❌ --server needs uvicorn (pip install uvicorn)")
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def run(args, app, catalog):
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.server:
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60)
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+    start = time.perf_counter()
+    warmup_end = start + args.warmup
+    deadline = warmup_end + args.duration
+    async with client:
+        await asyncio.gather(*[
+            virtual_user(client, random.Random(args.seed * 1000 + i), catalog, MIXES[args.mix],
+                         warmup_end, deadline, recorder)
+            for i in range(args.concurrency)
+        ])
+    elapsed = max(time.perf_counter() - warmup_end, 1e-9)
+    return recorder, elapsed
+
+
+def print_summary(report):
+    totals = report["totals"]
+    print(f"\n📊 {totals['requests']:,} requests, {totals['errors']} errors, {totals['throughput_rps']:,} req/s, "
+          f"p50 {totals['latency_ms']['p50']} ms, p95 {totals['latency_ms']['p95']} ms, "
+          f"{totals['queries_per_request']} queries/request\n")
+    print(f"{'endpoint':42} {'reqs':>7} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8}")
+    for label, stats in report["endpoints"].items():
+        latency = stats["latency_ms"]
+        print(f"{label:42} {stats['requests']:>7} {stats['throughput_rps']:>8} {latency['p50']:>9} "
+              f"{latency['p95']:>9} {latency['p99']:>9} {stats['queries']['mean']:>8}")
+
+
+def print_comparison(report, baseline):
+    def change(new, old):
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    print(f"\n🔍 Compared with {baseline['meta'].get('git_revision')} ({baseline['meta'].get('started_at')})")
+    print(f"{'endpoint':42} {'p50':>10} {'p95':>10} {'rps':>10} {'queries':>10}")
+    for label, stats in report["endpoints"].items():
+        old = baseline["endpoints"].get(label)
+        if not old:
+            print(f"{label:42} {'new':>10}")
+            continue
+        print(f"{label:42} {change(stats['latency_ms']['p50'], old['latency_ms']['p50']):>10} "
+              f"{change(stats['latency_ms']['p95'], old['latency_ms']['p95']):>10} "
+              f"{change(stats['throughput_rps'], old['throughput_rps']):>10} "
+              f"{change(stats['queries']['mean'], old['queries']['mean']):>10}")
+    print(f"{'TOTAL':42} {change(report['totals']['latency_ms']['p50'], baseline['totals']['latency_ms']['p50']):>10} "
+          f"{change(report['totals']['latency_ms']['p95'], baseline['totals']['latency_ms']['p95']):>10} "
+          f"{change(report['totals']['throughput_rps'], baseline['totals']['throughput_rps']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API with scripted frontend traffic")
+    parser.add_argument("--preset", choices=bench_db.generate_data.PRESETS, default="small",
+                        help="Synthetic dataset to generate/reuse (SQLite)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rebuild-data", action="store_true", help="Regenerate the cached dataset")
+    parser.add_argument("--database-url", default=None, help="Use an existing seeded database instead of SQLite")
+    parser.add_argument("--mix", choices=MIXES, default="browse")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before measuring")
+    parser.add_argument("--server", action="store_true", help="Serve over HTTP with uvicorn instead of in-process ASGI")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--label", default=None, help="Free-form name stored in the report")
+    parser.add_argument("--output", default=None, help="Report path (default benchmarks/results/load-<time>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier report to diff against")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url, pool_size=args.concurrency, max_overflow=args.concurrency)
+        database = args.database_url.split("@")[-1]
+    else:
+        path = bench_db.prepare_dataset(args.preset, args.seed, rebuild=args.rebuild_data)
+        engine = bench_db.sqlite_engine(path)
+        database = f"sqlite:{os.path.relpath(path, bench_db.BACKEND_DIR)}"
+
+    app = bench_db.QueryCountMiddleware(bench_db.bind_app(engine))
+    catalog = Catalog(engine, args.seed)
+
+    server = None
+    if args.server:
+        args.port = args.port or free_port()
+        server, thread = start_server(app, args.port)
+
+    started_at = datetime.now().isoformat(timespec="seconds")
+    print(f"🚀 {args.mix} mix, {args.concurrency} users, {args.warmup:g}s warmup + {args.duration:g}s "
+          f"against {database} ({'uvicorn' if args.server else 'in-process'})")
+    try:
+        recorder, elapsed = asyncio.run(run(args, app, catalog))
+    finally:
+        if server:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+    totals, endpoints = summarize(recorder, elapsed)
+    report = {
+        "meta": {
+            "label": args.label,
+            "git_revision": bench_db.git_revision(),
+            "started_at": started_at,
+            "database": database,
+            "preset": None if args.database_url else args.preset,
+            "seed": args.seed,
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "transport": "uvicorn" if args.server else "asgi",
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+        },
+        "totals": totals,
+        "endpoints": endpoints,
+    }
+
+    output = args.output or os.path.join(
+        bench_db.BENCH_DIR, "results", f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_summary(report)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(report, json.load(f))
+    print(f"\n💾 Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
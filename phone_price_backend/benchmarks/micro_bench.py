@@ -0,0 +1,282 @@
+"""
+Micro-benchmarks for hot functions, with stored baselines and regression gating.
+
+Each benchmark loads realistic inputs from the cached synthetic dataset
+once, then times a single unit of work with timeit (auto-ranged loops,
+several rounds, best and median time per call). --save records the
+results as the baseline; --check compares against it and exits non-zero
+when a benchmark's best time is more than --threshold slower and at least
+--min-delta-us slower in absolute terms, so sub-microsecond benchmarks
+cannot fail on timer noise. Baselines are machine-specific and are not
+committed: record one with --save from a clean checkout on the machine
+that runs --check (the revision is stored in the baseline's meta).
+
+Usage (from phone_price_backend/):
+    python benchmarks/micro_bench.py                      # run and compare, report only
+    python benchmarks/micro_bench.py --save               # record benchmarks/baselines/micro.json
+    python benchmarks/micro_bench.py --check --threshold 0.2
+    python benchmarks/micro_bench.py --only email --only spec
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from collections import defaultdict
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench_db
+
+import sqlalchemy
+from fastapi.utils import create_model_field
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session, selectinload
+from starlette.responses import JSONResponse
+
+from app import models, schemas
+from app.projections import PHONE_COLUMNS, PHONE_NAME, REVIEW_COLUMNS, SHOP_COLUMNS, as_dicts
+from app.routes import reviews
+from app.services import email_service, helpful_votes, review_stats
+from app.services.spec_parser import parse_specs
+
+DEFAULT_BASELINE = os.path.join(bench_db.BENCH_DIR, "baselines", "micro.json")
+LIST_SIZE = 100
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, description: str):
+    """Register a setup generator: it receives a Session, yields the function to time, then cleans up"""
+    def register(setup):
+        BENCHMARKS[name] = (description, setup)
+        return setup
+    return register
+
+
+def response_renderer(response_model):
+    """Validate + serialize + JSON-encode content the way FastAPI renders a response_model"""
+    field = create_model_field(name="Response", type_=response_model, mode="serialization")
+
+    def render(content):
+        value, errors = field.validate(content, {}, loc=("response",))
+        assert not errors, errors
+        return JSONResponse(field.serialize(value, mode="json")).body
+
+    return render
+
+
+@benchmark("shop_prices.serialize", f"{LIST_SIZE} ShopPrice rows with phone and shop -> JSON")
+def _shop_prices(db):
+    prices = db.scalars(
+        select(models.ShopPrice)
+        .options(selectinload(models.ShopPrice.phone), selectinload(models.ShopPrice.shop))
+        .order_by(models.ShopPrice.id)
+        .limit(LIST_SIZE)
+    ).all()
+    render = response_renderer(list[schemas.ShopPrice])
+    yield lambda: render(prices)
+
+
+@benchmark("phones.list", f"{LIST_SIZE} projected phone rows with ratings -> PhoneWithRating JSON")
+def _phones(db):
+    rows = db.execute(
+        select(*PHONE_COLUMNS, review_stats.REVIEW_COUNT, review_stats.AVERAGE_RATING)
+        .outerjoin(models.ReviewStats, models.ReviewStats.phone_id == models.Phone.id)
+        .order_by(models.Phone.id)
+        .limit(LIST_SIZE)
+    ).all()
+    render = response_renderer(list[schemas.PhoneWithRating])
+    yield lambda: render(as_dicts(rows))
+
+
+@benchmark("shops.list", f"{LIST_SIZE} projected shop rows -> Shop JSON")
+def _shops(db):
+    rows = db.execute(select(*SHOP_COLUMNS).order_by(models.Shop.id).limit(LIST_SIZE)).all()
+    render = response_renderer(list[schemas.Shop])
+    yield lambda: render(as_dicts(rows))
+
+
+@benchmark("search_phones.build_query", "search_phones statement + cache key (no execution)")
+def _search_query(db):
+    def build():
+        search_term = "%gal%"
+        matches = or_(models.Phone.brand.ilike(search_term), models.Phone.model.ilike(search_term))
+        phones = db.query(*PHONE_COLUMNS).filter(matches).order_by(models.Phone.id).offset(0).limit(10)
+        total_count = db.query(sqlalchemy.func.count(models.Phone.id)).filter(matches)
+        # Building the statements and their cache keys is the per-request work before the compiled cache
+        return phones.statement._generate_cache_key(), total_count.statement._generate_cache_key()
+    yield build
+
+
+@benchmark("email.price_drop", "render the price drop email")
+def _email_price_drop(db):
+    yield lambda: email_service.render_price_drop_email("Samsung Galaxy S24 Ultra", 349999.0, 319999.0, "Tech Hub Colombo")
+
+
+@benchmark("email.welcome", "render the welcome email")
+def _email_welcome(db):
+    yield lambda: email_service.render_welcome_email("Nimal")
+
+
+def _review_rows(db):
+    return db.execute(
+        select(*REVIEW_COLUMNS, PHONE_NAME)
+        .join(models.Phone, models.Review.phone_id == models.Phone.id)
+        .order_by(models.Review.created_at.desc())
+        .limit(LIST_SIZE)
+    ).all()
+
+
+@benchmark("reviews.format", f"{LIST_SIZE} review rows -> ReviewWithPhone JSON")
+def _reviews(db):
+    rows = _review_rows(db)
+    render = response_renderer(list[schemas.ReviewWithPhone])
+    yield lambda: render(reviews.format_review_rows(rows))
+
+
+@benchmark("reviews.format_pending_votes", f"{LIST_SIZE} review rows with buffered helpful votes -> JSON")
+def _reviews_pending(db):
+    rows = _review_rows(db)
+    render = response_renderer(list[schemas.ReviewWithPhone])
+    for row in rows[::10]:
+        helpful_votes.buffer.add(row.id)
+    yield lambda: render(reviews.format_review_rows(rows))
+    # Drop the votes without flushing them to the benchmark database
+    helpful_votes.buffer.discard()
+
+
+@benchmark("specs.parse", f"parse_specs for {LIST_SIZE} phones")
+def _specs(db):
+    grouped = defaultdict(list)
+    for phone_id, key_name, value in db.execute(
+        select(models.Spec.phone_id, models.Spec.key_name, models.Spec.value)
+        .where(models.Spec.phone_id <= LIST_SIZE)
+    ):
+        grouped[phone_id].append((key_name, value))
+    specs = list(grouped.values())
+    yield lambda: [parse_specs(phone_specs) for phone_specs in specs]
+
+
+def measure(func, rounds: int):
+    """Best and median microseconds per call over several auto-ranged rounds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [elapsed / number * 1e6 for elapsed in timer.repeat(repeat=rounds, number=number)]
+    return {"best_us": round(min(times), 3), "median_us": round(statistics.median(times), 3), "loops": number}
+
+
+def run(names, rounds, engine):
+    results = {}
+    for name in names:
+        description, setup = BENCHMARKS[name]
+        with Session(engine) as db:
+            steps = setup(db)
+            func = next(steps)
+            func()  # warm caches (compiled SQL, pydantic validators) before timing
+            results[name] = measure(func, rounds)
+            next(steps, None)
+        print(f"   {name:32} {results[name]['best_us']:>12,.1f} µs")
+    return results
+
+
+def machine():
+    return {"platform": platform.platform(), "processor": platform.processor() or platform.machine(),
+            "python": platform.python_version(), "sqlalchemy": sqlalchemy.__version__}
+
+
+def compare(results, baseline, threshold, min_delta_us):
+    """Print a comparison table; returns the names slower by more than threshold and min_delta_us"""
+    regressions = []
+    print(f"\n{'benchmark':32} {'best µs':>12} {'baseline':>12} {'change':>9}")
+    for name, result in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            print(f"{name:32} {result['best_us']:>12,.1f} {'-':>12} {'new':>9}")
+            continue
+        change = result["best_us"] / old["best_us"] - 1
+        flag = ""
+        if change > threshold and result["best_us"] - old["best_us"] >= min_delta_us:
+            regressions.append(name)
+            flag = " ❌"
+        print(f"{name:32} {result['best_us']:>12,.1f} {old['best_us']:>12,.1f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark hot functions against a stored baseline")
+    parser.add_argument("--only", action="append", default=None, help="Run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any benchmark regressed beyond --threshold")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown as a fraction (0.25 = 25%%)")
+    parser.add_argument("--min-delta-us", type=float, default=1.0,
+                        help="Ignore slowdowns smaller than this many microseconds per call")
+    parser.add_argument("--preset", choices=bench_db.generate_data.PRESETS, default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (description, _) in BENCHMARKS.items():
+            print(f"{name:32} {description}")
+        return
+
+    names = [name for name in BENCHMARKS if not args.only or any(part in name for part in args.only)]
+    if not names:
+        raise SystemExit(f"❌ No benchmark matches {args.only}")
+
+    engine = bench_db.sqlite_engine(bench_db.prepare_dataset(args.preset, args.seed))
+    print(f"⏱️ Running {len(names)} micro-benchmarks ({args.rounds} rounds each)")
+    results = run(names, args.rounds, engine)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    if baseline:
+        if baseline.get("meta", {}).get("machine") != machine():
+            print("\n⚠️ The baseline was recorded on a different machine or Python; differences may not be meaningful")
+        regressions = compare(results, baseline, args.threshold, args.min_delta_us)
+    elif args.check:
+        raise SystemExit(f"❌ No baseline at {args.baseline}; record one with --save")
+
+    if args.save:
+        revision = bench_db.git_revision()
+        if revision is None or revision.endswith("-dirty"):
+            print("\n⚠️ Recording a baseline from uncommitted code; --check will compare against it anyway")
+        # Keep baselines of benchmarks that were not part of this run
+        merged = dict(baseline.get("results", {})) if baseline else {}
+        merged.update(results)
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "meta": {
+                    "git_revision": revision,
+                    "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                    "preset": args.preset,
+                    "seed": args.seed,
+                    "machine": machine(),
+                },
+                "results": dict(sorted(merged.items())),
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Baseline written to {args.baseline}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%} "
+              f"(and {args.min_delta_us:g} µs): "
+              f"{', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+    elif baseline:
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Cold-start benchmark: time from process spawn to the first response.
+
+Each run starts a fresh interpreter that imports app.main, runs the app
+lifespan and serves one request in-process against the cached SQLite
+dataset. The median over --runs is compared with --target-ms and the
+command exits 1 when it is slower, or when a module that should load
+lazily (NumPy, SMTP/email) was imported just to serve that request.
+--profile prints the slowest imports from `python -X importtime`.
+
+Usage (from phone_price_backend/):
+    python benchmarks/startup_bench.py
+    python benchmarks/startup_bench.py --target-ms 1200 --runs 7 --path "/api/shops/"
+    python benchmarks/startup_bench.py --profile
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench_db
+
+# Must stay unloaded until a request actually needs them
+LAZY_MODULES = ("numpy", "smtplib", "email.mime.text", "pyarrow")
+
+CHILD = r"""
+import time
+start = time.perf_counter()
+import asyncio, json, sys
+sys.path.insert(0, sys.argv[1])
+from app.main import app
+imported = time.perf_counter()
+
+async def first_request(path):
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        await app(scope, receive, send)
+    return started, status[0]
+
+started, status = asyncio.run(first_request(sys.argv[2]))
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "lifespan_ms": (started - imported) * 1000,
+    "request_ms": (done - started) * 1000,
+    "status": status,
+    "loaded": [name for name in json.loads(sys.argv[3]) if name in sys.modules],
+}), flush=True)
+"""
+
+
+def child_env(database_path, warmup):
+    env = dict(os.environ)
+    env.update(
+        DATABASE_URL=f"sqlite:///{database_path}",
+        BACKGROUND_JOBS="false",
+        WARMUP="true" if warmup else "false",
+        SMTP_USERNAME="",
+        SMTP_PASSWORD="",
+    )
+    return env
+
+
+def run_once(env, path):
+    """Spawn a fresh interpreter; returns its phase timings plus the end-to-end time"""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", CHILD, bench_db.BACKEND_DIR, path, json.dumps(LAZY_MODULES)],
+        cwd=bench_db.BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    line = ""
+    for line in process.stdout:
+        if line.startswith("{"):
+            break
+    total_ms = (time.perf_counter() - start) * 1000
+    _, stderr = process.communicate()
+    if not line.startswith("{"):
+        raise SystemExit(f"❌ Startup run failed:\n{stderr}")
+    return {**json.loads(line), "total_ms": total_ms}
+
+
+def print_profile(env, limit=20):
+    """Slowest cumulative imports of app.main (python -X importtime)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {bench_db.BACKEND_DIR!r}); import app.main"],
+        cwd=bench_db.BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append((int(cumulative_us), int(self_us), name))
+    rows.sort(reverse=True)
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in rows[:limit]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure spawn-to-first-response time of the API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=1500, help="Fail if the median total is slower")
+    parser.add_argument("--path", default="/api/phones/?skip=0&limit=10", help="First request")
+    parser.add_argument("--warmup", action="store_true", help="Run with WARMUP=true (warm-up competes with the request)")
+    parser.add_argument("--preset", choices=bench_db.generate_data.PRESETS, default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profile", action="store_true", help="Also print the slowest imports")
+    parser.add_argument("--output", default=None, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    env = child_env(bench_db.prepare_dataset(args.preset, args.seed), args.warmup)
+    print(f"🥶 {args.runs} cold starts, first request GET {args.path}")
+    runs = []
+    for i in range(args.runs):
+        result = run_once(env, args.path)
+        runs.append(result)
+        print(f"   run {i + 1}: {result['total_ms']:7.1f} ms total (import {result['import_ms']:.1f}, "
+              f"lifespan {result['lifespan_ms']:.1f}, request {result['request_ms']:.1f}) -> {result['status']}")
+
+    summary = {
+        phase: round(statistics.median(run[phase] for run in runs), 1)
+        for phase in ("total_ms", "import_ms", "lifespan_ms", "request_ms")
+    }
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    print(f"\n📊 median {summary['total_ms']} ms to first response "
+          f"(import {summary['import_ms']}, lifespan {summary['lifespan_ms']}, request {summary['request_ms']}); "
+          f"target {args.target_ms:g} ms")
+
+    if args.profile:
+        print_profile(env)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"git_revision": bench_db.git_revision(), "path": args.path, "target_ms": args.target_ms,
+                       "median": summary, "runs": runs}, f, indent=2)
+
+    failures = []
+    if any(run["status"] >= 400 for run in runs):
+        failures.append("first request returned an error status")
+    if summary["total_ms"] > args.target_ms:
+        failures.append(f"median {summary['total_ms']} ms exceeds the {args.target_ms:g} ms target")
+    if loaded:
+        failures.append(f"modules that should load lazily were imported: {', '.join(loaded)}")
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Cold start within target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Run this script to create the affiliate_clicks table used by /api/go
+click tracking.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine, Base
+from app.models import AffiliateClick
+
+def create_affiliate_clicks_table():
+    print("Creating affiliate_clicks table...")
+    Base.metadata.create_all(bind=engine, tables=[AffiliateClick.__table__])
+    print("✅ Affiliate clicks table created successfully!")
+
+if __name__ == "__main__":
+    create_affiliate_clicks_table()
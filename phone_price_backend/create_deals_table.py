@@ -0,0 +1,26 @@
+"""
+Run this script to create the deals table and compute the first ranking.
+The API refreshes it every DEALS_REFRESH_SECONDS afterwards.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine, Base, SessionLocal
+from app.models import Deal
+from app.services import deals
+
+def create_deals_table():
+    print("Creating deals table...")
+    Base.metadata.create_all(bind=engine, tables=[Deal.__table__])
+    print("✅ Deals table created successfully!")
+    
+    db = SessionLocal()
+    try:
+        count = deals.refresh(db)
+        print(f"✅ Ranked {count} deals")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    create_deals_table()
@@ -0,0 +1,40 @@
+"""
+Run this script to create the price_history table and seed it with the
+current price of every shop listing.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from sqlalchemy import select, insert, func
+from app.database import engine, Base
+from app.models import PriceHistory, ShopPrice
+
+def create_price_history_table():
+    print("Creating price_history table...")
+    Base.metadata.create_all(bind=engine, tables=[PriceHistory.__table__])
+    print("✅ Price history table created successfully!")
+    
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count(PriceHistory.id))).scalar()
+        if existing:
+            print(f"ℹ️  price_history already has {existing} rows, skipping backfill")
+            return
+        
+        # Seed one observation per listing from its current price
+        backfill = select(
+            ShopPrice.phone_id,
+            ShopPrice.shop_id,
+            ShopPrice.price,
+            func.coalesce(ShopPrice.updated_at, datetime.now())
+        )
+        result = connection.execute(
+            insert(PriceHistory).from_select(
+                ["phone_id", "shop_id", "price", "recorded_at"], backfill
+            )
+        )
+        print(f"✅ Backfilled {result.rowcount} price history rows")
+
+if __name__ == "__main__":
+    create_price_history_table()
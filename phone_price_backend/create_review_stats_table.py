@@ -0,0 +1,23 @@
+"""
+Run this script to create the review_stats table and (re)build its
+counters from the reviews table. Safe to re-run to correct any drift.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import engine, Base
+from app.models import ReviewStats
+from app.services.review_stats import rebuild
+
+def create_review_stats_table():
+    print("Creating review_stats table...")
+    Base.metadata.create_all(bind=engine, tables=[ReviewStats.__table__])
+    print("✅ Review stats table created successfully!")
+    
+    with engine.begin() as connection:
+        phones = rebuild(connection)
+        print(f"✅ Rebuilt review counters for {phones} phones")
+
+if __name__ == "__main__":
+    create_review_stats_table()
@@ -0,0 +1,33 @@
+"""
+Run this script to create the spec_attributes table and parse every
+existing spec into typed, indexed attributes.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from app.database import engine, Base, SessionLocal
+from app.models import Phone, SpecAttribute
+from app.services.spec_attributes import sync_spec_attributes
+
+BATCH_SIZE = 500
+
+def create_spec_attributes_table():
+    print("Creating spec_attributes table...")
+    Base.metadata.create_all(bind=engine, tables=[SpecAttribute.__table__])
+    print("✅ Spec attributes table created successfully!")
+    
+    db = SessionLocal()
+    try:
+        phone_ids = db.execute(select(Phone.id).order_by(Phone.id)).scalars().all()
+        total = 0
+        for start in range(0, len(phone_ids), BATCH_SIZE):
+            total += sync_spec_attributes(db, phone_ids[start:start + BATCH_SIZE])
+            db.commit()
+        print(f"✅ Parsed {total} attributes for {len(phone_ids)} phones")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    create_spec_attributes_table()
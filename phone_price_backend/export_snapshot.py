@@ -0,0 +1,37 @@
+"""
+Export a Parquet snapshot of shop_prices joined with phones and shops.
+
+Usage:
+    python export_snapshot.py --output prices.parquet
+    python export_snapshot.py --output snapshots/prices --partition-by brand
+"""
+import argparse
+import time
+
+from app.services.snapshot import PARTITION_COLUMNS, write_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a columnar price snapshot")
+    parser.add_argument("--output", default="prices_snapshot.parquet",
+                        help="Parquet file, or directory when partitioning")
+    parser.add_argument("--partition-by", choices=PARTITION_COLUMNS, default=None,
+                        help="Write a hive-partitioned dataset by brand or price date")
+    parser.add_argument("--compression", choices=["zstd", "snappy", "gzip"], default="zstd")
+    parser.add_argument("--batch-size", type=int, default=10000,
+                        help="Rows fetched from the cursor per Arrow batch")
+    args = parser.parse_args()
+
+    print(f"📦 Exporting price snapshot to {args.output}...")
+    start = time.perf_counter()
+    rows = write_snapshot(
+        args.output,
+        partition_by=args.partition_by,
+        compression=args.compression,
+        batch_size=args.batch_size,
+    )
+    print(f"✅ Wrote {rows} rows in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+Deterministic synthetic data generator for scale testing.
+
+Builds a realistic large catalog (phones with parseable specs, shops,
+shop_prices, price_history, reviews and subscribers) using the
+app/models.py schema, then derives spec_attributes and review_stats. The
+same --seed and --now always produce the same data, and each table draws
+from its own random stream, so changing one volume leaves the others
+intact. Timestamps are spread over the days before --now, which defaults
+to today (midnight) so time-windowed features see recent data.
+
+Rows are generated in NumPy chunks and written with executemany bulk
+inserts (multi-row INSERTs on MySQL), with explicit ids so foreign keys
+never need to be read back.
+
+Usage:
+    python generate_data.py --preset small
+    python generate_data.py --preset production --reset
+    python generate_data.py --database-url sqlite:///scale.db --phones 20000 --prices 1000000
+    python generate_data.py --preset small --now 2026-01-01     # reproduce an earlier dataset
+"""
+import argparse
+import sys
+import os
+import time
+from datetime import date
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import create_engine, delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import Base
+from app.services import review_stats
+from app.services.spec_attributes import sync_spec_attributes
+
+PRESETS = {
+    "small": dict(phones=1000, shops=50, prices=20000, history=50000, reviews=10000, subscribers=5000),
+    "medium": dict(phones=10000, shops=500, prices=500000, history=1000000, reviews=100000, subscribers=50000),
+    "production": dict(phones=50000, shops=2000, prices=5000000, history=10000000, reviews=1000000, subscribers=500000),
+}
+
+BRANDS = ["Samsung", "Apple", "Xiaomi", "Oppo", "Vivo", "Realme", "OnePlus", "Google",
+          "Huawei", "Honor", "Motorola", "Nokia", "Tecno", "Infinix", "Sony", "Asus"]
+BRAND_WEIGHTS = [18, 14, 14, 8, 8, 7, 5, 4, 5, 4, 3, 2, 3, 3, 1, 1]
+SERIES = ["Galaxy", "Note", "Pro", "Max", "Edge", "Neo", "Lite", "Ultra", "Plus", "Mini", "Nova", "Reno"]
+CATEGORIES = ["budget", "midrange", "flagship", "gaming", "foldable"]
+CATEGORY_WEIGHTS = [35, 35, 18, 7, 5]
+# Median launch price per category (LKR)
+CATEGORY_PRICE = {"budget": 45000, "midrange": 110000, "flagship": 320000, "gaming": 250000, "foldable": 480000}
+CITIES = ["Colombo", "Kandy", "Galle", "Jaffna", "Negombo", "Kurunegala", "Matara", "Batticaloa",
+          "Anuradhapura", "Ratnapura", "Badulla", "Trincomalee"]
+SHOP_WORDS = ["Mobile", "Cellular", "Electronics", "Tech", "Phone", "Digital", "Smart", "Gadget"]
+FIRST_NAMES = ["Nimal", "Kamal", "Sunil", "Amaya", "Dilini", "Kasun", "Tharindu", "Ishara",
+               "Sachini", "Ruwan", "Chamari", "Nuwan", "Priya", "Arjun", "Fathima", "Ravi"]
+COMMENTS = [
+    "Great phone for the price.", "Battery easily lasts a full day.", "Camera is excellent in daylight.",
+    "Display is bright and smooth.", "Gets warm while gaming.", "Software updates are slow.",
+    "Charging is very fast.", "Build quality feels premium.", "Speaker could be louder.",
+    "Would recommend to anyone on a budget.",
+]
+RATINGS = [1, 2, 3, 4, 5]
+RATING_WEIGHTS = [0.05, 0.07, 0.15, 0.33, 0.40]
+
+# Separate random streams per table keep tables independent of each other's volumes
+# ("prices" plans the listings, "price_rows" draws their active flag and update time)
+STREAMS = {"phones": 1, "specs": 2, "shops": 3, "prices": 4, "history": 5, "reviews": 6, "subscribers": 7,
+           "price_rows": 8}
+
+
+def rng_for(seed: int, table: str):
+    return np.random.default_rng([seed, STREAMS[table]])
+
+
+def weighted(rng, values, weights, size):
+    weights = np.asarray(weights, dtype=np.float64)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=weights / weights.sum())]
+
+
+def today():
+    """Midnight today, the default --now; fixed for the whole day so reruns match"""
+    return np.datetime64(date.today(), "s")
+
+
+def timestamps(rng, size, max_days_ago, now):
+    seconds = rng.integers(0, max_days_ago * 86400, size=size)
+    return (now - seconds.astype("timedelta64[s]")).tolist()
+
+
+def bulk_insert(engine, model, rows_iter, total, label):
+    """Insert row-dict batches, committing per batch, and report throughput"""
+    start = time.perf_counter()
+    written = 0
+    for rows in rows_iter:
+        with engine.begin() as connection:
+            mysql = connection.dialect.name == "mysql"
+            if mysql:
+                connection.execute(text("SET unique_checks=0, foreign_key_checks=0"))
+            try:
+                connection.execute(insert(model), rows)
+            finally:
+                # Session settings outlive the transaction; don't hand a pooled connection back with checks off
+                if mysql:
+                    connection.execute(text("SET unique_checks=1, foreign_key_checks=1"))
+        written += len(rows)
+        print(f"\r   {label}: {written:,}/{total:,}", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed else 0
+    print(f"\r✅ {label}: {written:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+
+def chunks(total, batch_size):
+    for start in range(0, total, batch_size):
+        yield start, min(batch_size, total - start)
+
+
+def generate_phones(seed, count, batch_size, first_id, now):
+    rng = rng_for(seed, "phones")
+    for start, size in chunks(count, batch_size):
+        ids = np.arange(first_id + start, first_id + start + size)
+        brands = weighted(rng, BRANDS, BRAND_WEIGHTS, size)
+        series = weighted(rng, SERIES, [1] * len(SERIES), size)
+        numbers = rng.integers(1, 60, size=size)
+        categories = weighted(rng, CATEGORIES, CATEGORY_WEIGHTS, size)
+        years = rng.integers(2018, 2026, size=size)
+        created = timestamps(rng, size, 3 * 365, now)
+        yield [
+            {
+                "id": int(ids[i]), "brand": brands[i], "model": f"{series[i]} {numbers[i]} #{ids[i]}",
+                "category": categories[i], "image_url": None, "release_year": int(years[i]),
+                "created_at": created[i],
+            }
+            for i in range(size)
+        ]
+
+
+def generate_specs(seed, phone_ids, batch_size):
+    rng = rng_for(seed, "specs")
+    for start, size in chunks(len(phone_ids), batch_size // 8 or 1):
+        ids = phone_ids[start:start + size]
+        ram = rng.choice([3, 4, 6, 8, 12, 16], size=size)
+        storage = rng.choice([32, 64, 128, 256, 512, 1024], size=size)
+        battery = rng.choice([3000, 4000, 4500, 5000, 5500, 6000], size=size)
+        display = np.round(rng.uniform(5.8, 7.2, size=size), 1)
+        refresh = rng.choice([60, 90, 120, 144], size=size)
+        camera = rng.choice([12, 48, 50, 64, 108, 200], size=size)
+        charging = rng.choice([10, 18, 25, 33, 45, 67, 120], size=size)
+        weight = rng.integers(150, 260, size=size)
+        rows = []
+        for i in range(size):
+            storage_text = f"{storage[i] // 1024}TB" if storage[i] >= 1024 else f"{storage[i]}GB"
+            for key, value in (
+                ("ram", f"{ram[i]}GB"),
+                ("storage", storage_text),
+                ("battery", f"{battery[i]} mAh"),
+                ("display_size", f"{display[i]} inches"),
+                ("display_type", f"AMOLED, {refresh[i]}Hz"),
+                ("rear_camera", f"{camera[i]}MP + 12MP"),
+                ("charging", f"{charging[i]}W wired"),
+                ("weight", f"{weight[i]} g"),
+            ):
+                rows.append({"phone_id": int(ids[i]), "key_name": key, "value": value})
+        yield rows
+
+
+def generate_shops(seed, count, batch_size, first_id, now):
+    rng = rng_for(seed, "shops")
+    for start, size in chunks(count, batch_size):
+        ids = np.arange(first_id + start, first_id + start + size)
+        cities = weighted(rng, CITIES, [30, 10, 8, 6, 6, 5, 5, 4, 4, 4, 3, 3], size)
+        words = weighted(rng, SHOP_WORDS, [1] * len(SHOP_WORDS), size)
+        verified = rng.random(size) < 0.7
+        featured = rng.random(size) < 0.1
+        streets = rng.integers(1, 400, size=size)
+        created = timestamps(rng, size, 5 * 365, now)
+        yield [
+            {
+                "id": int(ids[i]), "name": f"{cities[i]} {words[i]} {ids[i]}", "city": cities[i],
+                "address": f"{streets[i]} Main Street, {cities[i]}",
+                "phone": f"+9411{ids[i] % 10000000:07d}", "whatsapp": None,
+                "website": f"https://shop{ids[i]}.example.lk",
+                "verified": bool(verified[i]), "featured": bool(featured[i]), "created_at": created[i],
+            }
+            for i in range(size)
+        ]
+
+
+def listing_plan(seed, phone_ids, categories, shop_ids, total):
+    """Arrays (phone_id, shop_id, price) for every listing; (phone, shop) pairs are unique"""
+    rng = rng_for(seed, "prices")
+    n_phones, n_shops = len(phone_ids), len(shop_ids)
+    per_phone = np.full(n_phones, min(total // n_phones, n_shops), dtype=np.int64)
+    per_phone[: min(total - per_phone.sum(), n_phones)] += 1
+    per_phone = np.minimum(per_phone, n_shops)
+
+    phone_index = np.repeat(np.arange(n_phones), per_phone)
+    slot = np.arange(len(phone_index)) - np.repeat(np.cumsum(per_phone) - per_phone, per_phone)
+    # Distinct shops per phone: start at a random shop and walk with a stride coprime to n_shops
+    stride = next(s for s in range(max(2, n_shops // 3), n_shops + 2) if np.gcd(s, n_shops) == 1)
+    offsets = rng.integers(0, n_shops, size=n_phones)
+    shop_index = (offsets[phone_index] + slot * stride) % n_shops
+
+    base = np.array([CATEGORY_PRICE[c] for c in categories], dtype=np.float64)
+    base *= np.exp(rng.normal(0, 0.35, size=n_phones))
+    prices = base[phone_index] * np.exp(rng.normal(0, 0.06, size=len(phone_index)))
+    prices = (np.round(prices / 100) * 100).astype(np.int64)
+    return phone_ids[phone_index], shop_ids[shop_index], prices
+
+
+def generate_prices(seed, listings, batch_size, first_id, now):
+    rng = rng_for(seed, "price_rows")
+    phones, shops, prices = listings
+    active = rng.random(len(prices)) < 0.95
+    updated = timestamps(rng, len(prices), 60, now)
+    for start, size in chunks(len(prices), batch_size):
+        yield [
+            {
+                "id": first_id + i, "phone_id": int(phones[i]), "shop_id": int(shops[i]),
+                "price": int(prices[i]), "currency": "LKR", "is_active": bool(active[i]),
+                "updated_at": updated[i],
+            }
+            for i in range(start, start + size)
+        ]
+
+
+def generate_history(seed, listings, count, batch_size, now):
+    rng = rng_for(seed, "history")
+    phones, shops, prices = listings
+    for start, size in chunks(count, batch_size):
+        pick = rng.integers(0, len(prices), size=size)
+        days_ago = rng.integers(0, 365, size=size)
+        # Older observations were pricier: ~15% a year of depreciation plus noise
+        factor = np.exp(0.15 * days_ago / 365 + rng.normal(0, 0.03, size=size))
+        values = (np.round(prices[pick] * factor / 100) * 100).astype(np.int64)
+        recorded = (now - (days_ago * 86400 + rng.integers(0, 86400, size=size)).astype("timedelta64[s]")).tolist()
+        yield [
+            {"phone_id": int(phones[pick[i]]), "shop_id": int(shops[pick[i]]),
+             "price": int(values[i]), "recorded_at": recorded[i]}
+            for i in range(size)
+        ]
+
+
+def generate_reviews(seed, phone_ids, count, batch_size, now):
+    rng = rng_for(seed, "reviews")
+    for start, size in chunks(count, batch_size):
+        # Popularity is skewed: a small share of phones collects most reviews
+        phone = phone_ids[(len(phone_ids) * rng.random(size) ** 3).astype(np.int64)]
+        ratings = weighted(rng, RATINGS, RATING_WEIGHTS, size)
+        names = weighted(rng, FIRST_NAMES, [1] * len(FIRST_NAMES), size)
+        suffix = rng.integers(1, 100000, size=size)
+        comments = weighted(rng, COMMENTS, [1] * len(COMMENTS), size)
+        helpful = rng.poisson(1.5, size=size)
+        created = timestamps(rng, size, 2 * 365, now)
+        yield [
+            {"phone_id": int(phone[i]), "user_name": f"{names[i]}{suffix[i]}", "rating": int(ratings[i]),
+             "comment": comments[i], "helpful": int(helpful[i]), "created_at": created[i]}
+            for i in range(size)
+        ]
+
+
+def generate_subscribers(seed, count, batch_size, first_id, now):
+    rng = rng_for(seed, "subscribers")
+    for start, size in chunks(count, batch_size):
+        names = weighted(rng, FIRST_NAMES, [1] * len(FIRST_NAMES), size)
+        active = rng.random(size) < 0.95
+        created = timestamps(rng, size, 3 * 365, now)
+        yield [
+            {"email": f"subscriber{first_id + start + i}@example.com", "name": names[i],
+             "is_active": bool(active[i]), "created_at": created[i], "updated_at": created[i]}
+            for i in range(size)
+        ]
+
+
+RESET_ORDER = [
+    models.Deal, models.AffiliateClick, models.AffiliateLink, models.PriceAlert, models.PhoneRating,
+    models.PhoneFeature, models.ReviewStats, models.Review, models.SpecAttribute, models.Spec,
+    models.PriceHistory, models.ShopPrice, models.Subscriber, models.User, models.Shop, models.Phone,
+]
+
+
+def next_id(engine, model):
+    with engine.connect() as connection:
+        return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def generate(engine, volumes: dict, seed: int = 42, batch_size: int = 10000, reset: bool = False, label: str = "custom", now=None):
+    """Create the schema if needed and load a synthetic dataset of the given volumes, dated up to now"""
+    now = today() if now is None else np.datetime64(now, "s")
+    Base.metadata.create_all(bind=engine)
+
+    if reset:
+        print("🗑️  Clearing existing data...")
+        with engine.begin() as connection:
+            for model in RESET_ORDER:
+                connection.execute(delete(model))
+
+    print(f"🌱 Generating {label} dataset (seed {seed}, up to {now.astype('datetime64[D]')}): "
+          + ", ".join(f"{count:,} {table}" for table, count in volumes.items()))
+    start = time.perf_counter()
+
+    first_phone = next_id(engine, models.Phone)
+    phone_rows = []
+    def keep_phones():
+        for rows in generate_phones(seed, volumes["phones"], batch_size, first_phone, now):
+            phone_rows.extend((row["id"], row["category"]) for row in rows)
+            yield rows
+    bulk_insert(engine, models.Phone, keep_phones(), volumes["phones"], "phones")
+    phone_ids = np.array([phone_id for phone_id, _ in phone_rows], dtype=np.int64)
+    categories = [category for _, category in phone_rows]
+
+    bulk_insert(engine, models.Spec, generate_specs(seed, phone_ids, batch_size),
+                len(phone_ids) * 8, "specs")
+
+    first_shop = next_id(engine, models.Shop)
+    bulk_insert(engine, models.Shop, generate_shops(seed, volumes["shops"], batch_size, first_shop, now),
+                volumes["shops"], "shops")
+    shop_ids = np.arange(first_shop, first_shop + volumes["shops"], dtype=np.int64)
+
+    if len(phone_ids) and len(shop_ids):
+        listings = listing_plan(seed, phone_ids, categories, shop_ids, volumes["prices"])
+        bulk_insert(engine, models.ShopPrice,
+                    generate_prices(seed, listings, batch_size, next_id(engine, models.ShopPrice), now),
+                    len(listings[0]), "shop_prices")
+        if len(listings[0]):
+            bulk_insert(engine, models.PriceHistory,
+                        generate_history(seed, listings, volumes["history"], batch_size, now),
+                        volumes["history"], "price_history")
+
+    if len(phone_ids):
+        bulk_insert(engine, models.Review, generate_reviews(seed, phone_ids, volumes["reviews"], batch_size, now),
+                    volumes["reviews"], "reviews")
+
+    bulk_insert(engine, models.Subscriber,
+                generate_subscribers(seed, volumes["subscribers"], batch_size,
+                                     next_id(engine, models.Subscriber), now),
+                volumes["subscribers"], "subscribers")
+
+    print("🧮 Deriving spec_attributes and review_stats...")
+    with Session(engine) as db:
+        for batch_start in range(0, len(phone_ids), 1000):
+            sync_spec_attributes(db, phone_ids[batch_start:batch_start + 1000].tolist())
+            db.commit()
+    with engine.begin() as connection:
+        review_stats.rebuild(connection)
+
+    print(f"✅ Dataset ready in {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic large synthetic catalog")
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    for table in ("phones", "shops", "prices", "history", "reviews", "subscribers"):
+        parser.add_argument(f"--{table}", type=int, default=None, help=f"Override the preset's {table} count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per INSERT batch")
+    parser.add_argument("--database-url", default=None,
+                        help="Target database (defaults to the app's DATABASE_URL settings)")
+    parser.add_argument("--reset", action="store_true", help="Delete existing catalog data first")
+    parser.add_argument("--now", default=None, help="Date the newest rows are generated up to (YYYY-MM-DD, default today)")
+    args = parser.parse_args()
+
+    volumes = dict(PRESETS[args.preset])
+    for table in volumes:
+        if getattr(args, table) is not None:
+            volumes[table] = getattr(args, table)
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from app.database import engine
+
+    generate(engine, volumes, seed=args.seed, batch_size=args.batch_size, reset=args.reset, label=args.preset, now=args.now)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,23 +2,22 @@
 Test database connection
 """
 from app.database import engine
-from sqlalchemy import text
+from sqlalchemy import inspect
 
 try:
     print("Testing database connection...")
     with engine.connect() as connection:
-        result = connection.execute(text("SELECT DATABASE()"))
-        db_name = result.fetchone()[0]
-        print(f"✅ Successfully connected to database: {db_name}")
+        # inspect() works on MySQL and on the SQLite test profile (DATABASE_URL=sqlite:///test.db)
+        db_name = connection.engine.url.database or ":memory:"
+        print(f"✅ Successfully connected to {connection.dialect.name} database: {db_name}")
         
         # List existing tables
-        result = connection.execute(text("SHOW TABLES"))
-        tables = result.fetchall()
+        tables = inspect(connection).get_table_names()
         
         if tables:
             print(f"\n✅ Found {len(tables)} existing tables:")
             for table in tables:
-                print(f"  - {table[0]}")
+                print(f"  - {table}")
         else:
             print("\n⚠️  No tables found in database")
         
@@ -0,0 +1,61 @@
+"""
+Shared fixtures: every test runs on an in-memory SQLite database inside a
+transaction that is rolled back afterwards (see app/testing.py).
+"""
+import os
+
+# Before anything imports app.database or starts the app
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["BACKGROUND_JOBS"] = "false"
+os.environ["WARMUP"] = "false"
+os.environ["SMTP_USERNAME"] = ""
+os.environ["SMTP_PASSWORD"] = ""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models, testing
+
+
+@pytest.fixture(scope="session")
+def engine():
+    return testing.create_test_engine()
+
+
+@pytest.fixture
+def db(engine):
+    with testing.session_scope(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client(engine):
+    with testing.client_scope(engine) as (test_client, session):
+        test_client.db = session
+        yield test_client
+
+
+@pytest.fixture
+def catalog():
+    """Factory for phones, shops and listings: catalog(db, prices=[...], history=[(price, days_ago), ...])"""
+    def make(db, prices=(100000,), history=(), category="midrange", release_year=2024):
+        phone = models.Phone(brand="Acme", model=f"Test {len(prices)}", category=category, release_year=release_year)
+        db.add(phone)
+        db.flush()
+        listings = []
+        for i, price in enumerate(prices):
+            shop = models.Shop(name=f"Shop {i}", city="Colombo")
+            db.add(shop)
+            db.flush()
+            listing = models.ShopPrice(phone_id=phone.id, shop_id=shop.id, price=price, currency="LKR",
+                                       is_active=True, updated_at=datetime.now())
+            db.add(listing)
+            listings.append(listing)
+        db.flush()
+        for price, days_ago in history:
+            db.add(models.PriceHistory(phone_id=phone.id, shop_id=listings[0].shop_id, price=price,
+                                       recorded_at=datetime.now() - timedelta(days=days_ago)))
+        db.commit()
+        return phone, listings
+    return make
@@ -0,0 +1,28 @@
+def test_batch_matches_the_single_phone_endpoints(client, catalog):
+    first, listings = catalog(client.db, prices=[100000, 96000, 104000])
+    second, _ = catalog(client.db, prices=[50000])
+    listings[2].is_active = False
+    client.db.commit()
+
+    response = client.post("/api/ai/batch", json={"phone_ids": [second.id, first.id, 999999, first.id]})
+
+    assert response.status_code == 200
+    batch = response.json()
+    assert [result["phone_id"] for result in batch["results"]] == [second.id, first.id]
+    assert batch["not_found"] == [999999]
+
+    result = batch["results"][1]
+    assert result["price_range"] == client.get(f"/api/ai/price-range/{first.id}").json()
+    assert result["price_range"]["shop_count"] == 2
+    single = client.get(f"/api/ai/predict/{first.id}").json()
+    assert result["prediction"] == {key: value for key, value in single.items() if key != "phone_id"}
+    comparison = client.get(f"/api/ai/comparison/{first.id}").json()
+    assert sorted(price["id"] for price in result["comparison"]["prices"]) == sorted(
+        price["id"] for price in comparison["prices"]
+    )
+    assert len(comparison["prices"]) == 2
+
+
+def test_batch_rejects_empty_and_oversized_requests(client):
+    assert client.post("/api/ai/batch", json={"phone_ids": []}).status_code == 422
+    assert client.post("/api/ai/batch", json={"phone_ids": list(range(1, 102))}).status_code == 422
@@ -0,0 +1,72 @@
+from app import models
+from app.services import affiliate, counters, helpful_votes
+from app.services.counters import CounterBuffer
+
+
+def test_helpful_votes_are_visible_before_the_flush(client, catalog):
+    phone, _ = catalog(client.db)
+    review = client.post("/api/reviews/", json={
+        "phone_id": phone.id, "user_name": "Nimal", "rating": 5, "comment": "Great phone",
+    }).json()
+
+    assert client.put(f"/api/reviews/{review['id']}/helpful").json()["helpful"] == 1
+    assert client.put(f"/api/reviews/{review['id']}/helpful").json()["helpful"] == 2
+    assert client.db.get(models.Review, review["id"]).helpful == 0
+    assert client.get(f"/api/reviews/{review['id']}").json()["helpful"] == 2
+
+    assert helpful_votes.buffer.flush(client.db) == 1
+    client.db.expire_all()
+    assert client.db.get(models.Review, review["id"]).helpful == 2
+    assert helpful_votes.buffer.pending(review["id"]) == 0
+    assert client.get(f"/api/reviews/{review['id']}").json()["helpful"] == 2
+
+
+def test_failed_flush_keeps_the_increments(db):
+    def fail(db, batch):
+        raise RuntimeError("database went away")
+
+    buffer = CounterBuffer("test", fail)
+    buffer.add("a", 2)
+    buffer.add("b")
+
+    assert buffer.flush(db) == 0
+    assert buffer.pending("a") == 2
+    assert buffer.pending("b") == 1
+
+
+def test_affiliate_clicks_are_counted_in_one_flush(client, catalog):
+    phone, listings = catalog(client.db)
+    link = models.AffiliateLink(phone_id=phone.id, shop_id=listings[0].shop_id, link="https://shop.example/p/1")
+    client.db.add(link)
+    client.db.commit()
+
+    for _ in range(3):
+        response = client.get(f"/api/go/{phone.id}/{listings[0].shop_id}", follow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["location"] == "https://shop.example/p/1"
+    assert client.get(f"/api/go/{phone.id}/999999", follow_redirects=False).status_code == 404
+
+    assert affiliate.buffer.flush(client.db) == 1
+    client.db.expire_all()
+    assert client.db.get(models.AffiliateLink, link.id).clicks == 3
+    assert [row.clicks for row in client.db.query(models.AffiliateClick)] == [3]
+
+
+def test_burst_of_overdue_adds_starts_one_flush_thread(monkeypatch):
+    started = []
+
+    class RecordingThread:
+        def __init__(self, target, name, daemon):
+            self.name = name
+
+        def start(self):
+            started.append(self.name)
+
+    monkeypatch.setattr(counters.threading, "Thread", RecordingThread)
+    buffer = CounterBuffer("burst", lambda db, batch: None, flush_interval=0, inline_flush=False)
+
+    for i in range(100):
+        buffer.add(i % 5)
+
+    assert started == ["flush:burst"]
+    assert buffer.pending(0) == 20
@@ -0,0 +1,72 @@
+import pytest
+
+from app import database, models
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """A second in-memory database standing in for a read replica"""
+    replica = database.create_database_engine("sqlite://")
+    database.Base.metadata.create_all(bind=replica)
+    with replica.begin() as connection:
+        connection.execute(models.Phone.__table__.insert(), {"brand": "Acme", "model": "On Replica", "category": "budget"})
+    monkeypatch.setattr(database, "replica_engines", [replica])
+    monkeypatch.setattr(database, "_recent_writers", {})
+    return replica
+
+
+def _models(client):
+    return [phone["model"] for phone in client.get("/api/phones/").json()]
+
+
+def test_pool_sizing_splits_the_connection_budget_across_workers(monkeypatch):
+    monkeypatch.setattr(database, "DB_MAX_CONNECTIONS", 60)
+    monkeypatch.setattr(database, "WEB_CONCURRENCY", 3)
+
+    sizing = database.pool_sizing()
+
+    assert sizing["pool_size"] + sizing["max_overflow"] == 20
+    assert sizing["pool_size"] == 10
+
+
+def test_reads_go_to_the_replica_until_the_client_writes(client, replica):
+    client.db.add(models.Phone(brand="Acme", model="On Primary", category="budget"))
+    client.db.commit()
+
+    assert _models(client) == ["On Replica"]
+
+    created = client.post("/api/phones/", json={"brand": "Acme", "model": "Just Added", "category": "midrange"})
+    assert created.status_code == 200
+    # Read-after-write: the writer's next reads see the primary, including its own write
+    assert _models(client) == ["On Primary", "Just Added"]
+
+
+def test_session_reads_its_own_writes(db, replica):
+    db.info["use_replica"] = True
+    assert [phone.model for phone in db.query(models.Phone)] == ["On Replica"]
+
+    db.add(models.Phone(brand="Acme", model="Written", category="budget"))
+    db.flush()
+
+    assert [phone.model for phone in db.query(models.Phone)] == ["Written"]
+
+
+def test_pool_health_reports_counters_without_connection_details(client, replica):
+    response = client.get("/health/db")
+
+    assert response.status_code == 200
+    pools = response.json()["pools"]
+    assert [pool["name"] for pool in pools] == ["primary", "replica1"]
+    assert all("url" not in pool for pool in pools)
+    assert "sqlite" not in response.text
+
+
+def test_read_after_write_ignores_a_spoofed_forwarded_for(client, replica):
+    spoofed = {"x-forwarded-for": "198.51.100.7"}
+    created = client.post("/api/phones/", json={"brand": "Acme", "model": "Spoofed", "category": "budget"},
+                          headers=spoofed)
+    assert created.status_code == 200
+
+    # The write is remembered for the connection's address, not the header's
+    assert _models(client) == ["Spoofed"]
+    assert "198.51.100.7" not in database._recent_writers
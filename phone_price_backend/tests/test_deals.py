@@ -0,0 +1,15 @@
+from app.services import deals
+
+
+def test_listing_below_its_trailing_median_ranks_first(db, catalog):
+    history = [(125000, 10), (120000, 30), (118000, 60), (90000, 200)]
+    phone, listings = catalog(db, prices=[100000, 104000, 106000], history=history)
+
+    ranked = deals.compute_deals(db)
+
+    best = ranked[0]
+    assert (best["phone_id"], best["shop_id"]) == (phone.id, listings[0].shop_id)
+    # The 200-day-old sample is outside the trailing window
+    assert best["trailing_median"] == 120000
+    assert best["below_median_pct"] == round((120000 - 100000) / 120000 * 100, 2)
+    assert all(deal["score"] > 0 for deal in ranked)
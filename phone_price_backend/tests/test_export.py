@@ -0,0 +1,67 @@
+import csv
+import gzip
+import io
+import json
+
+from app import models
+from app.services import export
+
+
+def test_price_export_streams_ndjson_rows_with_names(client, catalog):
+    phone, listings = catalog(client.db, prices=[100000, 98000])
+    catalog(client.db, prices=[50000])
+
+    response = client.get("/api/export/prices.ndjson", params={"phone_id": phone.id})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [listing.id for listing in listings]
+    assert (rows[0]["brand"], rows[0]["shop_name"], rows[0]["price"]) == ("Acme", "Shop 0", 100000)
+    assert rows[0]["updated_at"] == listings[0].updated_at.isoformat()
+
+
+def test_csv_export_has_a_header_then_one_row_per_phone(client, catalog):
+    catalog(client.db)
+    catalog(client.db, prices=[1, 2])
+    catalog(client.db, prices=[1, 2, 3])
+
+    response = client.get("/api/export/phones.csv")
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert response.headers["content-disposition"] == 'attachment; filename="phones.csv"'
+    assert rows[0] == [column.name for column in models.Phone.__table__.columns]
+    assert [row[2] for row in rows[1:]] == ["Test 1", "Test 2", "Test 3"]
+
+
+def test_empty_csv_export_still_has_a_header(client):
+    response = client.get("/api/export/shops.csv", params={"city": "Nowhere"})
+
+    assert response.text.strip() == ",".join(column.name for column in models.Shop.__table__.columns)
+
+
+def test_partitions_stream_in_batches_with_one_csv_header(db, catalog):
+    phone, _ = catalog(db)
+    db.add_all([models.Spec(phone_id=phone.id, key_name=f"Key {i}", value=str(i)) for i in range(5)])
+    db.commit()
+
+    partitions = list(export.stream_partitions(export.specs_query(phone.id), batch_size=2))
+
+    assert [len(rows) for _, rows in partitions] == [2, 2, 1]
+    assert partitions[0][0] == ["id", "phone_id", "key_name", "value"]
+    lines = b"".join(export.csv_chunks(partitions)).decode().splitlines()
+    assert lines[0] == "id,phone_id,key_name,value"
+    assert len(lines) == 6
+
+
+def test_gzip_stream_decompresses_to_the_plain_export(client, catalog):
+    catalog(client.db, prices=[100000, 98000])
+    plain = client.get("/api/export/prices.csv").content
+
+    response = client.get("/api/export/prices.csv", params={"gzip": True})
+
+    assert response.headers["content-encoding"] == "gzip"
+    # The test client decodes Content-Encoding itself
+    assert response.content == plain
+    chunks = [b"a,b\n", b"", b"1,2\n" * 1000]
+    assert gzip.decompress(b"".join(export.gzip_chunks(iter(chunks)))) == b"".join(chunks)
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from app import models
+from app.services import facets
+
+
+def _phone(db, shop, brand, category, price, ram):
+    phone = models.Phone(brand=brand, model=f"{brand} {price}", category=category, release_year=2024)
+    db.add(phone)
+    db.flush()
+    listing = models.ShopPrice(phone_id=phone.id, shop_id=shop.id, price=price, is_active=True,
+                               updated_at=datetime.now())
+    db.add_all([listing, models.Spec(phone_id=phone.id, key_name="RAM", value=f"{ram}GB")])
+    db.add(models.SpecAttribute(phone_id=phone.id, attribute="ram_gb", num_value=ram, unit="GB"))
+    db.commit()
+    return phone, listing
+
+
+def _catalog(db):
+    shop = models.Shop(name="Tech Hub", city="Colombo")
+    db.add(shop)
+    db.flush()
+    return [
+        _phone(db, shop, "Samsung", "midrange", 90000, 8),
+        _phone(db, shop, "Samsung", "flagship", 300000, 12),
+        _phone(db, shop, "Apple", "flagship", 350000, 8),
+        _phone(db, shop, "Xiaomi", "budget", 40000, 4),
+        _phone(db, shop, "Xiaomi", "midrange", 110000, 8),
+    ]
+
+
+def test_price_buckets():
+    assert facets.price_bucket(None) is None
+    assert facets.price_bucket(24999) == "0-25000"
+    assert facets.price_bucket(100000) == "100000-150000"
+    assert facets.price_bucket(400000) == "400000+"
+
+
+def test_browse_counts_ignore_only_their_own_facet(client):
+    phones = _catalog(client.db)
+
+    response = client.get("/api/phones/browse", params=[("brand", "Samsung"), ("brand", "Xiaomi"),
+                                                       ("category", "midrange")]).json()
+
+    assert sorted(phone["id"] for phone in response["phones"]) == [phones[0][0].id, phones[4][0].id]
+    assert response["total_count"] == 2
+    counts = response["facets"]
+    # Brand counts apply the category selection only; category counts apply the brand selection only
+    assert counts["brand"] == {"Samsung": 1, "Xiaomi": 1}
+    assert counts["category"] == {"budget": 1, "flagship": 1, "midrange": 2}
+    assert counts["price_bucket"] == {"50000-100000": 1, "100000-150000": 1}
+    assert counts["ram_gb"] == {"8": 2}
+
+
+def test_browse_without_filters_counts_everything_and_pages(client):
+    phones = _catalog(client.db)
+
+    response = client.get("/api/phones/browse", params={"skip": 3, "limit": 10}).json()
+
+    assert response["total_count"] == 5
+    assert [phone["id"] for phone in response["phones"]] == [phones[3][0].id, phones[4][0].id]
+    assert response["facets"]["brand"] == {"Apple": 1, "Samsung": 2, "Xiaomi": 2}
+    assert response["facets"]["ram_gb"] == {"4": 1, "8": 3, "12": 1}
+
+
+def test_price_writes_move_a_phone_between_buckets(client):
+    phones = _catalog(client.db)
+    phone, listing = phones[3]
+    assert client.get("/api/phones/browse").json()["facets"]["price_bucket"]["25000-50000"] == 1
+
+    response = client.put(f"/api/prices/{listing.id}", json={
+        "phone_id": phone.id, "shop_id": listing.shop_id, "price": 20000,
+    })
+    assert response.status_code == 200
+
+    buckets = client.get("/api/phones/browse").json()["facets"]["price_bucket"]
+    assert buckets["0-25000"] == 1
+    assert "25000-50000" not in buckets
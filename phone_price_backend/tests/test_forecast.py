@@ -0,0 +1,52 @@
+import threading
+
+from app.services import forecast
+
+
+def test_declining_history_forecasts_a_lower_price(db, catalog):
+    history = [(130000, 330), (120000, 240), (112000, 150), (105000, 60)]
+    phone, _ = catalog(db, prices=[100000], history=history)
+
+    prediction = forecast.fit(db).predict(phone.id)
+
+    assert prediction["annual_trend"] < 0
+    assert prediction["predicted_price"] < 100000
+    assert prediction["lower_bound"] < prediction["predicted_price"] < prediction["upper_bound"]
+
+
+def test_prices_recorded_in_history_are_counted_once(client, catalog):
+    phone, listings = catalog(client.db, prices=[100000, 101000])
+    listing = listings[0]
+    # Listings without history rows (priced before history was recorded) still count
+    assert forecast.fit(client.db).predict(phone.id)["observations"] == 2
+
+    response = client.put(f"/api/prices/{listing.id}", json={
+        "phone_id": phone.id, "shop_id": listing.shop_id, "price": 99000,
+    })
+    assert response.status_code == 200
+
+    # The update appended a history row equal to the current price: still one observation per listing
+    assert forecast.fit(client.db).predict(phone.id)["observations"] == 2
+
+
+def test_undated_current_prices_are_ignored(db, catalog):
+    phone, listings = catalog(db, prices=[100000, 101000])
+    listings[1].updated_at = None
+    db.commit()
+
+    assert forecast.fit(db).predict(phone.id)["observations"] == 1
+
+
+def test_stale_model_is_served_while_refitting_in_the_background(db, catalog, monkeypatch):
+    phone, _ = catalog(db)
+    first = forecast.get_model(db)
+    assert first.version == 1
+
+    monkeypatch.setattr(forecast, "MIN_REFIT_SECONDS", 0)
+    forecast.invalidate(phone.id)
+    assert forecast.get_model(db) is first
+
+    for thread in threading.enumerate():
+        if thread.name == "forecast-refit":
+            thread.join()
+    assert forecast.get_model(db).version == 2
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+import generate_data
+from app import models
+from app.database import create_database_engine
+
+VOLUMES = dict(phones=40, shops=8, prices=200, history=300, reviews=60, subscribers=10)
+
+
+def _generate(**volumes):
+    engine = create_database_engine("sqlite://")
+    generate_data.generate(engine, {**VOLUMES, **volumes}, seed=7, now="2026-01-01")
+    return engine
+
+
+def _rows(engine, model):
+    with engine.connect() as connection:
+        return [tuple(row) for row in connection.execute(select(model.__table__).order_by(model.id))]
+
+
+def test_same_seed_and_now_give_the_same_data_dated_up_to_now():
+    first, second = _generate(), _generate()
+
+    prices = _rows(first, models.ShopPrice)
+    assert prices == _rows(second, models.ShopPrice)
+    assert _rows(first, models.PriceHistory) == _rows(second, models.PriceHistory)
+    assert all(row[-1] <= datetime(2026, 1, 1) for row in prices)
+
+
+def test_changing_one_volume_leaves_the_other_tables_alone():
+    baseline, more_history = _generate(), _generate(history=600, reviews=120)
+
+    assert _rows(baseline, models.ShopPrice) == _rows(more_history, models.ShopPrice)
+    assert _rows(baseline, models.Phone) == _rows(more_history, models.Phone)
+    assert len(_rows(more_history, models.PriceHistory)) == 600
@@ -0,0 +1,40 @@
+from app.services import home_feed
+
+
+def _review(client, phone, rating):
+    client.post("/api/reviews/", json={"phone_id": phone.id, "user_name": "Nimal", "rating": rating, "comment": "Ok"})
+
+
+def test_feed_sections(client, catalog):
+    dropped, listings = catalog(client.db, prices=[90000, 95000], history=[(120000, 10), (150000, 45)],
+                                release_year=2023)
+    budget, _ = catalog(client.db, prices=[30000], category="budget", release_year=2025)
+    rated, _ = catalog(client.db, prices=[200000], category="flagship", release_year=2024)
+    for rating in (5, 4, 5):
+        _review(client, rated, rating)
+    _review(client, budget, 5)
+
+    feed = client.get("/api/home").json()
+
+    drop = feed["price_drops"][0]
+    # The 45-day-old peak is outside the 30-day window
+    assert (drop["id"], drop["shop_id"], drop["previous_price"], drop["current_price"]) == (
+        dropped.id, listings[0].shop_id, 120000, 90000)
+    assert drop["drop_percent"] == 25.0
+    assert [card["id"] for card in feed["cheapest_by_category"]["midrange"]] == [dropped.id]
+    assert feed["cheapest_by_category"]["budget"][0]["price"] == 30000
+    assert [card["id"] for card in feed["newest"]] == [budget.id, rated.id, dropped.id]
+    # Phones need MIN_REVIEWS reviews to rank as top-rated
+    assert [(card["id"], card["average_rating"]) for card in feed["top_rated"]] == [(rated.id, 4.67)]
+
+
+def test_feed_is_served_from_the_snapshot_until_the_job_refreshes_it(client, catalog):
+    catalog(client.db, prices=[30000], category="budget")
+    first = client.get("/api/home").content
+
+    catalog(client.db, prices=[20000], category="budget")
+    assert client.get("/api/home").content == first
+
+    home_feed.refresh(client.db)
+    cheapest = client.get("/api/home").json()["cheapest_by_category"]["budget"]
+    assert [card["price"] for card in cheapest] == [20000, 30000]
@@ -0,0 +1,47 @@
+from app import models
+from app.services import forecast, phone_detail
+
+
+def test_detail_document_composes_phone_prices_specs_and_reviews(client, catalog):
+    phone, listings = catalog(client.db, prices=[105000, 99000])
+    client.db.add(models.Spec(phone_id=phone.id, key_name="RAM", value="8GB"))
+    client.db.commit()
+    client.post("/api/reviews/", json={"phone_id": phone.id, "user_name": "Nimal", "rating": 4, "comment": "Good"})
+
+    detail = client.get(f"/api/phones/{phone.id}/full").json()
+
+    assert detail["phone"]["id"] == phone.id
+    assert [price["price"] for price in detail["prices"]] == [99000, 105000]
+    assert detail["prices"][0]["shop"]["name"] == "Shop 1"
+    assert detail["specs"] == [{"key": "RAM", "value": "8GB"}]
+    summary = detail["price_summary"]
+    assert (summary["min_price"], summary["max_price"], summary["avg_price"], summary["shop_count"]) == (
+        99000, 105000, 102000, 2)
+    assert summary["prediction"]["observations"] == 2
+    assert (detail["reviews"]["total_reviews"], detail["reviews"]["average_rating"]) == (1, 4.0)
+    assert client.get("/api/phones/999999/full").status_code == 404
+
+
+def test_detail_is_cached_until_a_price_changes(client, catalog):
+    phone, listings = catalog(client.db, prices=[105000, 99000])
+    first = client.get(f"/api/phones/{phone.id}/full").content
+    hits = phone_detail.cache.hits
+
+    assert client.get(f"/api/phones/{phone.id}/full").content == first
+    assert phone_detail.cache.hits == hits + 1
+
+    response = client.put(f"/api/prices/{listings[1].id}", json={
+        "phone_id": phone.id, "shop_id": listings[1].shop_id, "price": 97000,
+    })
+    assert response.status_code == 200
+    assert client.get(f"/api/phones/{phone.id}/full").json()["price_summary"]["min_price"] == 97000
+
+
+def test_swapping_in_a_refitted_forecast_drops_cached_predictions(client, catalog):
+    phone, _ = catalog(client.db)
+    cached = client.get(f"/api/phones/{phone.id}/full").json()["price_summary"]["prediction"]
+
+    forecast.refit(client.db)
+
+    refreshed = client.get(f"/api/phones/{phone.id}/full").json()["price_summary"]["prediction"]
+    assert refreshed["model_version"] == cached["model_version"] + 1
@@ -0,0 +1,27 @@
+from app import models
+
+
+def test_outlier_price_is_held_until_confirmed(client, catalog):
+    phone, _ = catalog(client.db, prices=[100000, 102000, 98000, 101000])
+    shop = models.Shop(name="New Shop", city="Kandy")
+    client.db.add(shop)
+    client.db.commit()
+    payload = {"phone_id": phone.id, "shop_id": shop.id, "price": 1000000}
+
+    held = client.post("/api/prices/", json=payload)
+    assert held.status_code == 409
+    assert held.json()["detail"]["median"] == 100500
+
+    confirmed = client.post("/api/prices/", json=payload, params={"confirm": "true"})
+    assert confirmed.status_code == 200
+    assert confirmed.json()["price"] == 1000000
+
+
+def test_ordinary_price_is_saved(client, catalog):
+    phone, listings = catalog(client.db, prices=[100000, 102000, 98000, 101000])
+    payload = {"phone_id": phone.id, "shop_id": listings[0].shop_id, "price": 99000}
+
+    response = client.put(f"/api/prices/{listings[0].id}", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["price"] == 99000
@@ -0,0 +1,49 @@
+from app import models, schemas
+from app.services import helpful_votes
+
+
+def test_phone_list_serves_the_schema_fields_with_ratings(client, catalog):
+    phone, _ = catalog(client.db)
+    client.post("/api/reviews/", json={"phone_id": phone.id, "user_name": "Nimal", "rating": 4, "comment": "Good"})
+
+    phones = client.get("/api/phones/").json()
+
+    assert [item["id"] for item in phones] == [phone.id]
+    assert set(phones[0]) == set(schemas.PhoneWithRating.model_fields)
+    assert (phones[0]["brand"], phones[0]["review_count"], phones[0]["average_rating"]) == ("Acme", 1, 4.0)
+
+
+def test_shop_list_and_search_serve_the_schema_fields(client):
+    client.db.add_all([models.Shop(name="Tech Hub", city="Colombo"), models.Shop(name="Mobile Zone", city="Kandy")])
+    client.db.commit()
+
+    shops = client.get("/api/shops/").json()
+    found = client.get("/api/search/shops", params={"q": "kandy"}).json()
+
+    assert [shop["name"] for shop in shops] == ["Tech Hub", "Mobile Zone"]
+    assert set(shops[0]) == set(schemas.Shop.model_fields)
+    assert [shop["name"] for shop in found] == ["Mobile Zone"]
+
+
+def test_phone_search_pages_projected_rows(client, catalog):
+    catalog(client.db)
+    catalog(client.db, prices=(90000, 95000))
+
+    response = client.get("/api/search/phones", params={"q": "acme", "limit": 1}).json()
+
+    assert response["total_count"] == 2
+    assert [phone["model"] for phone in response["phones"]] == ["Test 1"]
+    assert set(response["phones"][0]) == set(schemas.Phone.model_fields)
+
+
+def test_review_list_carries_phone_name_and_pending_votes(client, catalog):
+    phone, _ = catalog(client.db)
+    review = client.post("/api/reviews/", json={
+        "phone_id": phone.id, "user_name": "Nimal", "rating": 5, "comment": "Great phone",
+    }).json()
+
+    listed = client.get("/api/reviews/", params={"phone_id": phone.id}).json()
+    assert (listed[0]["phone_name"], listed[0]["helpful"]) == ("Acme Test 1", 0)
+
+    helpful_votes.vote(review["id"])
+    assert client.get("/api/reviews/", params={"phone_id": phone.id}).json()[0]["helpful"] == 1
@@ -0,0 +1,83 @@
+import ipaddress
+import threading
+
+from app.database import create_database_engine
+from app.services import rate_limit
+from app.services.rate_limit import DatabaseBucketStore, MemoryBucketStore
+
+
+def _search_capacity():
+    return int(rate_limit.limiter.match("GET", "/api/search/phones").capacity)
+
+
+def test_search_over_the_limit_gets_429_with_retry_after(client):
+    capacity = _search_capacity()
+    statuses = [client.get("/api/search/phones", params={"q": "x"}).status_code for _ in range(capacity)]
+    limited = client.get("/api/search/phones", params={"q": "x"})
+
+    assert set(statuses) == {200}
+    assert limited.status_code == 429
+    assert int(limited.headers["retry-after"]) >= 1
+    assert limited.headers["x-frame-options"] == "DENY"
+    # Other routes are not limited
+    assert client.get("/api/phones/").status_code == 200
+
+
+def test_spoofed_forwarded_for_does_not_reset_the_bucket(client):
+    capacity = _search_capacity()
+    statuses = [
+        client.get("/api/search/phones", params={"q": "x"}, headers={"x-forwarded-for": f"10.1.0.{i}"}).status_code
+        for i in range(capacity + 5)
+    ]
+
+    assert statuses.count(429) == 5
+
+
+def test_forwarded_for_is_used_only_behind_a_trusted_proxy(monkeypatch):
+    def scope(host, forwarded):
+        return {"client": (host, 1234), "headers": [(b"x-forwarded-for", forwarded.encode())]}
+
+    assert rate_limit.client_key(scope("203.0.113.9", "198.51.100.1")) == "203.0.113.9"
+
+    monkeypatch.setattr(rate_limit, "TRUSTED_PROXIES", [ipaddress.ip_network("10.0.0.0/8")])
+    assert rate_limit.client_key(scope("10.0.0.2", "6.6.6.6, 198.51.100.1, 10.0.0.7")) == "198.51.100.1"
+    assert rate_limit.client_key(scope("203.0.113.9", "198.51.100.1")) == "203.0.113.9"
+
+
+def test_helpful_votes_have_their_own_bucket():
+    assert rate_limit.limiter.match("POST", "/api/reviews/").name == "reviews"
+    assert rate_limit.limiter.match("PUT", "/api/reviews/7/helpful").name == "helpful_votes"
+    assert rate_limit.limiter.match("PUT", "/api/reviews/7") is None
+    assert rate_limit.limiter.match("DELETE", "/api/reviews/7") is None
+
+
+def test_memory_bucket_refills_and_idle_buckets_are_swept():
+    store = MemoryBucketStore()
+
+    assert store.take("a", 2, 1000) == 0.0
+    assert store.take("a", 2, 1000) == 0.0
+    assert store.take("a", 2, 0.001) > 0
+
+    store.take("b", 2, 1)
+    store.sweep(idle_seconds=0)
+    assert len(store) == 0
+
+
+def test_shared_store_hands_out_exactly_capacity_tokens(tmp_path):
+    url = f"sqlite:///{tmp_path / 'rate_limit.db'}"
+    store = DatabaseBucketStore(create_database_engine(url))
+    waits = []
+
+    def burst():
+        for _ in range(10):
+            waits.append(store.take("search:client", 20, 0.001))
+
+    threads = [threading.Thread(target=burst) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert waits.count(0.0) == 20
+    # A second worker sees the same, now empty, bucket
+    assert DatabaseBucketStore(create_database_engine(url)).take("search:client", 20, 0.001) > 0
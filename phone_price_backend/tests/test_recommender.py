@@ -0,0 +1,51 @@
+from app import models
+
+
+def _phone(db, catalog, price, ram, storage, battery, category="midrange"):
+    phone, _ = catalog(db, prices=[price], category=category)
+    db.add_all([
+        models.Spec(phone_id=phone.id, key_name="ram", value=f"{ram}GB"),
+        models.Spec(phone_id=phone.id, key_name="storage", value=f"{storage}GB"),
+        models.Spec(phone_id=phone.id, key_name="battery", value=f"{battery} mAh"),
+    ])
+    db.commit()
+    return phone
+
+
+def _ids(response):
+    return [phone["id"] for phone in response.json()]
+
+
+def test_similar_phones_rank_by_specs_and_price(client, catalog):
+    target = _phone(client.db, catalog, 100000, 8, 256, 5000)
+    close = _phone(client.db, catalog, 105000, 8, 256, 4900)
+    far = _phone(client.db, catalog, 30000, 2, 32, 3000, category="budget")
+
+    assert _ids(client.get(f"/api/ai/similar/{target.id}")) == [close.id, far.id]
+    assert _ids(client.get(f"/api/ai/similar/{target.id}", params={"category": "budget"})) == [far.id]
+    assert client.get("/api/ai/similar/999999").status_code == 404
+
+
+def test_best_value_respects_budget_and_skips_unpriced_phones(client, catalog):
+    cheap_strong = _phone(client.db, catalog, 60000, 12, 512, 6000)
+    pricey_weak = _phone(client.db, catalog, 150000, 4, 64, 4000)
+    unpriced = _phone(client.db, catalog, 80000, 16, 1024, 7000)
+    client.db.query(models.ShopPrice).filter(models.ShopPrice.phone_id == unpriced.id).update({"is_active": False})
+    client.db.commit()
+
+    assert _ids(client.get("/api/ai/best-value")) == [cheap_strong.id, pricey_weak.id]
+    assert _ids(client.get("/api/ai/best-value", params={"budget": 100000})) == [cheap_strong.id]
+
+
+def test_spec_writes_refresh_only_the_changed_phone(client, catalog):
+    target = _phone(client.db, catalog, 100000, 8, 256, 5000)
+    changing = _phone(client.db, catalog, 100000, 2, 32, 3000)
+    other = _phone(client.db, catalog, 100000, 4, 64, 3500)
+    assert _ids(client.get(f"/api/ai/similar/{target.id}")) == [other.id, changing.id]
+
+    response = client.put(f"/api/phones/{changing.id}/specs/bulk", json=[
+        {"key": "ram", "value": "8GB"}, {"key": "storage", "value": "256GB"}, {"key": "battery", "value": "5000 mAh"},
+    ])
+    assert response.status_code == 200
+
+    assert _ids(client.get(f"/api/ai/similar/{target.id}")) == [changing.id, other.id]
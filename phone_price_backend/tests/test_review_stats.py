@@ -0,0 +1,43 @@
+from app.services import review_stats
+
+
+def _post(client, phone, user, rating):
+    response = client.post("/api/reviews/", json={"phone_id": phone.id, "user_name": user, "rating": rating,
+                                                  "comment": "Ok"})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_counters_follow_create_update_and_delete(client, catalog):
+    first, _ = catalog(client.db, prices=[100000])
+    second, _ = catalog(client.db, prices=[50000])
+    review_id = _post(client, first, "Nimal", 5)
+    _post(client, first, "Kasun", 3)
+    _post(client, second, "Nimal", 4)
+
+    response = client.put(f"/api/reviews/{review_id}", params={"user_name": "Nimal", "rating": 2})
+    assert response.status_code == 200
+    assert client.delete(f"/api/reviews/{review_id}").status_code == 200
+
+    client.db.expire_all()
+    assert review_stats.get_summary(client.db, first.id) == {
+        "total_reviews": 1, "average_rating": 3.0, "rating_distribution": {1: 0, 2: 0, 3: 1, 4: 0, 5: 0},
+    }
+    assert client.get("/api/reviews/stats/summary").json() == {
+        "total_reviews": 2, "average_rating": 3.5, "rating_distribution": {"1": 0, "2": 0, "3": 1, "4": 1, "5": 0},
+    }
+
+
+def test_rebuild_matches_the_incremental_counters(client, catalog):
+    phone, _ = catalog(client.db, prices=[100000])
+    for user, rating in (("Nimal", 5), ("Kasun", 1), ("Amaya", 4)):
+        _post(client, phone, user, rating)
+    client.db.expire_all()
+    incremental = [review_stats.get_summary(client.db, phone_id) for phone_id in (phone.id, review_stats.GLOBAL_ID)]
+
+    assert review_stats.rebuild(client.db.connection()) == 1
+    client.db.expire_all()
+
+    assert [review_stats.get_summary(client.db, phone_id) for phone_id in (phone.id, review_stats.GLOBAL_ID)] == (
+        incremental)
+    assert incremental[0]["average_rating"] == 3.33
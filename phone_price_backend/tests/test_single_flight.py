@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_duplicates_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        time.sleep(0.05)
+        return f"result {key}"
+
+    async def main():
+        return await asyncio.gather(
+            *[flight.run(("phone", 1), compute, 1) for _ in range(10)],
+            flight.run(("phone", 2), compute, 2),
+        )
+
+    results = asyncio.run(main())
+
+    assert results == ["result 1"] * 10 + ["result 2"]
+    assert sorted(calls) == [1, 2]
+    assert flight.stats() == {"in_flight": 0, "started": 2, "coalesced": 9}
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight("test")
+    calls = []
+
+    def missing():
+        calls.append(1)
+        time.sleep(0.02)
+        raise HTTPException(status_code=404, detail="Phone not found")
+
+    async def main():
+        return await asyncio.gather(*[flight.run("key", missing) for _ in range(5)], return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert [error.status_code for error in errors] == [404] * 5
+    assert len(calls) == 1
+
+    with pytest.raises(HTTPException):
+        asyncio.run(flight.run("key", missing))
+    assert len(calls) == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_work():
+    flight = SingleFlight("test")
+
+    async def main():
+        first = asyncio.ensure_future(flight.run("key", lambda: time.sleep(0.05) or "done"))
+        second = asyncio.ensure_future(flight.run("key", lambda: "never called"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_compare_route_returns_prices_cheapest_first(client, catalog):
+    phone, _ = catalog(client.db, prices=[120000, 95000, 110000])
+
+    response = client.get(f"/api/prices/phone/{phone.id}/compare")
+
+    assert response.status_code == 200
+    assert [row["price"] for row in response.json()] == [95000, 110000, 120000]
+    assert response.json()[0]["shop"]["name"] == "Shop 1"
+    assert client.get("/api/prices/phone/999999/compare").status_code == 404
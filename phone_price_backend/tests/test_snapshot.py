@@ -0,0 +1,42 @@
+import io
+
+import pytest
+
+from app.services import snapshot
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_snapshot_file_holds_every_price_row(db, catalog, tmp_path):
+    phone, listings = catalog(db, prices=[100000, 98000, 97000])
+    catalog(db, prices=[50000])
+    path = tmp_path / "prices.parquet"
+
+    written = snapshot.write_snapshot(str(path), batch_size=2, phone_id=phone.id)
+
+    table = pq.read_table(path)
+    assert written == table.num_rows == 3
+    assert table.schema.names == snapshot.snapshot_schema().names
+    assert table.column("price").to_pylist() == [100000, 98000, 97000]
+    assert table.column("date").to_pylist()[0] == listings[0].updated_at.strftime("%Y-%m-%d")
+
+
+def test_partitioned_snapshot_writes_one_directory_per_brand(db, catalog, tmp_path):
+    catalog(db, prices=[100000, 98000])
+
+    written = snapshot.write_snapshot(str(tmp_path / "prices"), partition_by="brand")
+
+    assert written == 2
+    assert [path.name for path in (tmp_path / "prices").iterdir()] == ["brand=Acme"]
+    with pytest.raises(ValueError):
+        snapshot.write_snapshot(str(tmp_path / "other"), partition_by="shop")
+
+
+def test_snapshot_endpoint_downloads_parquet(client, catalog):
+    catalog(client.db, prices=[100000, 98000])
+
+    response = client.get("/api/export/snapshot.parquet", params={"compression": "snappy"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    assert pq.read_table(io.BytesIO(response.content)).num_rows == 2
@@ -0,0 +1,60 @@
+import pytest
+
+from app import models
+from app.services.spec_parser import parse_specs
+
+
+@pytest.mark.parametrize("specs, expected", [
+    ([("RAM", "4GB / 6GB / 8GB"), ("Storage", "128GB, 1TB")], {"ram_gb": 8.0, "storage_gb": 1024.0}),
+    ([("battery", "5,000 mAh")], {"battery_mah": 5000.0}),
+    ([("display_size", "6,7 inches")], {"display_inches": 6.7}),
+    ([("display_size", "6.1")], {"display_inches": 6.1}),
+    ([("display_size", "2400")], {}),
+    ([("display", "AMOLED, 120Hz"), ("rear_camera", "50MP + 12MP + 2MP")], {"refresh_rate_hz": 120.0, "camera_mp": 50.0}),
+    ([("weight", "187 g"), ("charging", "25W wired, 15W wireless")], {"weight_g": 187.0, "charging_w": 25.0}),
+    ([("ram", "unknown"), ("memory", "12 GB")], {"ram_gb": 12.0}),
+    ([("Refresh_Rate", "90Hz"), ("display", "OLED 144Hz")], {"refresh_rate_hz": 90.0}),
+])
+def test_parse_specs(specs, expected):
+    assert parse_specs(specs) == expected
+
+
+def _phone(client, catalog, price, ram, battery, category="midrange", extra=()):
+    phone, _ = catalog(client.db, prices=[price, price + 5000], category=category)
+    response = client.put(f"/api/phones/{phone.id}/specs/bulk", json=[
+        {"key": "RAM", "value": ram}, {"key": "Battery", "value": battery}, *extra,
+    ])
+    assert response.status_code == 200
+    return phone
+
+
+def _filter(client, **params):
+    response = client.get("/api/phones/filter", params=params).json()
+    return sorted(phone["id"] for phone in response["phones"]), response["total_count"]
+
+
+def test_filter_by_spec_ranges_and_lowest_price(client, catalog):
+    small = _phone(client, catalog, 40000, "4GB", "4000 mAh", category="budget")
+    mid = _phone(client, catalog, 90000, "8GB / 12GB", "5000mAh")
+    big = _phone(client, catalog, 250000, "16GB", "5,500 mAh", category="flagship")
+
+    assert _filter(client, min_ram_gb=12) == ([mid.id, big.id], 2)
+    assert _filter(client, min_ram_gb=8, max_ram_gb=12, min_battery_mah=5000) == ([mid.id], 1)
+    # Bounds are inclusive and apply to the lowest active price
+    assert _filter(client, min_price=40000, max_price=90000) == ([small.id, mid.id], 2)
+    assert _filter(client, max_price=39999) == ([], 0)
+    assert _filter(client, category="flagship", min_battery_mah=5000) == ([big.id], 1)
+
+
+def test_spec_writes_keep_typed_attributes_in_sync(client, catalog):
+    phone = _phone(client, catalog, 90000, "8GB", "5000 mAh")
+
+    response = client.put(f"/api/phones/{phone.id}/specs/bulk", json=[{"key": "RAM", "value": "12GB"}])
+    assert response.status_code == 200
+
+    attributes = {
+        row.attribute: row.num_value
+        for row in client.db.query(models.SpecAttribute).filter(models.SpecAttribute.phone_id == phone.id)
+    }
+    assert attributes == {"ram_gb": 12.0}
+    assert _filter(client, min_battery_mah=1) == ([], 0)
@@ -0,0 +1,37 @@
+from app import models
+from app.services.specs import upsert_specs
+
+
+def _specs(db, phone_id):
+    return {spec.key_name: spec.value for spec in db.query(models.Spec).filter(models.Spec.phone_id == phone_id)}
+
+
+def test_upsert_replaces_existing_keys(db, catalog):
+    phone, _ = catalog(db)
+    db.add_all([
+        models.Spec(phone_id=phone.id, key_name="RAM", value="8GB"),
+        models.Spec(phone_id=phone.id, key_name="Storage", value="128GB"),
+    ])
+    db.commit()
+
+    result = upsert_specs(db, {phone.id: [("RAM", "12GB"), ("Storage", "128GB"), ("Battery", "5000mAh")]})
+    db.commit()
+
+    assert (result["inserted"], result["updated"], result["deleted"], result["unchanged"]) == (1, 1, 0, 1)
+    assert result["changed_phone_ids"] == [phone.id]
+    assert _specs(db, phone.id) == {"RAM": "12GB", "Storage": "128GB", "Battery": "5000mAh"}
+
+
+def test_prune_deletes_missing_keys_and_bulk_route_reports_counts(client, catalog):
+    phone, _ = catalog(client.db)
+    client.db.add_all([
+        models.Spec(phone_id=phone.id, key_name="RAM", value="8GB"),
+        models.Spec(phone_id=phone.id, key_name="Storage", value="128GB"),
+    ])
+    client.db.commit()
+
+    response = client.put(f"/api/phones/{phone.id}/specs/bulk", json=[{"key": "RAM", "value": "8GB"}])
+
+    assert response.status_code == 200
+    assert (response.json()["deleted"], response.json()["unchanged"]) == (1, 1)
+    assert client.get(f"/api/phones/{phone.id}/specs").json() == [{"key": "RAM", "value": "8GB"}]
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import models, testing
+
+
+def test_writes_are_rolled_back_between_scopes(engine):
+    with testing.session_scope(engine) as db:
+        db.add(models.Phone(brand="Acme", model="Temp", category="budget"))
+        db.commit()
+        assert db.query(models.Phone).count() == 1
+
+    with testing.session_scope(engine) as db:
+        assert db.query(models.Phone).count() == 0
+
+
+def test_route_commits_join_the_test_transaction(client):
+    client.db.add(models.Phone(brand="Acme", model="One", category="budget"))
+    client.db.commit()
+
+    assert [phone["model"] for phone in client.get("/api/phones/").json()] == ["One"]
+
+
+def test_enum_columns_are_checked(db):
+    db.add(models.Phone(brand="Acme", model="Odd", category="tablet"))
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+
+def test_foreign_keys_are_enforced(db):
+    db.add(models.ShopPrice(phone_id=999, shop_id=999, price=1000))
+    with pytest.raises(IntegrityError):
+        db.commit()
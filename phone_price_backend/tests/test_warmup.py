@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.services import warmup
+
+
+@pytest.fixture
+def cold(monkeypatch):
+    monkeypatch.setattr(warmup, "_ready", False)
+    monkeypatch.setattr(warmup, "_status", {})
+    monkeypatch.setattr(warmup, "WARMUP_RETRY_SECONDS", 0)
+
+
+def test_ready_only_after_warm_up(client, catalog, cold):
+    catalog(client.db, prices=[100000, 95000])
+    assert client.get("/ready").status_code == 503
+    assert client.get("/health").status_code == 200
+
+    asyncio.run(warmup.run())
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    steps = response.json()["steps"]
+    assert list(steps) == ["connections", *warmup.WARMERS]
+    assert all(step["ok"] for step in steps.values())
+
+
+def test_connections_are_retried_and_cache_warmers_are_best_effort(client, cold, monkeypatch):
+    attempts = []
+
+    def flaky_connections():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("database is starting")
+        return 1
+
+    def broken(db):
+        raise ValueError("no data")
+
+    monkeypatch.setattr(warmup, "warm_connections", flaky_connections)
+    monkeypatch.setattr(warmup, "WARMERS", {"broken": broken, "catalog": warmup.scan_catalog})
+
+    asyncio.run(warmup.run())
+
+    assert len(attempts) == 3
+    status = client.get("/ready").json()
+    assert status["ready"] is True
+    assert status["steps"]["broken"] == {"ok": False, "seconds": status["steps"]["broken"]["seconds"],
+                                         "error": "no data"}
+    assert status["steps"]["catalog"]["ok"] is True
@@ -120,10 +120,21 @@ const AdminPanel = () => {
           is_active: formData.is_active !== undefined ? formData.is_active : true
         };
         
-        if (modalMode === 'add') {
-          await pricesAPI.create(priceData);
-        } else {
-          await pricesAPI.update(currentItem.id, priceData);
+        const savePrice = (confirm) => modalMode === 'add'
+          ? pricesAPI.create(priceData, confirm)
+          : pricesAPI.update(currentItem.id, priceData, confirm);
+        
+        try {
+          await savePrice(false);
+        } catch (error) {
+          // Suspicious prices are held by the backend until confirmed
+          const detail = error.response?.status === 409 ? error.response.data.detail : null;
+          if (!detail) throw error;
+          const typical = detail.median?.toLocaleString();
+          if (!window.confirm(`This price is far from the usual price for this phone (about LKR ${typical}). Save it anyway?`)) {
+            return;
+          }
+          await savePrice(true);
         }
       }
       setShowModal(false);
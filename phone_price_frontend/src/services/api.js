@@ -28,12 +28,14 @@ api.interceptors.response.use(
 export const phonesAPI = {
   getAll: (skip = 0, limit = 100) => api.get(`/phones?skip=${skip}&limit=${limit}`),
   getById: (id) => api.get(`/phones/${id}`),
+  getFull: (id) => api.get(`/phones/${id}/full`),
   getSpecs: (id) => api.get(`/phones/${id}/specs`),
   addSpec: (id, specData) => api.post(`/phones/${id}/specs`, specData),
   updateSpecsBulk: (id, specsArray) => api.put(`/phones/${id}/specs/bulk`, specsArray),
   create: (data) => api.post('/phones', data),
   update: (id, data) => api.put(`/phones/${id}`, data),
   delete: (id) => api.delete(`/phones/${id}`),
+  filter: (filters, skip = 0, limit = 50) => api.get('/phones/filter', { params: { ...filters, skip, limit } }),
   search: (query, skip = 0, limit = 50) => api.get(`/search/phones?q=${encodeURIComponent(query)}&skip=${skip}&limit=${limit}`),
   searchByBrand: (brand, skip = 0, limit = 50) => api.get(`/search/by-brand?brand=${encodeURIComponent(brand)}&skip=${skip}&limit=${limit}`),
   // Get phones by category
@@ -64,10 +66,11 @@ export const pricesAPI = {
   },
   getByRange: (minPrice, maxPrice, skip = 0, limit = 100) => 
     api.get(`/prices/range?min_price=${minPrice}&max_price=${maxPrice}&skip=${skip}&limit=${limit}`),
-  create: (data) => api.post('/prices', data),
-  update: (id, data) => api.put(`/prices/${id}`, data),
+  create: (data, confirm = false) => api.post('/prices', data, { params: confirm ? { confirm } : {} }),
+  update: (id, data, confirm = false) => api.put(`/prices/${id}`, data, { params: confirm ? { confirm } : {} }),
   delete: (id) => api.delete(`/prices/${id}`),
   compareByPhone: (phoneId) => api.get(`/prices/phone/${phoneId}/compare`),
+  outliers: () => api.get('/prices/outliers'),
 };
 
 // Utility functions
@@ -99,16 +102,41 @@ export const getTrendingPhones = async (limit = 6) => {
   }
 };
 
+// Tracked outbound link to a shop's offer for a phone (redirects via the backend)
+export const getShopLinkUrl = (phoneId, shopId) => `${API_BASE_URL}/go/${phoneId}/${shopId}`;
+
 export const getCategories = () => {
   // Return available categories from schema
   return ['budget', 'midrange', 'flagship', 'gaming', 'foldable'];
 };
 
+// Home feed API
+export const homeAPI = {
+  getFeed: () => api.get('/home'),
+};
+
+// Deals API
+export const dealsAPI = {
+  getAll: (category = null, limit = 20) => {
+    const params = new URLSearchParams({ limit });
+    if (category && category !== 'all') params.append('category', category);
+    return api.get(`/deals?${params}`);
+  },
+};
+
 // AI Predictions API
 export const aiAPI = {
   predict: (phoneId) => api.get(`/ai/predict/${phoneId}`),
   priceRange: (phoneId) => api.get(`/ai/price-range/${phoneId}`),
   comparison: (phoneId) => api.get(`/ai/comparison/${phoneId}`),
+  batch: (phoneIds, horizonDays = 30) => api.post('/ai/batch', { phone_ids: phoneIds, horizon_days: horizonDays }),
+  similar: (phoneId, limit = 6) => api.get(`/ai/similar/${phoneId}?limit=${limit}`),
+  bestValue: (budget, category, limit = 10) => {
+    const params = new URLSearchParams({ limit });
+    if (budget) params.append('budget', budget);
+    if (category && category !== 'all') params.append('category', category);
+    return api.get(`/ai/best-value?${params}`);
+  },
 };
 
 export default api;